@@ -0,0 +1,91 @@
+"""
+Bounded pool for password hash verification.
+
+PBKDF2 costs hundreds of milliseconds of CPU. Running it inline lets a burst
+of logins occupy every worker thread; here verification runs in a small
+thread pool (hashlib releases the GIL while hashing) behind an admission
+semaphore. When the pool is saturated new logins are rejected immediately,
+before any hashing starts, instead of queueing behind the burst.
+"""
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, identify_hasher
+
+logger = logging.getLogger(__name__)
+
+
+class HashingUnavailable(Exception):
+    """Raised when the hashing pool is saturated or verification timed out"""
+
+
+class PasswordHashingPool:
+
+    def __init__(self, workers=None, max_pending=None, timeout=None):
+        self.workers = workers or getattr(settings, 'LOGIN_HASH_WORKERS', 2)
+        self.max_pending = max_pending or getattr(settings, 'LOGIN_HASH_MAX_PENDING', 8)
+        self.timeout = timeout or getattr(settings, 'LOGIN_HASH_TIMEOUT', 5)
+        self._admission = threading.BoundedSemaphore(self.max_pending)
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def _get_executor(self):
+        # Executors do not survive fork(); recreate one per worker process
+        if self._executor is None or self._pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix='password-hash'
+                    )
+                    self._pid = os.getpid()
+        return self._executor
+
+    def verify(self, user, raw_password):
+        """Check `raw_password` against `user`, upgrading the stored hash if needed"""
+        if not self._admission.acquire(blocking=False):
+            self.rejected += 1
+            raise HashingUnavailable('Too many concurrent logins')
+        encoded = user.password
+        try:
+            future = self._get_executor().submit(check_password, raw_password, encoded)
+        except BaseException:
+            self._admission.release()
+            raise
+        # The permit is held until the hash finishes (or the queued call is
+        # cancelled), not just until we stop waiting: a timed-out hash keeps
+        # running and must keep counting against max_pending
+        future.add_done_callback(lambda _: self._admission.release())
+        try:
+            valid = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise HashingUnavailable('Password verification timed out')
+
+        if valid and self._must_update(encoded):
+            # Same upgrade AbstractBaseUser.check_password performs, kept on the
+            # request thread so the pool never holds a database connection
+            user.set_password(raw_password)
+            user.save(update_fields=['password'])
+        return valid
+
+    @staticmethod
+    def _must_update(encoded):
+        try:
+            return identify_hasher(encoded).must_update(encoded)
+        except ValueError:
+            return False
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'max_pending': self.max_pending,
+            'rejected': self.rejected,
+        }
+
+
+password_pool = PasswordHashingPool()
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.utils import timezone
+
+from config.partitioning import maintain_partitions
+from config.retention import apply_retention
+from jobs.scheduler import periodic
+from .models import PasswordResetRequest
+from .revocation import revocation_store
+
+
+@periodic('auth_app.expire_password_resets', '*/15 * * * *')
+def expire_password_resets():
+    """Mark pending and approved reset requests past expires_at as expired"""
+    return PasswordResetRequest.objects.filter(
+        status__in=[PasswordResetRequest.Status.PENDING, PasswordResetRequest.Status.APPROVED],
+        expires_at__lte=timezone.now(),
+    ).update(status=PasswordResetRequest.Status.EXPIRED)
+
+
+@periodic('auth_app.compact_revoked_tokens', '@hourly')
+def compact_revoked_tokens():
+    return revocation_store.compact()
+
+
+@periodic('auth_app.maintain_log_partitions', '@daily')
+def maintain_log_partitions():
+    """Create upcoming monthly log partitions"""
+    return maintain_partitions()
+
+
+@periodic('auth_app.apply_retention', settings.RETENTION_SCHEDULE)
+def run_retention():
+    return apply_retention()
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from config.retention import apply_retention, retention_policies
+
+
+class Command(BaseCommand):
+    help = 'Delete rows past their retention policy in throttled chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--policy', action='append', dest='policies', help='Policy to run (repeatable)')
+        parser.add_argument('--dry-run', action='store_true', help='Count expired rows without deleting')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--max-seconds', type=float, default=None, help='Time budget for the whole run')
+        parser.add_argument('--pause', type=float, default=None, help='Minimum sleep between batches')
+        parser.add_argument('--list', action='store_true', help='List the active policies and exit')
+
+    def handle(self, *args, **options):
+        try:
+            policies = retention_policies(options['policies'])
+        except ValueError as exc:
+            raise CommandError(exc)
+
+        if options['list']:
+            for policy in policies:
+                lookups = ', '.join(f'{key}={value}' for key, value in policy.filter.items())
+                self.stdout.write(f'{policy.name:22} {policy.model:28} {policy.field} > {policy.days}d {lookups}')
+            return
+
+        results = apply_retention(
+            names=options['policies'],
+            batch_size=options['batch_size'],
+            max_seconds=options['max_seconds'],
+            pause=options['pause'],
+            dry_run=options['dry_run'],
+        )
+        verb = 'would delete' if options['dry_run'] else 'deleted'
+        for result in results:
+            line = f'{result.policy:22} {verb} {result.deleted:>8} rows before {result.cutoff:%Y-%m-%d}'
+            if not options['dry_run']:
+                line += f' in {result.batches} batches, {result.seconds:.1f}s'
+            if result.dropped_partitions:
+                line += f" (dropped {', '.join(result.dropped_partitions)})"
+            if not result.complete:
+                line += ' [incomplete: time budget reached]'
+            self.stdout.write(line)
+        total = sum(result.deleted for result in results)
+        self.stdout.write(self.style.SUCCESS(f"{verb.capitalize()} {total} rows."))
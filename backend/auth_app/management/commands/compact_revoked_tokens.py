@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from auth_app.revocation import revocation_store
+
+
+class Command(BaseCommand):
+    help = 'Delete expired revoked-token rows in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        deleted = revocation_store.compact(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Removed {deleted} expired revoked tokens.'))
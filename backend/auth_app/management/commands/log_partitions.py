@@ -0,0 +1,38 @@
+from datetime import datetime, timezone as dt_timezone
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.partitioning import drop_partitions_before, ensure_partitions, is_partitioned, partitioned_models, partitions
+
+
+def parse_month(value):
+    try:
+        return datetime.strptime(value, '%Y-%m').replace(tzinfo=dt_timezone.utc)
+    except ValueError:
+        raise CommandError(f'Invalid month {value!r}; use YYYY-MM')
+
+
+class Command(BaseCommand):
+    help = 'List, create ahead or drop the monthly partitions of the activity and audit logs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ensure', action='store_true', help='Create missing partitions ahead of time')
+        parser.add_argument('--ahead', type=int, default=None, help='Months to create ahead (with --ensure)')
+        parser.add_argument('--drop-before', metavar='YYYY-MM', help='Drop every month before this one')
+
+    def handle(self, *args, **options):
+        for model in partitioned_models():
+            label = model._meta.label
+            if options['ensure']:
+                created = ensure_partitions(model, ahead=options['ahead'])
+                self.stdout.write(f"{label}: created {', '.join(created) or 'nothing'}")
+            if options['drop_before']:
+                dropped, deleted = drop_partitions_before(model, parse_month(options['drop_before']))
+                self.stdout.write(self.style.SUCCESS(
+                    f'{label}: dropped {len(dropped)} partitions, deleted {deleted} rows'
+                ))
+            kind = 'partitioned' if is_partitioned(model) else 'plain table, months with rows'
+            self.stdout.write(f'{label} ({kind}):')
+            for partition in partitions(model):
+                month = f'{partition.start:%Y-%m}' if partition.start else 'default'
+                self.stdout.write(f'  {month:8} {partition.name:40} ~{partition.rows} rows')
@@ -0,0 +1,70 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from auth_app.startup_profiler import TARGETS, best_of
+
+
+class Command(BaseCommand):
+    help = 'Measure Django cold-start time and per-module import cost (python -X importtime)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--target', choices=TARGETS, default='urls',
+            help='How far to boot: django.setup(), plus the URLconf, plus the WSGI app',
+        )
+        parser.add_argument('--runs', type=int, default=3, help='Cold starts to run; the fastest is reported')
+        parser.add_argument('--top', type=int, default=20, help='Modules/packages to list')
+        parser.add_argument('--by', choices=('cumulative', 'self'), default='cumulative')
+        parser.add_argument('--json', action='store_true', help='Emit the report as JSON')
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Fail if the budget is exceeded or a lazy module is imported at startup',
+        )
+        parser.add_argument(
+            '--budget-ms', type=float, default=None,
+            help='Cold-start budget (defaults to STARTUP_BUDGET_MS)',
+        )
+        parser.add_argument(
+            '--module-budget', type=int, default=None,
+            help='Most modules the boot may import (defaults to STARTUP_MODULE_BUDGET)',
+        )
+
+    def handle(self, *args, **options):
+        profile = best_of(options['runs'], options['target'])
+        budget = options['budget_ms'] or settings.STARTUP_BUDGET_MS
+        module_budget = options['module_budget'] or settings.STARTUP_MODULE_BUDGET
+        eager = sorted(m for m in settings.STARTUP_LAZY_MODULES if profile.loaded(m))
+
+        if options['json']:
+            report = profile.as_dict(options['top'])
+            report.update({'budget_ms': budget, 'module_budget': module_budget, 'eager_lazy_modules': eager})
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.stdout.write(
+                f"Cold start to '{profile.target}': {profile.elapsed_ms:.1f} ms "
+                f"(budget {budget:.0f} ms, {profile.module_count} modules imported of {module_budget}, "
+                f"best of {options['runs']})"
+            )
+            self.stdout.write(f'\nTop modules by {options["by"]} import time:')
+            for record in profile.top_modules(options['top'], by=options['by']):
+                self.stdout.write(
+                    f'  {record.cumulative_us / 1000:8.2f} ms  {record.self_us / 1000:8.2f} ms  {record.module}'
+                )
+            self.stdout.write('\nSelf time per package:')
+            for package, us in profile.by_package()[:options['top']]:
+                self.stdout.write(f'  {us / 1000:8.2f} ms  {package}')
+
+        if not options['check']:
+            return
+        problems = []
+        if profile.elapsed_ms > budget:
+            problems.append(f'cold start took {profile.elapsed_ms:.1f} ms, budget is {budget:.0f} ms')
+        if profile.module_count > module_budget:
+            problems.append(f'{profile.module_count} modules imported, budget is {module_budget}')
+        if eager:
+            problems.append(f"modules meant to load lazily were imported: {', '.join(eager)}")
+        if problems:
+            raise CommandError('; '.join(problems))
+        self.stdout.write(self.style.SUCCESS('Startup within budget.'))
@@ -0,0 +1,29 @@
+# Generated by Django 5.1.2 on 2026-10-19 00:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevokedToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jti', models.CharField(max_length=255, unique=True)),
+                ('token_type', models.CharField(choices=[('access', 'Access'), ('refresh', 'Refresh')], max_length=10)),
+                ('expires_at', models.DateTimeField()),
+                ('revoked_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'db_table': 'revoked_tokens',
+                'ordering': ['-revoked_at'],
+                'indexes': [models.Index(fields=['expires_at'], name='revoked_tok_expires_cdc4fe_idx'), models.Index(fields=['revoked_at'], name='revoked_tok_revoked_9339bb_idx')],
+            },
+        ),
+    ]
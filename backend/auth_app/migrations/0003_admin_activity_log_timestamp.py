@@ -0,0 +1,19 @@
+# Generated by Django 5.1.2 on 2026-10-19 01:54
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth_app', '0002_revokedtoken'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='adminactivitylog',
+            name='created_at',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from config.partitioning import partition_table, unpartition_table
+
+
+def partition(apps, schema_editor):
+    partition_table(schema_editor, apps.get_model('auth_app', 'AdminActivityLog'))
+
+
+def unpartition(apps, schema_editor):
+    unpartition_table(schema_editor, apps.get_model('auth_app', 'AdminActivityLog'))
+
+
+class Migration(migrations.Migration):
+    """Monthly created_at partitions on PostgreSQL; nothing to do elsewhere"""
+
+    dependencies = [
+        ('auth_app', '0003_admin_activity_log_timestamp'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -111,7 +111,8 @@ class AdminActivityLog(models.Model):
     metadata = models.JSONField(default=dict, blank=True, help_text="Additional data about the action")
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens; rows may be inserted later in a batch
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
     
     class Meta:
         db_table = 'admin_activity_logs'
@@ -126,3 +127,27 @@ class AdminActivityLog(models.Model):
     def __str__(self):
         admin_name = self.admin_user.email if self.admin_user else "System"
         return f"{admin_name} - {self.get_action_display()} at {self.created_at}"
+
+
+class RevokedToken(models.Model):
+    """JWT (refresh or access) that was revoked before its natural expiry"""
+
+    class TokenType(models.TextChoices):
+        ACCESS = 'access', 'Access'
+        REFRESH = 'refresh', 'Refresh'
+
+    jti = models.CharField(max_length=255, unique=True)
+    token_type = models.CharField(max_length=10, choices=TokenType.choices)
+    expires_at = models.DateTimeField()
+    revoked_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'revoked_tokens'
+        ordering = ['-revoked_at']
+        indexes = [
+            models.Index(fields=['expires_at']),
+            models.Index(fields=['revoked_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.token_type} {self.jti} (expires {self.expires_at})"
@@ -0,0 +1,214 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import NotSupportedError
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+_COMMENT_RE = re.compile(r'(/\*.*?\*/)|(--[^\n]*)', re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?|%\(\w+\)s')
+_IN_LIST_RE = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.I)
+_VALUES_RE = re.compile(r'\bVALUES\s*(\([^()]*\))(?:\s*,\s*\([^()]*\))*', re.I)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_sql(sql):
+    """Collapse literals, placeholders and IN/VALUES lists so equivalent queries match"""
+    normalized = _COMMENT_RE.sub(' ', sql)
+    normalized = _STRING_RE.sub('?', normalized)
+    normalized = _PLACEHOLDER_RE.sub('?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
+    normalized = _IN_LIST_RE.sub('IN (...)', normalized)
+    normalized = _VALUES_RE.sub(r'VALUES \1 /* ... */', normalized)
+    return _WHITESPACE_RE.sub(' ', normalized).strip()
+
+
+def fingerprint_sql(sql):
+    """Return (fingerprint, normalized_sql) for a raw SQL statement"""
+    normalized = normalize_sql(sql)
+    digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+    return digest, normalized
+
+
+class QueryStats:
+    """Aggregated timings for a single query fingerprint"""
+
+    def __init__(self, fingerprint, normalized_sql, sample_size):
+        self.fingerprint = fingerprint
+        self.sql = normalized_sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.slow_count = 0
+        self.samples = deque(maxlen=sample_size)
+        self.explain = None
+        self.explain_sql = None
+        self.explain_ms = None
+        self.explain_captured_at = None
+        self.last_seen = None
+
+    def record(self, duration_ms, slow):
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+        self.last_seen = timezone.now()
+        if slow:
+            self.slow_count += 1
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def as_dict(self):
+        return {
+            'fingerprint': self.fingerprint,
+            'sql': self.sql,
+            'count': self.count,
+            'total_ms': round(self.total_ms, 3),
+            'avg_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p95_ms': round(self.percentile(95), 3),
+            'max_ms': round(self.max_ms, 3),
+            'slow_count': self.slow_count,
+            'last_seen': self.last_seen,
+            'explain': {
+                'plan': self.explain,
+                'sql': self.explain_sql,
+                'duration_ms': self.explain_ms,
+                'captured_at': self.explain_captured_at,
+            } if self.explain is not None else None,
+        }
+
+
+class QueryProfiler:
+    """
+    Database execute wrapper that aggregates per-fingerprint timings in-process.
+
+    Install with ``connection.execute_wrapper(profiler)``; queries slower than
+    ``SLOW_QUERY_THRESHOLD_MS`` are logged and have their ``EXPLAIN`` plan captured.
+    """
+
+    SORT_KEYS = {
+        'total': lambda s: s.total_ms,
+        'p95': lambda s: s.percentile(95),
+        'count': lambda s: s.count,
+        'max': lambda s: s.max_ms,
+    }
+
+    def __init__(self, threshold_ms=None, max_fingerprints=None, sample_size=None, explain_interval=None):
+        self.threshold_ms = threshold_ms if threshold_ms is not None else getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200)
+        self.max_fingerprints = max_fingerprints or getattr(settings, 'QUERY_PROFILER_MAX_FINGERPRINTS', 500)
+        self.sample_size = sample_size or getattr(settings, 'QUERY_PROFILER_SAMPLE_SIZE', 256)
+        self.explain_interval = explain_interval if explain_interval is not None else getattr(
+            settings, 'QUERY_PROFILER_EXPLAIN_INTERVAL', 300
+        )
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __call__(self, execute, sql, params, many, context):
+        # EXPLAIN runs through the same connection, so skip our own statements
+        if getattr(self._local, 'active', False):
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            try:
+                self._record(sql, params, many, context, duration_ms)
+            except Exception:
+                logger.exception('Query profiler failed to record a query')
+
+    def _record(self, sql, params, many, context, duration_ms):
+        fingerprint, normalized = fingerprint_sql(sql)
+        slow = duration_ms >= self.threshold_ms
+
+        with self._lock:
+            stats = self._stats.get(fingerprint)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._evict()
+                stats = self._stats[fingerprint] = QueryStats(fingerprint, normalized, self.sample_size)
+            stats.record(duration_ms, slow)
+            needs_explain = slow and not many and self._explain_due(stats)
+
+        if slow:
+            logger.warning('Slow query (%.1f ms) [%s]: %s', duration_ms, fingerprint, normalized[:500])
+        if needs_explain:
+            self._capture_explain(stats, sql, params, context.get('connection'), duration_ms)
+
+    def _evict(self):
+        """Drop the cheapest fingerprint to keep memory bounded"""
+        victim = min(self._stats.values(), key=lambda s: s.total_ms)
+        del self._stats[victim.fingerprint]
+
+    def _explain_due(self, stats):
+        if stats.explain_captured_at is None:
+            return True
+        age = (timezone.now() - stats.explain_captured_at).total_seconds()
+        return age >= self.explain_interval
+
+    def _capture_explain(self, stats, sql, params, connection, duration_ms):
+        statement = sql.lstrip().split(None, 1)[0].upper() if sql.strip() else ''
+        if connection is None or statement not in ('SELECT', 'WITH'):
+            return
+        if connection.needs_rollback:
+            return
+
+        self._local.active = True
+        try:
+            prefix = connection.ops.explain_query_prefix()
+            with connection.cursor() as cursor:
+                cursor.execute(f'{prefix} {sql}', params)
+                rows = cursor.fetchall()
+            plan = '\n'.join(' '.join(str(col) for col in row) for row in rows)
+        except NotSupportedError:
+            return
+        except Exception as exc:
+            logger.debug('Unable to capture EXPLAIN for %s: %s', stats.fingerprint, exc)
+            return
+        finally:
+            self._local.active = False
+
+        with self._lock:
+            stats.explain = plan
+            stats.explain_sql = sql
+            stats.explain_ms = round(duration_ms, 3)
+            stats.explain_captured_at = timezone.now()
+
+    def top(self, limit=20, sort='total'):
+        key = self.SORT_KEYS.get(sort, self.SORT_KEYS['total'])
+        with self._lock:
+            ordered = sorted(self._stats.values(), key=key, reverse=True)[:limit]
+            return [stats.as_dict() for stats in ordered]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+profiler = QueryProfiler()
+
+
+def get_top_fingerprints(limit=20, sort='total'):
+    """Return the heaviest query fingerprints recorded by this process"""
+    return profiler.top(limit=limit, sort=sort)
+
+
+def reset_query_stats():
+    profiler.reset()
@@ -0,0 +1,181 @@
+"""
+JWT revocation store.
+
+Revoked JTIs are persisted in `RevokedToken` with their expiry. Membership
+checks are answered from a per-process Bloom filter, so the common case (a
+token that was never revoked) costs no query; only filter positives are
+confirmed against the database. The filter is refreshed incrementally from
+rows revoked by other processes every TOKEN_REVOCATION_SYNC_INTERVAL seconds
+and rebuilt after compaction.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings using double hashing"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(1, int(capacity))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, item):
+        new = False
+        for pos in self._positions(item):
+            mask = 1 << (pos & 7)
+            if not self.bits[pos >> 3] & mask:
+                self.bits[pos >> 3] |= mask
+                new = True
+        # Re-adding an item (every sync re-reads its overlap) is not a new entry
+        if new:
+            self.count += 1
+
+    def __contains__(self, item):
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    @property
+    def saturated(self):
+        return self.count > self.capacity
+
+
+class RevocationStore:
+    """Per-process view of the revoked-token table"""
+
+    # Re-read a little history on every sync so rows committed late by other
+    # processes (with an earlier revoked_at) are not missed
+    SYNC_OVERLAP = timedelta(seconds=5)
+
+    def __init__(self, capacity=None, error_rate=None, sync_interval=None):
+        self.capacity = capacity or getattr(settings, 'TOKEN_REVOCATION_BLOOM_CAPACITY', 100_000)
+        self.error_rate = error_rate or getattr(settings, 'TOKEN_REVOCATION_BLOOM_ERROR_RATE', 0.001)
+        self.sync_interval = sync_interval if sync_interval is not None else getattr(
+            settings, 'TOKEN_REVOCATION_SYNC_INTERVAL', 5
+        )
+        self._lock = threading.Lock()
+        self._filter = None
+        self._synced_at = 0.0
+        self._high_water = None
+        self.db_checks = 0
+        self.false_positives = 0
+
+    # Filter maintenance
+
+    def _rebuild(self):
+        now = timezone.now()
+        rows = list(
+            RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', 'revoked_at')
+        )
+        bloom = BloomFilter(max(self.capacity, len(rows) * 2), self.error_rate)
+        high_water = None
+        for jti, revoked_at in rows:
+            bloom.add(jti)
+            if high_water is None or revoked_at > high_water:
+                high_water = revoked_at
+        self._filter = bloom
+        self._high_water = high_water or now
+        self._synced_at = time.monotonic()
+
+    def _sync(self):
+        since = self._high_water - self.SYNC_OVERLAP
+        rows = RevokedToken.objects.filter(revoked_at__gte=since).values_list('jti', 'revoked_at')
+        for jti, revoked_at in rows:
+            self._filter.add(jti)
+            if revoked_at > self._high_water:
+                self._high_water = revoked_at
+        self._synced_at = time.monotonic()
+
+    def _refresh(self):
+        with self._lock:
+            if self._filter is None or self._filter.saturated:
+                self._rebuild()
+            elif time.monotonic() - self._synced_at >= self.sync_interval:
+                self._sync()
+
+    def reset(self):
+        with self._lock:
+            self._filter = None
+
+    # Public API
+
+    def is_revoked(self, jti):
+        if not jti:
+            return False
+        self._refresh()
+        if jti not in self._filter:
+            return False
+        self.db_checks += 1
+        revoked = RevokedToken.objects.filter(jti=jti, expires_at__gt=timezone.now()).exists()
+        if not revoked:
+            self.false_positives += 1
+        return revoked
+
+    def revoke(self, jti, expires_at, token_type=RevokedToken.TokenType.REFRESH):
+        RevokedToken.objects.bulk_create(
+            [RevokedToken(jti=jti, token_type=token_type, expires_at=expires_at)],
+            ignore_conflicts=True,
+        )
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(jti)
+
+    def revoke_token(self, token):
+        """Revoke a simplejwt Token instance (RefreshToken or AccessToken)"""
+        jti = token.get(api_settings.JTI_CLAIM)
+        exp = token.get('exp')
+        expires_at = datetime.fromtimestamp(exp, tz=dt_timezone.utc) if exp else timezone.now()
+        token_type = token.get(api_settings.TOKEN_TYPE_CLAIM, RevokedToken.TokenType.REFRESH)
+        self.revoke(jti, expires_at, token_type)
+
+    def compact(self, batch_size=1000):
+        """Delete expired rows in bounded batches and rebuild the filter"""
+        deleted = 0
+        now = timezone.now()
+        while True:
+            ids = list(
+                RevokedToken.objects.filter(expires_at__lte=now).values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            deleted += RevokedToken.objects.filter(id__in=ids).delete()[0]
+        with self._lock:
+            self._rebuild()
+        if deleted:
+            logger.info('Compacted %s expired revoked tokens', deleted)
+        return deleted
+
+    def stats(self):
+        bloom = self._filter
+        return {
+            'entries': bloom.count if bloom else None,
+            'capacity': bloom.capacity if bloom else self.capacity,
+            'bits': bloom.size if bloom else None,
+            'hashes': bloom.hash_count if bloom else None,
+            'db_checks': self.db_checks,
+            'false_positives': self.false_positives,
+        }
+
+
+revocation_store = RevocationStore()
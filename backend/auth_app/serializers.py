@@ -1,4 +1,8 @@
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
 from .models import PasswordResetRequest, AdminActivityLog
 from users.serializers import UserSerializer
 
@@ -66,3 +70,28 @@ class AdminActivityLogSerializer(serializers.ModelSerializer):
             'ip_address', 'user_agent', 'created_at'
         ]
         read_only_fields = fields
+
+
+class RevocationAwareTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh serializer that rejects revoked refresh tokens and revokes rotated ones"""
+
+    def validate(self, attrs):
+        from .revocation import revocation_store
+
+        refresh = self.token_class(attrs['refresh'])
+        if revocation_store.is_revoked(refresh.get(api_settings.JTI_CLAIM)):
+            raise TokenError(_('Token is blacklisted'))
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                revocation_store.revoke_token(refresh)
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+
+            data['refresh'] = str(refresh)
+
+        return data
@@ -0,0 +1,140 @@
+"""
+Cold-start profiling.
+
+Boots Django in a fresh interpreter under ``python -X importtime`` and
+reports wall time plus per-module import cost, so startup regressions
+(a heavy dependency imported at module load) show up in CI rather than as
+slow cold starts on the host.
+"""
+import json
+import os
+import re
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+# Stages a cold start can be measured up to
+TARGETS = ('setup', 'urls', 'wsgi')
+
+_BOOT_SCRIPT = """
+import json, os, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+target = sys.argv[1]
+if target in ('urls', 'wsgi'):
+    from django.conf import settings
+    from django.urls import get_resolver
+    get_resolver(settings.ROOT_URLCONF).url_patterns
+if target == 'wsgi':
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+elapsed = time.perf_counter() - started
+print(json.dumps({'elapsed_ms': elapsed * 1000, 'modules': sorted(sys.modules)}))
+"""
+
+_IMPORTTIME_RE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$')
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+@dataclass
+class StartupProfile:
+    target: str
+    elapsed_ms: float
+    imports: list = field(default_factory=list)
+    modules: frozenset = frozenset()
+
+    def top_modules(self, limit=20, by='cumulative'):
+        key = (lambda r: r.cumulative_us) if by == 'cumulative' else (lambda r: r.self_us)
+        return sorted(self.imports, key=key, reverse=True)[:limit]
+
+    def by_package(self):
+        """Self time summed per top-level package, in microseconds, most expensive first"""
+        totals = {}
+        for record in self.imports:
+            package = record.module.split('.', 1)[0]
+            totals[package] = totals.get(package, 0) + record.self_us
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+    @property
+    def module_count(self):
+        """Modules imported during the boot; unlike elapsed_ms, not affected by machine load"""
+        return len(self.imports)
+
+    def loaded(self, module):
+        return module in self.modules
+
+    def as_dict(self, limit=20):
+        return {
+            'target': self.target,
+            'elapsed_ms': round(self.elapsed_ms, 1),
+            'module_count': self.module_count,
+            'top_modules': [
+                {
+                    'module': r.module,
+                    'self_ms': round(r.self_us / 1000, 2),
+                    'cumulative_ms': round(r.cumulative_us / 1000, 2),
+                }
+                for r in self.top_modules(limit)
+            ],
+            'packages': [
+                {'package': package, 'self_ms': round(us / 1000, 2)}
+                for package, us in self.by_package()[:limit]
+            ],
+        }
+
+
+def parse_importtime(output):
+    """Parse the stderr of ``python -X importtime`` into ImportRecords"""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(ImportRecord(module, int(self_us), int(cumulative_us), max(0, (len(indent) - 1) // 2)))
+    return records
+
+
+def profile_startup(target='urls', settings_module=None):
+    """Boot Django in a subprocess up to `target` and return a StartupProfile"""
+    if target not in TARGETS:
+        raise ValueError(f"Unknown target '{target}', expected one of {', '.join(TARGETS)}")
+    env = dict(os.environ)
+    env['DJANGO_SETTINGS_MODULE'] = settings_module or os.environ.get(
+        'DJANGO_SETTINGS_MODULE', 'config.settings'
+    )
+    env.pop('PYTHONPROFILEIMPORTTIME', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', _BOOT_SCRIPT, target],
+        cwd=str(settings.BASE_DIR),
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0:
+        tail = '\n'.join(line for line in result.stderr.splitlines() if not line.startswith('import time:'))
+        raise RuntimeError(f'Startup failed:\n{tail[-2000:]}')
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return StartupProfile(
+        target=target,
+        elapsed_ms=report['elapsed_ms'],
+        imports=parse_importtime(result.stderr),
+        modules=frozenset(report['modules']),
+    )
+
+
+def best_of(runs, target='urls'):
+    """Profile `runs` cold starts and keep the fastest, which is the least noisy"""
+    profiles = [profile_startup(target) for _ in range(max(1, runs))]
+    return min(profiles, key=lambda p: p.elapsed_ms)
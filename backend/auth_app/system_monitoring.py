@@ -1,11 +1,13 @@
 import os
-import platform
-import psutil
 import logging
 from django.db import connection
+from config.db import get_pool_stats
+from config.write_behind import write_behind
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
+from jobs.queue import queue_stats
+from jobs.scheduler import scheduler_status
 from tasks.models import Task, Project, Notification
 from .models import AdminActivityLog, PasswordResetRequest
 
@@ -16,7 +18,10 @@ User = get_user_model()
 
 def get_system_status():
     """Get overall system health and statistics"""
-    
+    # Imported here so psutil/platform stay off the startup path
+    import platform
+    import psutil
+
     # CPU and Memory
     cpu_percent = psutil.cpu_percent(interval=1)
     memory = psutil.virtual_memory()
@@ -74,6 +79,7 @@ def get_system_status():
         'database': {
             'size': db_size,
             'connection': connection.vendor,
+            'pools': get_pool_stats(),
         },
         'statistics': {
             'total_users': total_users,
@@ -86,7 +92,27 @@ def get_system_status():
         'activity': {
             'recent_logins_24h': recent_logins,
             'recent_activities_24h': recent_activities,
-        }
+        },
+        'caches': get_cache_stats(),
+        'jobs': queue_stats(),
+        'scheduler': scheduler_status(),
+        'write_behind': write_behind.stats(),
+    }
+
+
+def get_cache_stats():
+    """Hit/miss counters for the in-process caches of this worker"""
+    from config.fragment_cache import task_fragments, user_fragments
+    from users.authentication import user_cache
+    from .hashing import password_pool
+    from .revocation import revocation_store
+
+    return {
+        'jwt_users': user_cache.stats(),
+        'task_fragments': task_fragments.stats(),
+        'user_fragments': user_fragments.stats(),
+        'token_revocation': revocation_store.stats(),
+        'password_hashing': password_pool.stats(),
     }
 
 
@@ -0,0 +1,81 @@
+import threading
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .hashing import HashingUnavailable, PasswordHashingPool, password_pool
+from .throttling import LoginEmailThrottle, LoginIPThrottle, SlidingWindowRateThrottle
+
+
+class LoginThrottlingTest(APITestCase):
+    """Test cases for login throttling and the hashing pool"""
+
+    def setUp(self):
+        cache.clear()
+        # Pin the clock mid-window so a minute boundary cannot reset the counters
+        timer = mock.patch.object(SlidingWindowRateThrottle, 'timer', lambda self: 6_000_030.0)
+        timer.start()
+        self.addCleanup(timer.stop)
+        self.email = f'login_{uuid.uuid4().hex[:8]}@example.com'
+        User.objects.create_user(username=f'login_{uuid.uuid4().hex[:8]}', email=self.email, password='testpass123')
+        self.url = reverse('login')
+
+    def login(self, password='testpass123', email=None, ip='10.0.0.1'):
+        return self.client.post(
+            self.url, {'email': email or self.email, 'password': password}, format='json', REMOTE_ADDR=ip
+        )
+
+    def test_successful_login(self):
+        response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('access', response.data['tokens'])
+
+    def test_wrong_password_is_rejected(self):
+        self.assertEqual(self.login(password='wrong-password').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_email_throttle_applies_across_ips(self):
+        with mock.patch.object(LoginEmailThrottle, 'rate', '2/min', create=True):
+            self.assertEqual(self.login(password='bad', ip='10.0.0.1').status_code, status.HTTP_401_UNAUTHORIZED)
+            self.assertEqual(self.login(password='bad', ip='10.0.0.2').status_code, status.HTTP_401_UNAUTHORIZED)
+            with mock.patch.object(password_pool, 'verify') as verify:
+                response = self.login(ip='10.0.0.3')
+            self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+            verify.assert_not_called()
+
+    def test_ip_throttle(self):
+        with mock.patch.object(LoginIPThrottle, 'rate', '1/min', create=True):
+            self.login(email='first@example.com')
+            response = self.login(email='second@example.com')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+
+    def test_saturated_pool_rejects_before_hashing(self):
+        with mock.patch.object(password_pool, '_admission', threading.BoundedSemaphore(1)) as admission:
+            admission.acquire()
+            response = self.login()
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+    def test_timed_out_hash_keeps_its_permit(self):
+        pool = PasswordHashingPool(workers=1, max_pending=1, timeout=0.05)
+        release, finished = threading.Event(), threading.Event()
+
+        def slow_check(raw_password, encoded):
+            release.wait(5)
+            return False
+
+        user = User.objects.get(email=self.email)
+        with mock.patch('auth_app.hashing.check_password', slow_check):
+            with self.assertRaises(HashingUnavailable):
+                pool.verify(user, 'testpass123')
+            # Still hashing: a second login must not start another one
+            self.assertFalse(pool._admission.acquire(blocking=False))
+            pool._executor.submit(finished.set)
+            release.set()
+            finished.wait(5)
+        self.assertTrue(pool._admission.acquire(blocking=False))
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from users.models import User
+from .query_profiler import QueryProfiler, fingerprint_sql, normalize_sql, reset_query_stats
+
+
+class FingerprintTest(TestCase):
+    """Test cases for SQL normalization"""
+
+    def test_literals_and_placeholders_collapse(self):
+        a = normalize_sql("SELECT * FROM tasks WHERE id = 5 AND title = 'abc' LIMIT 21")
+        b = normalize_sql("SELECT * FROM tasks WHERE id = %s AND title = %s LIMIT 10")
+        self.assertEqual(a, b)
+        self.assertEqual(a, 'SELECT * FROM tasks WHERE id = ? AND title = ? LIMIT ?')
+
+    def test_in_lists_of_any_length_share_a_fingerprint(self):
+        short, _ = fingerprint_sql('SELECT * FROM users WHERE id IN (%s, %s)')
+        long, _ = fingerprint_sql('SELECT * FROM users WHERE id IN (%s, %s, %s, %s)')
+        self.assertEqual(short, long)
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertIn('t1', normalize_sql('SELECT t1.id FROM tasks t1'))
+
+
+class QueryProfilerTest(TestCase):
+    """Test cases for the execute wrapper"""
+
+    def test_aggregates_and_captures_explain(self):
+        profiler = QueryProfiler(threshold_ms=0, explain_interval=0)
+        with connection.execute_wrapper(profiler):
+            for _ in range(3):
+                list(User.objects.filter(email='nobody@example.com'))
+
+        top = profiler.top(limit=1)
+        self.assertEqual(len(top), 1)
+        self.assertEqual(top[0]['count'], 3)
+        self.assertEqual(top[0]['slow_count'], 3)
+        self.assertIsNotNone(top[0]['explain'])
+        self.assertTrue(top[0]['explain']['plan'])
+
+    def test_evicts_when_full(self):
+        profiler = QueryProfiler(threshold_ms=10_000, max_fingerprints=2)
+        with connection.execute_wrapper(profiler):
+            User.objects.count()
+            list(User.objects.filter(role=User.Role.ADMIN))
+            list(User.objects.filter(is_active=True))
+        self.assertEqual(len(profiler.top(limit=10)), 2)
+
+
+class SlowQueryEndpointTest(APITestCase):
+    """Test cases for the admin slow-query endpoint"""
+
+    def setUp(self):
+        reset_query_stats()
+        self.admin = User.objects.create_user(
+            username='profiler_admin', email='profiler_admin@example.com', password='adminpass123', role=User.Role.ADMIN
+        )
+        self.member = User.objects.create_user(
+            username='profiler_member', email='profiler_member@example.com', password='memberpass123', role=User.Role.MEMBER
+        )
+
+    def test_admin_can_list_fingerprints(self):
+        self.client.force_authenticate(user=self.admin)
+        self.client.get(reverse('user-list'))
+        response = self.client.get(reverse('slow-queries'), {'sort': 'count'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['fingerprints'])
+
+    def test_limit_must_be_positive(self):
+        self.client.force_authenticate(user=self.admin)
+        for limit in ('-5', '0', 'many'):
+            response = self.client.get(reverse('slow-queries'), {'limit': limit})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, limit)
+
+    def test_unknown_sort_is_rejected(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(reverse('slow-queries'), {'sort': 'slowest'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(reverse('slow-queries'), {'sort': 'p95'}).data['sort'], 'p95')
+
+    def test_member_is_forbidden(self):
+        self.client.force_authenticate(user=self.member)
+        response = self.client.get(reverse('slow-queries'))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,112 @@
+import uuid
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from .models import RevokedToken
+from .revocation import BloomFilter, RevocationStore, revocation_store
+
+
+class BloomFilterTest(TestCase):
+    """Test cases for the Bloom filter"""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        items = [uuid.uuid4().hex for _ in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate_is_bounded(self):
+        bloom = BloomFilter(1000, 0.01)
+        for _ in range(1000):
+            bloom.add(uuid.uuid4().hex)
+        hits = sum(uuid.uuid4().hex in bloom for _ in range(5000))
+        self.assertLess(hits / 5000, 0.05)
+
+    def test_readding_does_not_count(self):
+        bloom = BloomFilter(10)
+        for _ in range(3):
+            bloom.add('same')
+        self.assertEqual(bloom.count, 1)
+
+
+class RevocationStoreTest(TestCase):
+    """Test cases for the revocation store"""
+
+    def test_negative_lookups_skip_the_database(self):
+        store = RevocationStore(sync_interval=3600)
+        store.is_revoked('warm-up')
+        with self.assertNumQueries(0):
+            self.assertFalse(store.is_revoked(uuid.uuid4().hex))
+
+    def test_revoked_jti_is_found(self):
+        store = RevocationStore(sync_interval=3600)
+        store.revoke('abc', timezone.now() + timedelta(hours=1))
+        self.assertTrue(store.is_revoked('abc'))
+
+    def test_picks_up_revocations_from_other_processes(self):
+        store = RevocationStore(sync_interval=0)
+        store.is_revoked('warm-up')
+        RevokedToken.objects.create(jti='elsewhere', token_type='refresh', expires_at=timezone.now() + timedelta(hours=1))
+        self.assertTrue(store.is_revoked('elsewhere'))
+
+    def test_overlapping_syncs_do_not_force_rebuilds(self):
+        store = RevocationStore(capacity=2, sync_interval=0)
+        for jti in ('one', 'two'):
+            RevokedToken.objects.create(jti=jti, token_type='refresh', expires_at=timezone.now() + timedelta(hours=1))
+        store.is_revoked('warm-up')
+        bloom = store._filter
+        for _ in range(5):
+            store.is_revoked('one')
+        self.assertIs(store._filter, bloom)
+        self.assertEqual(bloom.count, 2)
+
+    def test_compact_removes_expired_rows(self):
+        store = RevocationStore()
+        store.revoke('old', timezone.now() - timedelta(minutes=1))
+        store.revoke('live', timezone.now() + timedelta(hours=1))
+        self.assertEqual(store.compact(batch_size=1), 1)
+        self.assertFalse(store.is_revoked('old'))
+        self.assertTrue(store.is_revoked('live'))
+
+
+class LogoutRevocationTest(APITestCase):
+    """Test cases for logout and refresh token revocation"""
+
+    def setUp(self):
+        revocation_store.reset()
+        self.user = User.objects.create_user(
+            username=f'revoke_{uuid.uuid4().hex[:8]}',
+            email=f'revoke_{uuid.uuid4().hex[:8]}@example.com',
+            password='testpass123',
+        )
+        self.refresh = RefreshToken.for_user(self.user)
+        self.access = str(self.refresh.access_token)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.access}')
+
+    def test_logout_revokes_refresh_and_access_tokens(self):
+        response = self.client.post(reverse('logout'), {'refresh_token': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get('/api/users/profile/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        self.client.credentials()
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rotated_refresh_token_cannot_be_reused(self):
+        self.client.credentials()
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('refresh', response.data)
+
+        response = self.client.post(reverse('token_refresh'), {'refresh': str(self.refresh)}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
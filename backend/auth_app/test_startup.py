@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.test import SimpleTestCase, TestCase
+
+from .startup_profiler import parse_importtime, profile_startup
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   encodings
+import time:      1000 |       1420 | django
+Traceback noise that is not an import line
+"""
+
+
+class ParseImporttimeTest(SimpleTestCase):
+    """Test cases for parsing `python -X importtime` output"""
+
+    def test_parses_records_and_depth(self):
+        records = parse_importtime(SAMPLE)
+        self.assertEqual([r.module for r in records], ['_io', 'encodings', 'django'])
+        self.assertEqual([r.depth for r in records], [2, 1, 0])
+        self.assertEqual(records[2].cumulative_us, 1420)
+
+
+class StartupBudgetTest(TestCase):
+    """Cold start must stay within STARTUP_MODULE_BUDGET and keep heavy modules lazy"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.profile = profile_startup('urls')
+
+    def test_lazy_modules_are_not_imported(self):
+        eager = [m for m in settings.STARTUP_LAZY_MODULES if self.profile.loaded(m)]
+        self.assertEqual(eager, [])
+
+    def test_within_module_budget(self):
+        # Import count rather than wall time, which is noise on a loaded CI machine
+        self.assertLessEqual(self.profile.module_count, settings.STARTUP_MODULE_BUDGET)
+
+    def test_package_breakdown(self):
+        packages = dict(self.profile.by_package())
+        self.assertIn('django', packages)
+        self.assertIn('config', packages)
+
+
+class LazyDocsTest(TestCase):
+    """The docs views are imported on first request and still render"""
+
+    def test_schema_served(self):
+        response = self.client.get('/api/schema/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'jwtAuth', response.content)
@@ -0,0 +1,65 @@
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter throttle.
+
+    DRF's SimpleRateThrottle stores the full request history per key and
+    rewrites it on every hit. This keeps two fixed-window counters instead
+    (current and previous window) and weights the previous one by how much
+    of it still overlaps the sliding window, so each check is one
+    `get_many` plus one `incr` against the configured cache - in-process
+    LocMem by default, shared when CACHES points at Redis/Memcached.
+    """
+
+    cache_format = 'throttle_sw_%(scope)s_%(ident)s'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        current_key = f'{self.key}:{window}'
+        previous_key = f'{self.key}:{window - 1}'
+        counts = self.cache.get_many([current_key, previous_key])
+
+        elapsed = (self.now % self.duration) / self.duration
+        self.estimated = counts.get(previous_key, 0) * (1 - elapsed) + counts.get(current_key, 0)
+        if self.estimated >= self.num_requests:
+            return self.throttle_failure()
+
+        # Counters live for two windows so the next window can still weight this one
+        if not self.cache.add(current_key, 1, self.duration * 2):
+            try:
+                self.cache.incr(current_key)
+            except ValueError:
+                self.cache.set(current_key, 1, self.duration * 2)
+        return True
+
+    def wait(self):
+        return self.duration - (self.now % self.duration)
+
+
+class LoginIPThrottle(SlidingWindowRateThrottle):
+    """Limit login attempts per client IP"""
+    scope = 'login_ip'
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class LoginEmailThrottle(SlidingWindowRateThrottle):
+    """Limit login attempts per target account, whatever IP they come from"""
+    scope = 'login_email'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not email:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': str(email).strip().lower()}
@@ -1,5 +1,5 @@
 from rest_framework import status, generics, viewsets
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -9,7 +9,11 @@ from django.db import transaction
 from users.models import User
 from users.serializers import UserRegistrationSerializer, UserSerializer
 from users.permissions import CanManageUsers
+from config.db_router import ReplicaReadMixin, read_from_replica
+from config.write_behind import write_behind
 from .models import PasswordResetRequest, AdminActivityLog
+from .hashing import HashingUnavailable, password_pool
+from .throttling import LoginEmailThrottle, LoginIPThrottle
 from .serializers import (
     PasswordResetRequestSerializer,
     PasswordResetApprovalSerializer,
@@ -35,10 +39,10 @@ def get_client_ip(request):
 def log_admin_action(admin_user, action, description, target_user=None, metadata=None, request=None):
     """Helper function to log admin activities"""
     log_data = {
-        'admin_user': admin_user,
+        'admin_user_id': admin_user.pk if admin_user else None,
         'action': action,
         'description': description,
-        'target_user': target_user,
+        'target_user_id': target_user.pk if target_user else None,
         'metadata': metadata or {},
     }
     
@@ -46,8 +50,9 @@ def log_admin_action(admin_user, action, description, target_user=None, metadata
         log_data['ip_address'] = get_client_ip(request)
         log_data['user_agent'] = request.META.get('HTTP_USER_AGENT', '')
     
-    AdminActivityLog.objects.create(**log_data)
-    logger.info(f"Admin action logged: {description}")
+    # Batched insert once the surrounding transaction commits
+    write_behind.add(AdminActivityLog(**log_data))
+    logger.info("Admin action logged: %s", description)
 
 
 class RegisterView(generics.CreateAPIView):
@@ -81,8 +86,13 @@ class RegisterView(generics.CreateAPIView):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([LoginIPThrottle, LoginEmailThrottle])
 def login_view(request):
-    """User login view"""
+    """User login view
+
+    Attempts are throttled per IP and per email before any hashing starts,
+    and password verification runs in the bounded hashing pool.
+    """
     email = request.data.get('email')
     password = request.data.get('password')
     
@@ -100,7 +110,17 @@ def login_view(request):
             status=status.HTTP_401_UNAUTHORIZED
         )
     
-    if not user.check_password(password):
+    try:
+        password_valid = password_pool.verify(user, password)
+    except HashingUnavailable:
+        response = Response(
+            {'error': 'Login service is busy, please retry shortly'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        response['Retry-After'] = '1'
+        return response
+
+    if not password_valid:
         return Response(
             {'error': 'Invalid credentials'},
             status=status.HTTP_401_UNAUTHORIZED
@@ -127,12 +147,16 @@ def login_view(request):
 
 @api_view(['POST'])
 def logout_view(request):
-    """User logout view (blacklist refresh token)"""
+    """User logout view (revoke refresh token and the current access token)"""
+    from .revocation import revocation_store
+
     try:
         refresh_token = request.data.get('refresh_token')
         if refresh_token:
             token = RefreshToken(refresh_token)
-            token.blacklist()
+            revocation_store.revoke_token(token)
+        if request.auth is not None:
+            revocation_store.revoke_token(request.auth)
         return Response(
             {'message': 'Logout successful'},
             status=status.HTTP_200_OK
@@ -181,10 +205,11 @@ def request_password_reset(request):
         )
 
         # Notify Admins
+        from tasks.jobs import notify
         from tasks.models import Notification
         admins = User.objects.filter(role=User.Role.ADMIN)
         for admin in admins:
-            Notification.objects.create(
+            notify(
                 user=admin,
                 type=Notification.SYSTEM_ALERT,
                 message=f"New password reset request from {user.email}"
@@ -390,7 +415,7 @@ class PasswordResetRequestViewSet(viewsets.ModelViewSet):
         }, status=status.HTTP_200_OK)
 
 
-class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class AdminActivityLogViewSet(ReplicaReadMixin, viewsets.ReadOnlyModelViewSet):
     """ViewSet for viewing admin activity logs (Admin only)"""
     queryset = AdminActivityLog.objects.all()
     serializer_class = AdminActivityLogSerializer
@@ -430,6 +455,7 @@ class AdminActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, CanManageUsers])
+@read_from_replica
 def system_status(request):
     """Get system status and health metrics (Admin only)"""
     from .system_monitoring import get_system_status
@@ -445,8 +471,42 @@ def system_status(request):
         )
 
 
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated, CanManageUsers])
+def slow_queries(request):
+    """List the heaviest query fingerprints recorded by this worker (Admin only)"""
+    from django.conf import settings
+    from .query_profiler import QueryProfiler, get_top_fingerprints, reset_query_stats
+
+    if request.method == 'DELETE':
+        reset_query_stats()
+        return Response({'message': 'Query statistics reset'}, status=status.HTTP_200_OK)
+
+    try:
+        limit = int(request.query_params.get('limit', 20))
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        return Response({'error': 'limit must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+    limit = min(limit, 200)
+    sort = request.query_params.get('sort', 'total')
+    if sort not in QueryProfiler.SORT_KEYS:
+        return Response(
+            {'error': f"sort must be one of: {', '.join(QueryProfiler.SORT_KEYS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response({
+        'enabled': getattr(settings, 'QUERY_PROFILING_ENABLED', True),
+        'threshold_ms': getattr(settings, 'SLOW_QUERY_THRESHOLD_MS', 200),
+        'sort': sort,
+        'fingerprints': get_top_fingerprints(limit=limit, sort=sort),
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, CanManageUsers])
+@read_from_replica
 def user_activity_stats(request):
     """Get user activity statistics (Admin only)"""
     from .system_monitoring import get_user_activity_stats, get_user_role_distribution
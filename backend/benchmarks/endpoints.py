@@ -0,0 +1,114 @@
+"""
+Benchmarks for the hot API endpoints, driven through the Django test client.
+"""
+from django.contrib.auth.hashers import make_password
+from django.db.models import Count
+from django.test import Client
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from .harness import is_selected, measure
+
+
+# name, actor, method, path, payload, iteration cap (None = use --iterations)
+SCENARIOS = [
+    ('tasks.list', 'manager', 'get', '/api/tasks/', None, None),
+    ('tasks.list.member', 'member', 'get', '/api/tasks/', None, None),
+    ('tasks.my_tasks', 'member', 'get', '/api/tasks/my_tasks/', None, None),
+    ('tasks.statistics', 'manager', 'get', '/api/tasks/statistics/', None, None),
+    ('notifications.list', 'member', 'get', '/api/notifications/', None, None),
+    ('projects.list', 'manager', 'get', '/api/projects/', None, None),
+    ('activity.list', 'admin', 'get', '/api/activity/', None, None),
+    ('admin.logs', 'admin', 'get', '/api/admin/logs/', None, None),
+    ('auth.login', None, 'post', '/api/auth/login/', 'login', 5),
+    ('admin.system_status', 'admin', 'get', '/api/admin/system-status/', None, 3),
+]
+
+DEMO_LOGIN = {'email': 'member@ttms.com', 'password': 'member123'}
+BENCHMARK_ADMIN_EMAIL = 'benchmark-admin@synthetic.ttms.local'
+
+
+class MissingActor(LookupError):
+    """A selected scenario has no user to run as"""
+
+
+def busiest(role, relation):
+    """Return the active user of `role` with the most rows in `relation`"""
+    return (
+        User.objects.filter(role=role, is_active=True)
+        .annotate(load=Count(relation))
+        .order_by('-load', 'email')
+        .first()
+    )
+
+
+def benchmark_admin():
+    """An active ADMIN, seeded when the dataset has none (small --users runs often draw zero)"""
+    admin = User.objects.filter(role=User.Role.ADMIN, is_active=True).order_by('email').first()
+    if admin is None:
+        admin, _ = User.objects.get_or_create(
+            email=BENCHMARK_ADMIN_EMAIL,
+            defaults={
+                'username': 'benchmark_admin', 'password': make_password(None), 'role': User.Role.ADMIN,
+                'is_active': True,
+            },
+        )
+    return admin
+
+
+def resolve_actors():
+    admin = benchmark_admin()
+    manager = busiest(User.Role.MANAGER, 'created_tasks')
+    member = busiest(User.Role.MEMBER, 'assigned_tasks')
+    return {'admin': admin, 'manager': manager, 'member': member}
+
+
+class EndpointBenchmark:
+    """Run the SCENARIOS against the current database and collect summaries"""
+
+    def __init__(self, iterations=20, warmup=2, only=None, login=None):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.only = only
+        self.login = login or DEMO_LOGIN
+        self.client = Client()
+        self.headers = {}
+
+    def prepare(self):
+        for name, user in resolve_actors().items():
+            if user is None:
+                continue
+            token = RefreshToken.for_user(user).access_token
+            self.headers[name] = {'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+    def selected(self):
+        for scenario in SCENARIOS:
+            if is_selected(scenario[0], self.only):
+                yield scenario
+
+    def request(self, actor, method, path, payload):
+        headers = self.headers.get(actor, {}) if actor else {}
+        call = getattr(self.client, method)
+        if payload == 'login':
+            return call(path, self.login, content_type='application/json', **headers)
+        return call(path, **headers)
+
+    def run(self):
+        if not self.headers:
+            self.prepare()
+        missing = sorted({
+            f'{name} (no active {actor})' for name, actor, *_ in self.selected() if actor and actor not in self.headers
+        })
+        if missing:
+            raise MissingActor(f"No user to run as for: {', '.join(missing)}")
+        results = {}
+        for name, actor, method, path, payload, cap in self.selected():
+            iterations = min(self.iterations, cap) if cap else self.iterations
+            summary, response = measure(
+                lambda: self.request(actor, method, path, payload),
+                iterations=iterations,
+                warmup=min(self.warmup, iterations),
+            )
+            summary['status'] = response.status_code
+            results[name] = summary
+        return results
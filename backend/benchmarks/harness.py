@@ -0,0 +1,156 @@
+"""
+Timing, baseline and regression helpers shared by the benchmark suites.
+
+A baseline is a JSON document of the form::
+
+    {
+        "dataset": {...},
+        "results": {"<name>": {"p50_ms": ..., "p95_ms": ..., "queries": ...}}
+    }
+"""
+import json
+import math
+import statistics
+import time
+from pathlib import Path
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def summarize(samples_ms):
+    """Reduce raw latency samples to the figures we keep in a baseline"""
+    return {
+        'iterations': len(samples_ms),
+        'p50_ms': round(percentile(samples_ms, 50), 3),
+        'p95_ms': round(percentile(samples_ms, 95), 3),
+        'mean_ms': round(statistics.fmean(samples_ms), 3) if samples_ms else 0.0,
+        'min_ms': round(min(samples_ms), 3) if samples_ms else 0.0,
+        'max_ms': round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+def measure(fn, iterations, warmup=1, using='default', count_queries=True):
+    """
+    Call `fn` repeatedly and return (summary, last_result).
+
+    Queries are counted per call and the maximum goes in the summary's
+    ``queries``, so a single
+    N+1 regression on any iteration shows up in the budget.
+    """
+    result = None
+    for _ in range(warmup):
+        result = fn()
+
+    samples = []
+    max_queries = 0
+    for _ in range(iterations):
+        if count_queries:
+            with CaptureQueriesContext(connections[using]) as captured:
+                start = time.perf_counter()
+                result = fn()
+                samples.append((time.perf_counter() - start) * 1000)
+            max_queries = max(max_queries, len(captured))
+        else:
+            start = time.perf_counter()
+            result = fn()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    summary = summarize(samples)
+    if count_queries:
+        summary['queries'] = max_queries
+    return summary, result
+
+
+def load_baseline(path):
+    path = Path(path)
+    if not path.exists():
+        return None
+    with path.open() as fh:
+        return json.load(fh)
+
+
+def failures(results):
+    """Messages for cases that errored or answered outside 2xx; such a run is no baseline"""
+    messages = []
+    for name, result in results.items():
+        if result.get('error'):
+            messages.append(f"{name}: {result['error']}")
+        elif not 200 <= result.get('status', 200) < 300:
+            messages.append(f"{name}: returned HTTP {result['status']}")
+    return messages
+
+
+def write_baseline(path, results, dataset):
+    """Record `results` as the baseline; refuses a run with failed cases"""
+    failed = failures(results)
+    if failed:
+        raise ValueError('Not writing a baseline from a failed run:\n  ' + '\n  '.join(failed))
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w') as fh:
+        json.dump({'dataset': dataset, 'results': results}, fh, indent=2, sort_keys=True)
+        fh.write('\n')
+
+
+def is_selected(name, only=None):
+    """True when `name` starts with one of the `only` prefixes (or there are none)"""
+    return not only or any(name.startswith(prefix) for prefix in only)
+
+
+def compare(results, baseline, tolerance=0.25, slack_ms=2.0, only=None):
+    """
+    Compare a run against a baseline and return a list of regression messages.
+
+    Query counts are a hard budget: any increase is a regression. Latency
+    regresses when p95 exceeds the baseline by more than `tolerance` (a
+    fraction) plus `slack_ms`, which absorbs noise on very fast endpoints.
+    A baseline benchmark selected by `only` but missing from the run is a
+    regression too, so a gate cannot pass by measuring nothing.
+    """
+    regressions = []
+    recorded = (baseline or {}).get('results', {})
+    for name in sorted(recorded):
+        if name not in results and is_selected(name, only):
+            regressions.append(f'{name}: missing from this run')
+    for name, current in sorted(results.items()):
+        previous = recorded.get(name)
+        if previous is None:
+            continue
+        if 'queries' in previous and current.get('queries', 0) > previous['queries']:
+            regressions.append(
+                f"{name}: {current['queries']} queries exceeds budget of {previous['queries']}"
+            )
+        allowed = previous['p95_ms'] * (1 + tolerance) + slack_ms
+        if current['p95_ms'] > allowed:
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.1f}ms exceeds {allowed:.1f}ms "
+                f"(baseline {previous['p95_ms']:.1f}ms +{tolerance:.0%})"
+            )
+    return regressions
+
+
+def format_table(results, baseline=None):
+    recorded = (baseline or {}).get('results', {})
+    lines = [
+        f"{'benchmark':<34}{'p50 ms':>10}{'p95 ms':>10}{'base p95':>10}{'queries':>9}{'budget':>8}{'rows/s':>10}"
+    ]
+    for name, current in sorted(results.items()):
+        previous = recorded.get(name, {})
+        base_p95 = f"{previous['p95_ms']:.1f}" if 'p95_ms' in previous else '-'
+        queries = current.get('queries', '-')
+        budget = previous.get('queries', '-')
+        rate = current.get('rows_per_sec', '-')
+        lines.append(
+            f"{name:<34}{current['p50_ms']:>10.1f}{current['p95_ms']:>10.1f}{base_p95:>10}{queries!s:>9}{budget!s:>8}"
+            f"{rate!s:>10}"
+        )
+    return '\n'.join(lines)
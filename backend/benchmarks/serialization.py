@@ -0,0 +1,86 @@
+"""
+Serializer throughput: DRF ModelSerializer vs the values_list() fast path.
+
+Each case serializes the same `rows` rows (query included) with DRF, with
+DRF after emptying the fragment caches, and with the fast path, and reports
+rows per second next to the usual latency figures. The render.* cases
+then encode one realistic TaskSerializer page of `rows` tasks with each
+response renderer (no database work).
+"""
+from importlib.util import find_spec
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from config.fast_serializer import FastSerializer
+from config.fragment_cache import task_fragments, user_fragments
+from config.renderers import MessagePackRenderer, ORJSONRenderer
+from tasks.models import Task, Notification, ActivityLog
+from tasks.serializers import TaskSerializer, NotificationSerializer, ActivityLogSerializer
+from .harness import is_selected, measure
+
+# name, serializer, queryset as the list endpoint builds it
+CASES = [
+    ('serialize.tasks', TaskSerializer, lambda: Task.objects.select_related('assignee', 'created_by')),
+    ('serialize.notifications', NotificationSerializer, lambda: Notification.objects.select_related('task')),
+    ('serialize.activity', ActivityLogSerializer, lambda: ActivityLog.objects.select_related('user')),
+]
+
+RENDERERS = [
+    ('render.tasks.json', JSONRenderer),
+    ('render.tasks.orjson', ORJSONRenderer),
+    *([('render.tasks.msgpack', MessagePackRenderer)] if find_spec('msgpack') else []),
+]
+
+
+class SerializationBenchmark:
+    """Compare rows/second of both serialization paths on the current database"""
+
+    def __init__(self, iterations=20, warmup=2, only=None, rows=500):
+        self.iterations = iterations
+        self.warmup = warmup
+        self.only = only
+        self.rows = rows
+        self.context = {'request': APIRequestFactory().get('/api/')}
+
+    def selected(self, cases):
+        for case in cases:
+            if is_selected(case[0], self.only):
+                yield case
+
+    def run(self):
+        results = {}
+        for name, serializer_class, queryset in self.selected(CASES):
+            fast = FastSerializer(serializer_class)
+
+            def drf():
+                return serializer_class(queryset()[:self.rows], many=True, context=self.context).data
+
+            def drf_cold():
+                task_fragments.clear()
+                user_fragments.clear()
+                return drf()
+
+            def values():
+                return fast.serialize(fast.rows(queryset()[:self.rows]), self.context)
+
+            for label, fn in (('drf', drf), ('drf_cold', drf_cold), ('fast', values)):
+                summary, data = measure(fn, iterations=self.iterations, warmup=self.warmup)
+                summary['rows'] = len(data)
+                summary['rows_per_sec'] = round(len(data) / (summary['p50_ms'] / 1000)) if summary['p50_ms'] else 0
+                results[f'{name}.{label}'] = summary
+
+        renderers = list(self.selected(RENDERERS))
+        if renderers:
+            queryset = Task.objects.select_related('assignee', 'created_by')[:self.rows]
+            page = TaskSerializer(queryset, many=True, context=self.context).data
+            for name, renderer_class in renderers:
+                renderer = renderer_class()
+                summary, _ = measure(
+                    lambda: renderer.render(page), iterations=self.iterations, warmup=self.warmup,
+                    count_queries=False,
+                )
+                summary['rows'] = len(page)
+                summary['rows_per_sec'] = round(len(page) / (summary['p50_ms'] / 1000)) if summary['p50_ms'] else 0
+                results[name] = summary
+        return results
@@ -0,0 +1,56 @@
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from .harness import compare, failures, percentile, summarize, write_baseline
+
+
+class HarnessTest(SimpleTestCase):
+    """Test cases for benchmark statistics and regression checks"""
+
+    def test_percentiles(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 95), 95)
+        summary = summarize(samples)
+        self.assertEqual(summary['iterations'], 100)
+        self.assertEqual(summary['p95_ms'], 95)
+
+    def test_query_budget_is_strict(self):
+        baseline = {'results': {'tasks.list': {'p95_ms': 10.0, 'queries': 3}}}
+        regressions = compare({'tasks.list': {'p95_ms': 10.0, 'queries': 4}}, baseline)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn('queries', regressions[0])
+
+    def test_latency_tolerance(self):
+        baseline = {'results': {'tasks.list': {'p95_ms': 100.0, 'queries': 3}}}
+        self.assertEqual(compare({'tasks.list': {'p95_ms': 120.0, 'queries': 3}}, baseline, tolerance=0.25), [])
+        regressions = compare({'tasks.list': {'p95_ms': 140.0, 'queries': 3}}, baseline, tolerance=0.25)
+        self.assertEqual(len(regressions), 1)
+
+    def test_new_benchmarks_are_not_regressions(self):
+        self.assertEqual(compare({'new': {'p95_ms': 1.0, 'queries': 1}}, {'results': {}}), [])
+
+    def test_missing_benchmarks_are_regressions(self):
+        baseline = {'results': {'tasks.list': {'p95_ms': 1.0, 'queries': 1}, 'admin.logs': {'p95_ms': 1.0}}}
+        regressions = compare({'tasks.list': {'p95_ms': 1.0, 'queries': 1}}, baseline)
+        self.assertEqual(regressions, ['admin.logs: missing from this run'])
+        # Not selected with --only, so not expected
+        self.assertEqual(compare({'tasks.list': {'p95_ms': 1.0, 'queries': 1}}, baseline, only=['tasks']), [])
+
+    def test_failed_run_is_not_a_baseline(self):
+        results = {
+            'tasks.list': {'p95_ms': 1.0, 'status': 200},
+            'tasks.board': {'p95_ms': 1.0, 'status': 500},
+            'tasks.move': {'p95_ms': 1.0, 'status': 302},
+            'serialize.tasks': {'p95_ms': 1.0},
+        }
+        self.assertEqual(failures(results), ['tasks.board: returned HTTP 500', 'tasks.move: returned HTTP 302'])
+        with tempfile.TemporaryDirectory() as root:
+            path = Path(root, 'baseline.json')
+            with self.assertRaises(ValueError):
+                write_baseline(path, results, {})
+            self.assertFalse(path.exists())
+            write_baseline(path, {'tasks.list': results['tasks.list']}, {})
+            self.assertTrue(path.exists())
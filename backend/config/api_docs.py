@@ -0,0 +1,17 @@
+"""
+API documentation views, imported on first request (see config.urls).
+
+Importing this module registers the schema extensions the docs need, so
+nothing schema-related is loaded on the startup path.
+"""
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from drf_spectacular.views import (  # noqa: F401
+    SpectacularAPIView,
+    SpectacularRedocView,
+    SpectacularSwaggerView,
+)
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Document CachedJWTAuthentication as the bearer scheme it extends"""
+    target_class = 'users.authentication.CachedJWTAuthentication'
@@ -5,12 +5,19 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
+
+Run with any ASGI server, e.g. ``uvicorn config.asgi:application``. The
+async read endpoints live under ``/api/async/``; every sync endpoint keeps
+working side by side (Django runs sync views in a thread pool). Static
+files are answered on the event loop before Django (see config.static).
 """
 
 import os
 
 from django.core.asgi import get_asgi_application
 
+from config.static import ASGIStaticFiles
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+application = ASGIStaticFiles(get_asgi_application())
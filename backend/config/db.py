@@ -0,0 +1,100 @@
+"""
+Database configuration helpers.
+
+`database_config` builds a DATABASES entry from a URL in one of two modes:
+
+- persistent (default): one connection per worker thread kept for
+  CONN_MAX_AGE seconds and health-checked before reuse;
+- pooled (PostgreSQL only): Django 5.1's psycopg 3 connection pool with a
+  bounded size, a checkout timeout and a liveness check on every borrow.
+  Connections go back to the pool at the end of each request, so the number
+  of server connections is capped at `max_size` per process no matter how
+  many threads the worker runs.
+
+`check_replica_cache` guards the read replica: read-your-writes pins (see
+config.db_router) live in the default cache, so it must be shared by every
+worker process.
+"""
+import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
+
+# Cache backends whose entries one worker process cannot see from another
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def database_config(
+    url,
+    conn_max_age=600,
+    health_checks=True,
+    pool=False,
+    pool_min_size=2,
+    pool_max_size=10,
+    pool_timeout=10.0,
+    pool_max_idle=300.0,
+    pool_max_lifetime=1800.0,
+):
+    config = dj_database_url.parse(url, conn_max_age=conn_max_age, conn_health_checks=health_checks)
+    if not pool:
+        return config
+
+    if config['ENGINE'] != 'django.db.backends.postgresql':
+        raise ImproperlyConfigured('DB_POOL_ENABLED requires a PostgreSQL database')
+    if pool_min_size > pool_max_size:
+        raise ImproperlyConfigured('DB_POOL_MIN_SIZE cannot exceed DB_POOL_MAX_SIZE')
+    # Django refuses persistent connections together with a pool. With
+    # CONN_HEALTH_CHECKS it passes ConnectionPool.check_connection to the
+    # pool, which then verifies (and replaces if dead) every connection on
+    # checkout
+    config['CONN_MAX_AGE'] = 0
+    config['CONN_HEALTH_CHECKS'] = health_checks
+    config.setdefault('OPTIONS', {})['pool'] = {
+        'min_size': pool_min_size,
+        'max_size': pool_max_size,
+        'timeout': pool_timeout,
+        'max_idle': pool_max_idle,
+        'max_lifetime': pool_max_lifetime,
+    }
+    return config
+
+
+def check_replica_cache(cache_backend):
+    """Refuse a replica when a user's primary pin would not reach their next request's worker"""
+    if cache_backend in PROCESS_LOCAL_CACHES:
+        raise ImproperlyConfigured(
+            'DATABASE_REPLICA_URL needs a CACHE_BACKEND shared by all workers (e.g. Redis or Memcached); '
+            f'{cache_backend} would lose read-your-writes pins between processes'
+        )
+
+
+def pool_stats(conn):
+    """Pool metrics for one connection wrapper, or its persistent-connection settings"""
+    pool_options = conn.settings_dict.get('OPTIONS', {}).get('pool')
+    if not pool_options or conn.vendor != 'postgresql':
+        return {
+            'pooled': False,
+            'vendor': conn.vendor,
+            'conn_max_age': conn.settings_dict.get('CONN_MAX_AGE'),
+            'health_checks': conn.settings_dict.get('CONN_HEALTH_CHECKS', False),
+        }
+    pool = conn.pool
+    stats = {
+        'pooled': True,
+        'vendor': conn.vendor,
+        'min_size': pool.min_size,
+        'max_size': pool.max_size,
+        'timeout': pool.timeout,
+        'open': not pool.closed,
+    }
+    # pool_size, pool_available, requests_waiting, requests_num, usage_ms, ...
+    stats.update(pool.get_stats())
+    return stats
+
+
+def get_pool_stats():
+    """Connection pool metrics of this process, per database alias"""
+    from django.db import connections
+
+    return {alias: pool_stats(connections[alias]) for alias in connections}
@@ -0,0 +1,116 @@
+"""
+Read-replica routing with read-your-writes stickiness.
+
+Reads go to the primary unless a request opted in: read-only endpoints use
+`ReplicaReadMixin` (viewsets), `read_from_replica` (function views) or
+`replica_reads()` (anything else), which route queries to the replica for
+the duration of a safe (GET/HEAD/OPTIONS) request. Writes always go to the
+primary, and `PrimaryStickinessMiddleware` pins a user to the primary for
+REPLICA_STICKY_SECONDS after any successful write, so they never read a
+replica that has not caught up with their own changes.
+
+The replica is the `replica` alias in DATABASES (configured from
+DATABASE_REPLICA_URL). Without one every read stays on the primary.
+"""
+import contextvars
+import functools
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_ALIAS = 'replica'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+# True while the current request/task may read from the replica
+_prefer_replica = contextvars.ContextVar('prefer_replica', default=False)
+
+
+def replica_alias():
+    """Alias reads are sent to when routed to the replica, or None if not configured"""
+    return REPLICA_ALIAS if REPLICA_ALIAS in settings.DATABASES else None
+
+
+def prefers_replica():
+    return _prefer_replica.get()
+
+
+def _pin_key(user_id):
+    return f'db_pin_primary:{user_id}'
+
+
+def pin_to_primary(user):
+    """Send this user's reads to the primary for the next REPLICA_STICKY_SECONDS"""
+    if user is not None and getattr(user, 'is_authenticated', False):
+        cache.set(_pin_key(user.pk), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned(user):
+    if user is None or not getattr(user, 'is_authenticated', False):
+        return False
+    return cache.get(_pin_key(user.pk), False)
+
+
+def replica_allowed(method, user):
+    return replica_alias() is not None and method in SAFE_METHODS and not is_pinned(user)
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route reads in this block to the replica (when `enabled`)"""
+    token = _prefer_replica.set(bool(enabled))
+    try:
+        yield
+    finally:
+        _prefer_replica.reset(token)
+
+
+class ReplicaRouter:
+    """Send opted-in reads to the replica and everything else to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if not _prefer_replica.get():
+            return DEFAULT_DB_ALIAS
+        alias = replica_alias()
+        # Inside a transaction on the primary, reads must see its uncommitted rows
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """Serve a viewset's safe requests from the replica unless the user is pinned"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        # Authentication has run, so the pin for this user can be checked
+        if replica_allowed(request.method, request.user):
+            self._replica_token = _prefer_replica.set(True)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_replica_token', None)
+        if token is not None:
+            _prefer_replica.reset(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+def read_from_replica(view_func):
+    """Function-view counterpart of ReplicaReadMixin; apply below @api_view"""
+    @functools.wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads(replica_allowed(request.method, request.user)):
+            return view_func(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,265 @@
+"""
+Serialize read-only list endpoints from ``values_list()`` rows.
+
+A DRF ModelSerializer builds a model instance per row (plus one per nested
+serializer) and walks its field objects for each of them. `FastSerializer`
+compiles a serializer class once into the list of columns it reads and a
+plan of per-field accessors over the resulting tuples, so a page is one
+``values_list()`` query and a loop that builds plain dicts. The output is
+the same JSON as the serializer it was compiled from:
+
+- plain fields use the DRF field's own ``to_representation``;
+- ``get_<field>_display`` sources look the label up in the model choices;
+- PrimaryKeyRelatedField returns the raw foreign key value;
+- nested ModelSerializers (``many=False``) read prefixed columns and are
+  ``None`` when their foreign key is;
+- dotted sources through a null relation are skipped, as DRF does;
+- file fields go through the field's storage and the request's host.
+
+Serializers using anything else (method fields, many-to-many, properties,
+``source='*'``) are not compiled and keep the regular DRF path.
+Instances are never built, so the fragment cache does not apply here.
+"""
+import functools
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.utils.encoding import force_str
+from rest_framework import serializers
+from rest_framework import ISO_8601
+from rest_framework.fields import empty
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+# Plan entry kinds
+VALUE, DISPLAY, FILE, NESTED, DATETIME = range(5)
+_SKIP = object()
+
+
+class UnsupportedSerializer(Exception):
+    """The serializer uses a field the fast path cannot reproduce"""
+
+
+class _Columns:
+    """Ordered, de-duplicated values_list() paths"""
+
+    def __init__(self):
+        self.paths = []
+        self.index = {}
+
+    def add(self, path):
+        if path not in self.index:
+            self.index[path] = len(self.paths)
+            self.paths.append(path)
+        return self.index[path]
+
+
+def _resolve(model, attrs):
+    """
+    Walk `attrs` from `model` and return (path, model field, display).
+
+    Every attribute but the last must be a forward foreign key; the last is a
+    concrete field or ``get_<field>_display``.
+    """
+    path = []
+    field = None
+    display = False
+    for position, attr in enumerate(attrs):
+        last = position == len(attrs) - 1
+        if last and attr.startswith('get_') and attr.endswith('_display'):
+            attr, display = attr[4:-8], True
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise UnsupportedSerializer(f'{model.__name__}.{attr} is not a model field')
+        if not field.concrete or field.many_to_many or field.one_to_many:
+            raise UnsupportedSerializer(f'{model.__name__}.{attr} is not a concrete column')
+        if display and not field.choices:
+            raise UnsupportedSerializer(f'{model.__name__}.{attr} has no choices')
+        path.append(field.name)
+        if not last:
+            if not field.is_relation:
+                raise UnsupportedSerializer(f'{model.__name__}.{attr} is not a relation')
+            model = field.related_model
+    return path, field, display
+
+
+def _missing(field):
+    """What DRF emits when a dotted source crosses a null relation"""
+    if field.default is not empty:
+        raise UnsupportedSerializer(f'{field.field_name} has a default')
+    if field.allow_null:
+        return None
+    if not field.required:
+        return _SKIP
+    raise UnsupportedSerializer(f'{field.field_name} would raise on a null relation')
+
+
+def _compile(serializer, columns, prefix=()):
+    model = serializer.Meta.model
+    plan = []
+    for field in serializer._readable_fields:
+        if field.source == '*':
+            raise UnsupportedSerializer(f'{field.field_name} uses source="*"')
+        path, model_field, display = _resolve(model, field.source_attrs)
+        full = list(prefix) + path
+        # Foreign key columns of every relation crossed on the way
+        guards = tuple(columns.add('__'.join(full[:depth])) for depth in range(len(prefix) + 1, len(full)))
+        missing = _missing(field) if guards else _SKIP
+
+        if isinstance(field, serializers.ListSerializer):
+            raise UnsupportedSerializer(f'{field.field_name} is a many=True serializer')
+        if isinstance(field, serializers.ModelSerializer):
+            if not model_field.is_relation:
+                raise UnsupportedSerializer(f'{field.field_name} is not backed by a relation')
+            index = columns.add('__'.join(full))
+            plan.append((NESTED, field.field_name, index, _compile(field, columns, full), guards, missing))
+            continue
+        if isinstance(field, serializers.BaseSerializer) or type(field) is serializers.Field:
+            raise UnsupportedSerializer(f'{field.field_name} ({type(field).__name__}) is not supported')
+        if isinstance(field, serializers.SerializerMethodField):
+            raise UnsupportedSerializer(f'{field.field_name} is a method field')
+
+        index = columns.add('__'.join(full))
+        if display:
+            plan.append((DISPLAY, field.field_name, index, model_field, guards, missing))
+        elif isinstance(field, serializers.FileField):
+            if not getattr(field, 'use_url', True):
+                plan.append((VALUE, field.field_name, index, None, guards, missing))
+            else:
+                plan.append((FILE, field.field_name, index, model_field.storage, guards, missing))
+        elif isinstance(field, serializers.DateTimeField):
+            plan.append((DATETIME, field.field_name, index, field, guards, missing))
+        elif isinstance(field, PrimaryKeyRelatedField):
+            convert = field.pk_field.to_representation if field.pk_field is not None else None
+            plan.append((VALUE, field.field_name, index, convert, guards, missing))
+        elif isinstance(field, serializers.RelatedField) or model_field.is_relation:
+            raise UnsupportedSerializer(f'{field.field_name} ({type(field).__name__}) is not supported')
+        else:
+            plan.append((VALUE, field.field_name, index, field.to_representation, guards, missing))
+    return plan
+
+
+def _datetime_converter(field):
+    """DateTimeField.to_representation with the timezone and format resolved once"""
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    tz = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if tz is None or output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    def convert(value):
+        if isinstance(value, str) or value.utcoffset() is None:
+            return field.to_representation(value)
+        value = value.astimezone(tz).isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _bind(plan, context):
+    """Resolve the request- and language-dependent parts of a plan"""
+    request = context.get('request')
+    absolute = request.build_absolute_uri if request is not None else None
+    bound = []
+    for kind, name, index, arg, guards, missing in plan:
+        if kind == DISPLAY:
+            arg = {value: force_str(label, strings_only=True) for value, label in arg.flatchoices}
+        elif kind == DATETIME:
+            kind, arg = VALUE, _datetime_converter(arg)
+        elif kind == FILE:
+            arg = (arg, absolute)
+        elif kind == NESTED:
+            arg = _bind(arg, context)
+        bound.append((kind, name, index, arg, guards, missing))
+    return bound
+
+
+def _render(plan, row):
+    ret = {}
+    for kind, name, index, arg, guards, missing in plan:
+        if guards and any(row[guard] is None for guard in guards):
+            if missing is not _SKIP:
+                ret[name] = missing
+            continue
+        value = row[index]
+        if kind == FILE:
+            if not value:
+                ret[name] = None
+            else:
+                storage, absolute = arg
+                url = storage.url(value)
+                ret[name] = absolute(url) if absolute is not None else url
+        elif value is None:
+            ret[name] = None
+        elif kind == VALUE:
+            ret[name] = arg(value) if arg is not None else value
+        elif kind == DISPLAY:
+            ret[name] = arg.get(value, value)
+        else:
+            ret[name] = _render(arg, row)
+    return ret
+
+
+class FastSerializer:
+    """A ModelSerializer compiled to a values_list() column list and row plan"""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        columns = _Columns()
+        self.plan = _compile(serializer_class(), columns)
+        self.columns = tuple(columns.paths)
+
+    def rows(self, queryset):
+        """The queryset narrowed to the compiled columns, as tuples"""
+        return queryset.values_list(*self.columns)
+
+    def serialize(self, rows, context=None):
+        plan = _bind(self.plan, context or {})
+        return [_render(plan, row) for row in rows]
+
+
+@functools.lru_cache(maxsize=None)
+def _compiled(serializer_class):
+    try:
+        return FastSerializer(serializer_class)
+    except UnsupportedSerializer:
+        return None
+
+
+def fast_serializer_for(serializer_class):
+    """Compiled FastSerializer for `serializer_class`, or None to use DRF"""
+    if not getattr(settings, 'FAST_SERIALIZERS_ENABLED', True):
+        return None
+    return _compiled(serializer_class)
+
+
+class FastListMixin:
+    """Serve a viewset's list-style actions through FastSerializer"""
+
+    fast_list_actions = ('list',)
+
+    def get_fast_serializer(self):
+        if self.action not in self.fast_list_actions:
+            return None
+        return fast_serializer_for(self.get_serializer_class())
+
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    def list_response(self, queryset):
+        """Paginated list of `queryset`, serialized from rows when possible"""
+        fast = self.get_fast_serializer()
+        if fast is None:
+            page = self.paginate_queryset(queryset)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+            return Response(self.get_serializer(queryset, many=True).data)
+
+        rows = fast.rows(queryset)
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(fast.serialize(page, context))
+        return Response(fast.serialize(rows, context))
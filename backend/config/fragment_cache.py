@@ -0,0 +1,96 @@
+"""
+Per-object cache of serialized fragments.
+
+`FragmentCacheMixin` makes a ModelSerializer remember each instance's
+serialized fields, keyed by ``(pk, updated_at)``: any save bumps
+``updated_at`` (``auto_now``), so an edited row simply misses and the old
+entry ages out of the LRU. Nested serializers are not part of the cached
+fragment; they are resolved on every call (and cache their own fragments),
+so a user edit shows up in every task that embeds that user.
+
+Representations that depend on the request (absolute image URLs) or the
+active language (``get_*_display``) include both in the key.
+"""
+from functools import cached_property
+
+from django.conf import settings
+from django.utils import translation
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+from rest_framework.serializers import BaseSerializer
+
+from .cache_utils import LRUCache
+
+task_fragments = LRUCache(
+    maxsize=getattr(settings, 'TASK_FRAGMENT_CACHE_SIZE', 10_000),
+    name='task_fragments',
+)
+user_fragments = LRUCache(
+    maxsize=getattr(settings, 'USER_FRAGMENT_CACHE_SIZE', 5_000),
+    name='user_fragments',
+)
+
+
+class FragmentCacheMixin:
+    """Serve ModelSerializer.to_representation from `fragment_cache` when possible"""
+
+    fragment_cache = None
+    # Timestamp that changes whenever the instance does
+    fragment_version_field = 'updated_at'
+
+    @cached_property
+    def _fragment_scope(self):
+        request = self.context.get('request')
+        origin = request.build_absolute_uri('/') if request is not None else ''
+        return (type(self).__qualname__, origin, translation.get_language())
+
+    @cached_property
+    def _fragment_fields(self):
+        """Readable fields split into (own fields cached as a unit, nested serializers)"""
+        own, nested = [], []
+        for field in self._readable_fields:
+            (nested if isinstance(field, BaseSerializer) else own).append(field)
+        return own, nested
+
+    def fragment_key(self, instance):
+        pk = getattr(instance, 'pk', None)
+        version = getattr(instance, self.fragment_version_field, None)
+        if self.fragment_cache is None or pk is None or version is None:
+            return None
+        return self._fragment_scope + (pk, version)
+
+    def _represent(self, instance, fields):
+        # Same per-field logic as Serializer.to_representation
+        ret = {}
+        for field in fields:
+            try:
+                attribute = field.get_attribute(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(attribute, PKOnlyObject) else attribute
+            ret[field.field_name] = None if check_for_none is None else field.to_representation(attribute)
+        return ret
+
+    def to_representation(self, instance):
+        key = self.fragment_key(instance)
+        if key is None:
+            return super().to_representation(instance)
+
+        own, nested = self._fragment_fields
+        fragment = self.fragment_cache.get(key)
+        if fragment is None:
+            fragment = self._represent(instance, own)
+            self.fragment_cache.set(key, fragment)
+        if not nested:
+            return dict(fragment)
+
+        nested_data = self._represent(instance, nested)
+        # Rebuild in declared field order so output matches the uncached path
+        ret = {}
+        for field in self._readable_fields:
+            name = field.field_name
+            if name in fragment:
+                ret[name] = fragment[name]
+            elif name in nested_data:
+                ret[name] = nested_data[name]
+        return ret
@@ -1,4 +1,10 @@
 import logging
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 
 logger = logging.getLogger(__name__)
 
@@ -10,13 +16,103 @@ class DebugAuthMiddleware:
     for each request so you can confirm whether the frontend is sending the token.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        self.log(request)
+        return self.get_response(request)
+
+    async def __acall__(self, request):
+        self.log(request)
+        return await self.get_response(request)
+
+    @staticmethod
+    def log(request):
         auth = request.META.get('HTTP_AUTHORIZATION')
         if auth:
             logger.debug('Incoming Authorization header for %s: %s', request.path, auth[:200])
         else:
             logger.debug('No Authorization header for %s', request.path)
-        return self.get_response(request)
+
+
+class QueryProfilingMiddleware:
+    """Wrap every database query issued while handling a request with the query profiler.
+
+    Aggregated fingerprints are exposed through ``/api/admin/slow-queries/``.
+    Disable with ``QUERY_PROFILING_ENABLED=False``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'QUERY_PROFILING_ENABLED', True):
+            raise MiddlewareNotUsed()
+        from auth_app.query_profiler import profiler
+
+        self.get_response = get_response
+        self.profiler = profiler
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def _wrap_connections(self, stack):
+        # Connections are context-local, so under ASGI these are the same
+        # objects the async ORM's worker threads execute on
+        for conn in connections.all():
+            stack.enter_context(conn.execute_wrapper(self.profiler))
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with ExitStack() as stack:
+            self._wrap_connections(stack)
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with ExitStack() as stack:
+            self._wrap_connections(stack)
+            return await self.get_response(request)
+
+
+
+class PrimaryStickinessMiddleware:
+    """Pin a user's reads to the primary database after a successful write.
+
+    Runs after the view, when DRF has already authenticated the JWT user onto
+    the underlying request. See ``config.db_router``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.get_response(request)
+        self.process_response(request, response)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        self.process_response(request, response)
+        return response
+
+    @staticmethod
+    def process_response(request, response):
+        from .db_router import SAFE_METHODS, pin_to_primary
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(getattr(request, 'user', None))
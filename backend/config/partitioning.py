@@ -0,0 +1,287 @@
+"""
+Monthly partitions for the append-only log tables (PARTITIONED_MODELS).
+
+On PostgreSQL each table is a declarative ``PARTITION BY RANGE
+(created_at)`` table with one partition per calendar month (UTC), named
+``<table>_pYYYYMM``, and a ``<table>_pdefault`` catch-all so an insert never
+fails for lack of a partition. Range filters on ``created_at`` (the admin
+log's date_from/date_to, the 24h counts in the system status) are pruned by
+the planner to the months they touch, and dropping a month is a DROP TABLE
+of its partition instead of a DELETE. PostgreSQL requires the partition key
+in every unique constraint, so the primary key is ``(id, created_at)``;
+Django still treats ``id`` as the pk and nothing references these tables.
+
+The scheduler keeps PARTITION_PREMAKE_MONTHS months created ahead and the
+retention engine (config.retention) drops whole expired months. Creating a
+month whose rows already landed in the default partition moves them into
+the new partition first.
+
+SQLite has no partitioning, so there the tables stay plain (range filters
+use the created_at index) and dropping a month deletes its rows in chunks.
+"""
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+_MONTH_RE = re.compile(r'_p(\d{4})(\d{2})$')
+
+
+@dataclass
+class Partition:
+    name: str
+    # None for the default partition
+    start: datetime = None
+    end: datetime = None
+    rows: int = 0
+
+
+def month_start(moment):
+    """First instant (UTC) of the month containing `moment`"""
+    moment = moment.astimezone(dt_timezone.utc)
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return datetime(index // 12, index % 12 + 1, 1, tzinfo=dt_timezone.utc)
+
+
+def months_between(first, last):
+    """Month starts from `first`'s month through `last`'s, inclusive"""
+    month, last = month_start(first), month_start(last)
+    while month <= last:
+        yield month
+        month = add_months(month, 1)
+
+
+def partition_name(table, month):
+    return f'{table}_p{month:%Y%m}'
+
+
+def default_partition_name(table):
+    return f'{table}_pdefault'
+
+
+def partitioned_models():
+    return [apps.get_model(label) for label in settings.PARTITIONED_MODELS]
+
+
+def _connection(model):
+    return connections[router.db_for_write(model)]
+
+
+def _literal(moment):
+    return f"'{moment.isoformat()}'"
+
+
+def is_partitioned(model):
+    connection = _connection(model)
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)', [model._meta.db_table])
+        row = cursor.fetchone()
+    return bool(row) and row[0] == 'p'
+
+
+def partitions(model, column='created_at'):
+    """Partitions of `model`'s table oldest first (months with rows on SQLite)"""
+    if not is_partitioned(model):
+        months = (
+            model._default_manager.annotate(month=TruncMonth(column, tzinfo=dt_timezone.utc))
+            .values('month').annotate(rows=Count('pk')).order_by('month').values_list('month', 'rows')
+        )
+        table = model._meta.db_table
+        return [Partition(partition_name(table, month), month, add_months(month, 1), rows) for month, rows in months]
+
+    with _connection(model).cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, c.reltuples::bigint
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            """,
+            [model._meta.db_table],
+        )
+        found = []
+        for name, rows in cursor.fetchall():
+            match = _MONTH_RE.search(name)
+            if match:
+                start = datetime(int(match.group(1)), int(match.group(2)), 1, tzinfo=dt_timezone.utc)
+                found.append(Partition(name, start, add_months(start, 1), max(rows, 0)))
+            else:
+                found.append(Partition(name, rows=max(rows, 0)))
+    # The default partition sorts first
+    return sorted(found, key=lambda partition: (partition.start is not None, partition.start or 0))
+
+
+def create_partition(model, month, column='created_at'):
+    """Create `month`'s partition if it is missing; returns whether it was created"""
+    connection = _connection(model)
+    qn = connection.ops.quote_name
+    table = model._meta.db_table
+    name = partition_name(table, month)
+    default = default_partition_name(table)
+    start, end = month, add_months(month, 1)
+    bounds = f'FOR VALUES FROM ({_literal(start)}) TO ({_literal(end)})'
+    in_range = f'{qn(column)} >= {_literal(start)} AND {qn(column)} < {_literal(end)}'
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute('SELECT to_regclass(%s) IS NOT NULL, to_regclass(%s) IS NOT NULL', [name, default])
+        exists, has_default = cursor.fetchone()
+        if exists:
+            return False
+        stranded = False
+        if has_default:
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {qn(default)} WHERE {in_range})')
+            stranded = cursor.fetchone()[0]
+        if not stranded:
+            cursor.execute(f'CREATE TABLE {qn(name)} PARTITION OF {qn(table)} {bounds}')
+            return True
+        # Rows for this month went to the default partition: attaching over
+        # them would fail, so move them into the new table first
+        cursor.execute(
+            f'CREATE TABLE {qn(name)} (LIKE {qn(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        )
+        cursor.execute(f'INSERT INTO {qn(name)} SELECT * FROM {qn(default)} WHERE {in_range}')
+        cursor.execute(f'DELETE FROM {qn(default)} WHERE {in_range}')
+        cursor.execute(f'ALTER TABLE {qn(table)} ATTACH PARTITION {qn(name)} {bounds}')
+    return True
+
+
+def ensure_partitions(model, ahead=None, now=None, column='created_at'):
+    """Create the partitions for this month and `ahead` more; returns the new names"""
+    if not is_partitioned(model):
+        return []
+    ahead = settings.PARTITION_PREMAKE_MONTHS if ahead is None else ahead
+    current = month_start(now or timezone.now())
+    table = model._meta.db_table
+    return [
+        partition_name(table, month)
+        for month in months_between(current, add_months(current, ahead))
+        if create_partition(model, month, column)
+    ]
+
+
+def drop_partitions(model, cutoff, column='created_at'):
+    """Drop the monthly partitions that end on or before `cutoff`; returns their names"""
+    if not is_partitioned(model):
+        return []
+    connection = _connection(model)
+    qn = connection.ops.quote_name
+    dropped = []
+    with connection.cursor() as cursor:
+        for partition in partitions(model, column):
+            if partition.end is not None and partition.end <= cutoff:
+                cursor.execute(f'DROP TABLE {qn(partition.name)}')
+                dropped.append(partition.name)
+    return dropped
+
+
+def drop_partitions_before(model, cutoff, column='created_at', batch_size=1000):
+    """
+    Remove rows older than the month containing `cutoff`.
+
+    Returns (dropped partition names, rows deleted). Whole months are
+    dropped; the default partition (or the plain SQLite table) is cleared
+    with chunked deletes.
+    """
+    cutoff = month_start(cutoff)
+    dropped = drop_partitions(model, cutoff, column)
+    deleted = 0
+    old_rows = model._default_manager.filter(**{f'{column}__lt': cutoff})
+    while True:
+        ids = list(old_rows.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        deleted += model._default_manager.filter(pk__in=ids).delete()[0]
+    return dropped, deleted
+
+
+def maintain_partitions(now=None):
+    """Create this month and the next PARTITION_PREMAKE_MONTHS for every partitioned model"""
+    now = now or timezone.now()
+    return {model._meta.label: ensure_partitions(model, now=now) for model in partitioned_models()}
+
+
+def _add_keys_and_indexes(schema_editor, model, pk_columns):
+    """Primary key, foreign keys and indexes, as Django's create_model would add them"""
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    schema_editor.execute(
+        f'ALTER TABLE {qn(table)} ADD PRIMARY KEY ({", ".join(qn(column) for column in pk_columns)})'
+    )
+    for field in model._meta.local_fields:
+        if field.remote_field and field.db_constraint:
+            schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+        if field.db_index and not field.unique and not field.primary_key:
+            schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+    for index in model._meta.indexes:
+        schema_editor.add_index(model, index)
+
+
+def _reset_identity(schema_editor, model):
+    """Point the pk's identity sequence past the copied rows (a LIKE copy restarts it at 1)"""
+    qn = schema_editor.quote_name
+    table, pk = model._meta.db_table, model._meta.pk.column
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [qn(table), pk])
+        sequence = cursor.fetchone()[0]
+        if sequence is not None:
+            cursor.execute(
+                f'SELECT setval(%s, COALESCE(MAX({qn(pk)}), 0) + 1, false) FROM {qn(table)}', [sequence]
+            )
+
+
+def partition_table(schema_editor, model, column='created_at'):
+    """Migration helper: rebuild `model`'s table as monthly partitions (PostgreSQL only)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    old = f'{table}_unpartitioned'
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+    schema_editor.execute(
+        f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY) '
+        f'PARTITION BY RANGE ({qn(column)})'
+    )
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN({qn(column)}) FROM {qn(old)}')
+        oldest = cursor.fetchone()[0]
+    now = timezone.now()
+    last = add_months(month_start(now), settings.PARTITION_PREMAKE_MONTHS)
+    for month in months_between(oldest or now, last):
+        schema_editor.execute(
+            f'CREATE TABLE {qn(partition_name(table, month))} PARTITION OF {qn(table)} '
+            f'FOR VALUES FROM ({_literal(month)}) TO ({_literal(add_months(month, 1))})'
+        )
+    schema_editor.execute(f'CREATE TABLE {qn(default_partition_name(table))} PARTITION OF {qn(table)} DEFAULT')
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    _reset_identity(schema_editor, model)
+    # Frees the old constraint and index names for the new table
+    schema_editor.execute(f'DROP TABLE {qn(old)}')
+    _add_keys_and_indexes(schema_editor, model, [model._meta.pk.column, column])
+
+
+def unpartition_table(schema_editor, model, column='created_at'):
+    """Reverse of `partition_table`: back to one plain table"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    qn = schema_editor.quote_name
+    table = model._meta.db_table
+    old = f'{table}_partitioned'
+    schema_editor.execute(f'ALTER TABLE {qn(table)} RENAME TO {qn(old)}')
+    schema_editor.execute(
+        f'CREATE TABLE {qn(table)} (LIKE {qn(old)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING IDENTITY)'
+    )
+    schema_editor.execute(f'INSERT INTO {qn(table)} SELECT * FROM {qn(old)}')
+    _reset_identity(schema_editor, model)
+    schema_editor.execute(f'DROP TABLE {qn(old)}')
+    _add_keys_and_indexes(schema_editor, model, [model._meta.pk.column])
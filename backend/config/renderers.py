@@ -0,0 +1,99 @@
+"""
+Fast JSON and optional MessagePack renderers/parsers for DRF.
+
+`ORJSONRenderer` / `ORJSONParser` are drop-in replacements for DRF's
+JSONRenderer / JSONParser built on orjson. The renderer produces the same
+bytes as DRF's compact output: UUIDs are native, datetimes and everything
+else orjson does not know (Decimal, lazy strings, querysets, ...) go through
+DRF's own JSONEncoder, and U+2028/U+2029 are escaped. Indented output
+(``Accept: application/json; indent=4``), non-compact or ASCII-only
+settings, and values orjson refuses (integers over 64 bits) fall back to
+the stdlib renderer.
+
+`MessagePackRenderer` / `MessagePackParser` negotiate
+``application/msgpack`` for internal consumers. They need the optional
+``msgpack`` package and are only registered when it is installed (see
+MSGPACK_ENABLED).
+"""
+import orjson
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_encoder = JSONEncoder()
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+
+def encode_default(obj):
+    """Types orjson passes through, encoded as DRF's JSONEncoder does"""
+    return _encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer with orjson for the compact, non-ASCII-escaped case"""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=encode_default, option=ORJSON_OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same strict-javascript-subset escaping as DRF
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser with orjson"""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        try:
+            body = stream.read()
+            if encoding.lower().replace('-', '') != 'utf8':
+                body = body.decode(encoding)
+            return orjson.loads(body)
+        except (ValueError, orjson.JSONDecodeError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Render responses as MessagePack (`Accept: application/msgpack`)"""
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        import msgpack
+
+        if data is None:
+            return b''
+        # UUIDs, datetimes, Decimals, ... take their JSON representation
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parse MessagePack request bodies (`Content-Type: application/msgpack`)"""
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False, strict_map_key=False)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError('MessagePack parse error - %s' % str(exc))
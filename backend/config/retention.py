@@ -0,0 +1,126 @@
+"""
+Retention engine: deletes rows that outlived their policy in RETENTION_POLICIES.
+
+A policy names a model, the timestamp field rows age by (``created_at``
+unless set), how many days to keep (0 keeps them forever) and optional
+extra lookups, e.g. only read notifications or only finished jobs.
+
+Rows go in chunks: each batch selects up to RETENTION_BATCH_SIZE primary
+keys past the cutoff and deletes them by pk, so locks are held for one
+batch and no transaction grows with the backlog. After every batch the
+engine sleeps RETENTION_SLEEP_RATIO times as long as the batch took (at
+least RETENTION_PAUSE_SECONDS): when the database is busy batches slow
+down and so does the engine. A run stops after RETENTION_MAX_SECONDS and
+the next one picks up where it left off; the scheduler runs it off-peak
+(RETENTION_SCHEDULE).
+
+On PostgreSQL, months of a partitioned log table (config.partitioning)
+that lie entirely before the cutoff are dropped as whole partitions first;
+only the rest of the cutoff month goes through DELETE.
+"""
+import dataclasses
+import logging
+import time
+from datetime import datetime, timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.utils import timezone
+
+from .partitioning import drop_partitions, month_start
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class RetentionPolicy:
+    name: str
+    model: str
+    days: int
+    field: str = 'created_at'
+    filter: dict = dataclasses.field(default_factory=dict)
+
+    @property
+    def model_class(self):
+        return apps.get_model(self.model)
+
+    def cutoff(self, now):
+        return now - timedelta(days=self.days)
+
+    def expired(self, now):
+        lookups = {f'{self.field}__lt': self.cutoff(now), **self.filter}
+        return self.model_class._default_manager.filter(**lookups)
+
+    @property
+    def partitioned(self):
+        # Whole partitions can only go when the policy is just an age on the partition key
+        return self.model in settings.PARTITIONED_MODELS and self.field == 'created_at' and not self.filter
+
+
+@dataclasses.dataclass
+class RetentionResult:
+    policy: str
+    model: str
+    cutoff: datetime
+    deleted: int = 0
+    dropped_partitions: list = dataclasses.field(default_factory=list)
+    batches: int = 0
+    seconds: float = 0.0
+    # False when the time budget ran out before the policy was done
+    complete: bool = True
+
+
+def retention_policies(names=None):
+    policies = [RetentionPolicy(**spec) for spec in settings.RETENTION_POLICIES]
+    if names:
+        unknown = set(names) - {policy.name for policy in policies}
+        if unknown:
+            raise ValueError(f"Unknown retention policies: {', '.join(sorted(unknown))}")
+        policies = [policy for policy in policies if policy.name in names]
+    return [policy for policy in policies if policy.days > 0]
+
+
+def apply_retention(names=None, now=None, batch_size=None, max_seconds=None, pause=None,
+                    sleep_ratio=None, dry_run=False, sleep=time.sleep):
+    """Run every (or the named) retention policy; returns a RetentionResult per policy"""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    max_seconds = settings.RETENTION_MAX_SECONDS if max_seconds is None else max_seconds
+    pause = settings.RETENTION_PAUSE_SECONDS if pause is None else pause
+    sleep_ratio = settings.RETENTION_SLEEP_RATIO if sleep_ratio is None else sleep_ratio
+    deadline = time.monotonic() + max_seconds
+
+    results = []
+    for policy in retention_policies(names):
+        result = RetentionResult(policy.name, policy.model, policy.cutoff(now))
+        results.append(result)
+        started = time.monotonic()
+        expired = policy.expired(now)
+        if dry_run:
+            result.deleted = expired.count()
+            continue
+
+        if policy.partitioned:
+            result.dropped_partitions = drop_partitions(policy.model_class, month_start(result.cutoff))
+        manager = policy.model_class._default_manager
+        while True:
+            if time.monotonic() >= deadline:
+                result.complete = False
+                break
+            batch_started = time.monotonic()
+            ids = list(expired.values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                break
+            result.deleted += manager.filter(pk__in=ids).delete()[0]
+            result.batches += 1
+            if len(ids) < batch_size:
+                break
+            sleep(max(pause, (time.monotonic() - batch_started) * sleep_ratio))
+        result.seconds = round(time.monotonic() - started, 3)
+
+        log = logger.info if result.complete else logger.warning
+        log('Retention %s: deleted %s %s rows older than %s in %s batches (%.1fs)%s%s',
+            policy.name, result.deleted, policy.model, result.cutoff.date(), result.batches, result.seconds,
+            f"; dropped {', '.join(result.dropped_partitions)}" if result.dropped_partitions else '',
+            '' if result.complete else '; stopped at the time budget')
+    return results
@@ -0,0 +1,137 @@
+"""
+Process-level helpers for gunicorn.conf.py.
+
+Kept free of Django imports at module level so the gunicorn master can load
+its config before the application is preloaded.
+"""
+import logging
+import os
+import signal
+import threading
+
+logger = logging.getLogger(__name__)
+
+WSGI_APP = 'config.wsgi:application'
+ASGI_APP = 'config.asgi:application'
+
+WORKER_CLASSES = {
+    'sync': 'sync',
+    'gthread': 'gthread',
+    'uvicorn': 'uvicorn_worker.UvicornWorker',
+}
+
+
+def worker_settings(worker_model, cpu_count, workers=0, threads=0, max_workers=0):
+    """Derive gunicorn's worker_class, wsgi_app, workers and threads
+
+    `workers`/`threads` of 0 mean "derive from the CPU count":
+      - sync: 2 * CPUs + 1 processes, one request each
+      - gthread: CPUs + 1 processes with 4 threads each
+      - uvicorn: one event loop per CPU serving the ASGI app
+    `max_workers` caps the derived count (0 means no cap).
+    """
+    if worker_model not in WORKER_CLASSES:
+        raise ValueError(
+            f"Unknown worker model '{worker_model}', expected one of {', '.join(WORKER_CLASSES)}"
+        )
+    cpu_count = max(1, cpu_count)
+
+    if not workers:
+        if worker_model == 'sync':
+            workers = 2 * cpu_count + 1
+        elif worker_model == 'gthread':
+            workers = cpu_count + 1
+        else:
+            workers = cpu_count
+        if max_workers:
+            workers = min(workers, max_workers)
+
+    if worker_model == 'gthread':
+        threads = threads or 4
+    else:
+        threads = 1
+
+    return {
+        'worker_class': WORKER_CLASSES[worker_model],
+        'wsgi_app': ASGI_APP if worker_model == 'uvicorn' else WSGI_APP,
+        'workers': workers,
+        'threads': threads,
+    }
+
+
+def close_inherited_connections():
+    """Drop database connections a forked worker inherited from the master
+
+    The sockets are shared with the master, so they are discarded rather than
+    closed (closing would send a terminate message on the master's session).
+    """
+    from django.db import connections
+
+    for conn in connections.all(initialized_only=True):
+        conn.connection = None
+        conn.closed_in_transaction = False
+        # A psycopg pool's worker threads did not survive the fork either
+        pools = getattr(conn, '_connection_pools', None)
+        if pools:
+            pools.pop(conn.alias, None)
+
+
+def close_connections():
+    """Close the master's database connections (and pools) before workers are forked"""
+    from django.db import connections
+
+    connections.close_all()
+    for conn in connections.all(initialized_only=True):
+        if conn.settings_dict.get('OPTIONS', {}).get('pool') and hasattr(conn, 'close_pool'):
+            conn.close_pool()
+
+
+def read_rss_bytes():
+    """Resident set size of this process, in bytes"""
+    try:
+        with open('/proc/self/statm') as fh:
+            return int(fh.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import psutil
+
+        return psutil.Process().memory_info().rss
+
+
+class RSSWatchdog(threading.Thread):
+    """Ask this worker to exit gracefully once its RSS crosses `limit_bytes`
+
+    SIGTERM lets sync/gthread workers finish the in-flight request (and
+    uvicorn drain its connections) before exiting; the arbiter then forks a
+    fresh replacement from the preloaded master.
+    """
+
+    def __init__(self, limit_bytes, interval=10.0, read_rss=read_rss_bytes, on_exceeded=None):
+        super().__init__(name='rss-watchdog', daemon=True)
+        self.limit_bytes = limit_bytes
+        self.interval = interval
+        self.read_rss = read_rss
+        self.on_exceeded = on_exceeded or self._terminate
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def _terminate():
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    def check(self):
+        rss = self.read_rss()
+        if rss < self.limit_bytes:
+            return False
+        logger.warning(
+            'Worker %s RSS %.1f MiB exceeds %.1f MiB, recycling',
+            os.getpid(), rss / 2**20, self.limit_bytes / 2**20,
+        )
+        self.on_exceeded()
+        return True
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            if self.check():
+                return
+
+    def stop(self):
+        self._stopped.set()
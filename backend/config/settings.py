@@ -4,10 +4,12 @@ Django settings for config project.
 
 from pathlib import Path
 from datetime import timedelta
-from decouple import config
-import dj_database_url
+from importlib.util import find_spec
+from decouple import Csv, config
 import os
 
+from config.db import check_replica_cache, database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -39,17 +41,19 @@ INSTALLED_APPS = [
     'users',
     'tasks',
     'auth_app',
+    'jobs',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     # Temporary debug middleware to log Authorization headers
     'config.middleware.DebugAuthMiddleware',
+    'config.middleware.QueryProfilingMiddleware',
+    'config.middleware.PrimaryStickinessMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
@@ -82,13 +86,56 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database configuration - use SQLite for development if PostgreSQL not available
 # Database configuration
 # Use dj_database_url to parse the DATABASE_URL environment variable (set by Render)
+# DB_POOL_ENABLED switches PostgreSQL to psycopg 3 connection pooling (see config.db)
+_database_options = dict(
+    conn_max_age=config('DB_CONN_MAX_AGE', default=600, cast=int),
+    health_checks=config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool),
+    pool=config('DB_POOL_ENABLED', default=False, cast=bool),
+    pool_min_size=config('DB_POOL_MIN_SIZE', default=2, cast=int),
+    pool_max_size=config('DB_POOL_MAX_SIZE', default=10, cast=int),
+    pool_timeout=config('DB_POOL_TIMEOUT', default=10, cast=float),
+    pool_max_idle=config('DB_POOL_MAX_IDLE', default=300, cast=float),
+    pool_max_lifetime=config('DB_POOL_MAX_LIFETIME', default=1800, cast=float),
+)
 DATABASES = {
-    'default': dj_database_url.config(
-        default=config('DATABASE_URL', default='sqlite:///' + str(BASE_DIR / 'db.sqlite3')),
-        conn_max_age=600
+    'default': database_config(
+        config('DATABASE_URL', default='sqlite:///' + str(BASE_DIR / 'db.sqlite3')),
+        **_database_options,
     )
 }
 
+# Optional read replica for read-only endpoints (see config.db_router)
+DATABASE_REPLICA_URL = config('DATABASE_REPLICA_URL', default='')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = database_config(DATABASE_REPLICA_URL, **_database_options)
+    # Tests run against the primary only
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+# After a write, the user's reads stay on the primary this long
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+
+# Query profiling (slow-query log with EXPLAIN capture)
+QUERY_PROFILING_ENABLED = config('QUERY_PROFILING_ENABLED', default=True, cast=bool)
+SLOW_QUERY_THRESHOLD_MS = config('SLOW_QUERY_THRESHOLD_MS', default=200, cast=float)
+QUERY_PROFILER_MAX_FINGERPRINTS = config('QUERY_PROFILER_MAX_FINGERPRINTS', default=500, cast=int)
+QUERY_PROFILER_SAMPLE_SIZE = config('QUERY_PROFILER_SAMPLE_SIZE', default=256, cast=int)
+QUERY_PROFILER_EXPLAIN_INTERVAL = config('QUERY_PROFILER_EXPLAIN_INTERVAL', default=300, cast=int)
+
+# Startup: API docs routes (drf_spectacular, loaded on first request) and the
+# cold-start budget checked by `manage.py profile_startup --check`
+ENABLE_API_DOCS = config('ENABLE_API_DOCS', default=True, cast=bool)
+STARTUP_BUDGET_MS = config('STARTUP_BUDGET_MS', default=1500, cast=float)
+# Modules imported up to a loaded URLconf: deterministic, so CI checks this rather than time
+STARTUP_MODULE_BUDGET = config('STARTUP_MODULE_BUDGET', default=1000, cast=int)
+STARTUP_LAZY_MODULES = [
+    'psutil',
+    'auth_app.system_monitoring',
+    'drf_spectacular.views',
+    'config.api_docs',
+    'drf_spectacular.generators',
+]
+
 
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
@@ -138,9 +185,12 @@ STATICFILES_DIRS = []
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # REST Framework Configuration
+# application/msgpack negotiation for internal consumers (needs the optional msgpack package)
+MSGPACK_ENABLED = config('MSGPACK_ENABLED', default=find_spec('msgpack') is not None, cast=bool)
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -148,11 +198,148 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': (
-        'rest_framework.renderers.JSONRenderer',
+        'config.renderers.ORJSONRenderer',
+        *(('config.renderers.MessagePackRenderer',) if MSGPACK_ENABLED else ()),
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'config.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+        *(('config.renderers.MessagePackParser',) if MSGPACK_ENABLED else ()),
+    ),
+    # @api_view resolves the schema class at import time; keep drf_spectacular
+    # off the startup path when the docs are disabled
+    'DEFAULT_SCHEMA_CLASS': (
+        'drf_spectacular.openapi.AutoSchema' if ENABLE_API_DOCS
+        else 'rest_framework.schemas.openapi.AutoSchema'
     ),
-    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': config('LOGIN_THROTTLE_IP_RATE', default='30/min'),
+        'login_email': config('LOGIN_THROTTLE_EMAIL_RATE', default='10/min'),
+    },
 }
 
+# Cache (login throttles, replica pins). LocMem is per process; point at Redis/Memcached to share
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='ttms-default'),
+    }
+}
+if DATABASE_REPLICA_URL:
+    check_replica_cache(CACHES['default']['BACKEND'])
+
+# Per-process serialized fragment caches (see config.fragment_cache)
+TASK_FRAGMENT_CACHE_SIZE = config('TASK_FRAGMENT_CACHE_SIZE', default=10000, cast=int)
+USER_FRAGMENT_CACHE_SIZE = config('USER_FRAGMENT_CACHE_SIZE', default=5000, cast=int)
+
+# Deadline reminders (see tasks.reminders): lead windows plus overdue
+DEADLINE_REMINDER_WINDOWS = config('DEADLINE_REMINDER_WINDOWS', default='24h,1h', cast=Csv())
+DEADLINE_REMINDER_OVERDUE_LOOKBACK_HOURS = config('DEADLINE_REMINDER_OVERDUE_LOOKBACK_HOURS', default=24, cast=int)
+DEADLINE_REMINDER_BATCH_SIZE = config('DEADLINE_REMINDER_BATCH_SIZE', default=1000, cast=int)
+DEADLINE_REMINDER_INTERVAL = config('DEADLINE_REMINDER_INTERVAL', default=60, cast=int)
+
+# Tasks per column on /api/tasks/board/ (?limit= up to the max)
+TASK_BOARD_COLUMN_LIMIT = config('TASK_BOARD_COLUMN_LIMIT', default=20, cast=int)
+TASK_BOARD_MAX_COLUMN_LIMIT = config('TASK_BOARD_MAX_COLUMN_LIMIT', default=100, cast=int)
+# A drag-and-drop move leaving a rank longer than this queues a column rebalance
+TASK_RANK_REBALANCE_LENGTH = config('TASK_RANK_REBALANCE_LENGTH', default=24, cast=int)
+
+# Done tasks untouched for TASK_ARCHIVE_AFTER_DAYS move to the archive tables
+# in batches (see tasks.archive); 0 keeps everything in the hot table
+TASK_ARCHIVE_AFTER_DAYS = config('TASK_ARCHIVE_AFTER_DAYS', default=90, cast=int)
+TASK_ARCHIVE_BATCH_SIZE = config('TASK_ARCHIVE_BATCH_SIZE', default=500, cast=int)
+TASK_ARCHIVE_PAUSE_SECONDS = config('TASK_ARCHIVE_PAUSE_SECONDS', default=0.05, cast=float)
+TASK_ARCHIVE_SCHEDULE = config('TASK_ARCHIVE_SCHEDULE', default='0 3 * * *')
+
+# Background jobs (see jobs.queue). Eager runs jobs inline at enqueue time;
+# set JOBS_EAGER=False once a `manage.py ttms_worker` is running
+JOBS_EAGER = config('JOBS_EAGER', default=True, cast=bool)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_VISIBILITY_TIMEOUT = config('JOBS_VISIBILITY_TIMEOUT', default=300, cast=int)
+JOBS_BACKOFF_BASE = config('JOBS_BACKOFF_BASE', default=5, cast=float)
+JOBS_BACKOFF_MAX = config('JOBS_BACKOFF_MAX', default=3600, cast=float)
+JOBS_POLL_INTERVAL = config('JOBS_POLL_INTERVAL', default=1.0, cast=float)
+JOBS_BATCH_SIZE = config('JOBS_BATCH_SIZE', default=10, cast=int)
+JOBS_WORKER_CONCURRENCY = config('JOBS_WORKER_CONCURRENCY', default=4, cast=int)
+
+# Periodic housekeeping (see jobs.scheduler). Schedulers run in every gunicorn
+# worker (SCHEDULER_IN_PROCESS) or `manage.py ttms_scheduler`; a lease row
+# elects the one that runs tasks
+SCHEDULER_IN_PROCESS = config('SCHEDULER_IN_PROCESS', default=False, cast=bool)
+SCHEDULER_TICK_SECONDS = config('SCHEDULER_TICK_SECONDS', default=5, cast=float)
+SCHEDULER_LEASE_SECONDS = config('SCHEDULER_LEASE_SECONDS', default=30, cast=int)
+SCHEDULER_DISABLED = config('SCHEDULER_DISABLED', default='', cast=Csv())
+SCHEDULER_HISTORY_DAYS = config('SCHEDULER_HISTORY_DAYS', default=14, cast=int)
+
+# Audit log rows are inserted in batches after commit (see config.write_behind)
+WRITE_BEHIND_ENABLED = config('WRITE_BEHIND_ENABLED', default=True, cast=bool)
+WRITE_BEHIND_BATCH_SIZE = config('WRITE_BEHIND_BATCH_SIZE', default=100, cast=int)
+WRITE_BEHIND_FLUSH_INTERVAL = config('WRITE_BEHIND_FLUSH_INTERVAL', default=2.0, cast=float)
+
+# Monthly created_at partitions on PostgreSQL (see config.partitioning)
+PARTITIONED_MODELS = ['auth_app.AdminActivityLog', 'tasks.ActivityLog']
+PARTITION_PREMAKE_MONTHS = config('PARTITION_PREMAKE_MONTHS', default=3, cast=int)
+
+# Retention (see config.retention): rows older than `days` matching `filter`
+# are deleted in throttled chunks; 0 days keeps them forever
+RETENTION_POLICIES = [
+    {
+        'name': 'read_notifications',
+        'model': 'tasks.Notification',
+        'days': config('RETENTION_READ_NOTIFICATION_DAYS', default=30, cast=int),
+        'filter': {'is_read': True},
+    },
+    {
+        'name': 'notifications',
+        'model': 'tasks.Notification',
+        'days': config('RETENTION_NOTIFICATION_DAYS', default=180, cast=int),
+    },
+    {
+        'name': 'archived_notifications',
+        'model': 'tasks.ArchivedNotification',
+        'days': config('RETENTION_NOTIFICATION_DAYS', default=180, cast=int),
+    },
+    {
+        'name': 'activity_logs',
+        'model': 'tasks.ActivityLog',
+        'days': config('RETENTION_ACTIVITY_LOG_DAYS', default=365, cast=int),
+    },
+    {
+        'name': 'admin_activity_logs',
+        'model': 'auth_app.AdminActivityLog',
+        'days': config('RETENTION_ADMIN_LOG_DAYS', default=365, cast=int),
+    },
+    {
+        'name': 'password_resets',
+        'model': 'auth_app.PasswordResetRequest',
+        'days': config('RETENTION_PASSWORD_RESET_DAYS', default=30, cast=int),
+        'filter': {'status__in': ['COMPLETED', 'REJECTED', 'EXPIRED']},
+    },
+    {
+        'name': 'finished_jobs',
+        'model': 'jobs.Job',
+        'field': 'finished_at',
+        'days': config('RETENTION_JOB_DAYS', default=7, cast=int),
+        'filter': {'status__in': ['done', 'failed']},
+    },
+]
+# Off-peak by default; each run stops after RETENTION_MAX_SECONDS and sleeps
+# RETENTION_SLEEP_RATIO x the time of each batch (at least RETENTION_PAUSE_SECONDS)
+RETENTION_SCHEDULE = config('RETENTION_SCHEDULE', default='30 3 * * *')
+RETENTION_BATCH_SIZE = config('RETENTION_BATCH_SIZE', default=1000, cast=int)
+RETENTION_PAUSE_SECONDS = config('RETENTION_PAUSE_SECONDS', default=0.05, cast=float)
+RETENTION_SLEEP_RATIO = config('RETENTION_SLEEP_RATIO', default=1.0, cast=float)
+RETENTION_MAX_SECONDS = config('RETENTION_MAX_SECONDS', default=600, cast=float)
+
+# List endpoints serialize values_list() rows instead of instances (see config.fast_serializer)
+FAST_SERIALIZERS_ENABLED = config('FAST_SERIALIZERS_ENABLED', default=True, cast=bool)
+
+# Password verification pool used by login_view (see auth_app.hashing)
+LOGIN_HASH_WORKERS = config('LOGIN_HASH_WORKERS', default=2, cast=int)
+LOGIN_HASH_MAX_PENDING = config('LOGIN_HASH_MAX_PENDING', default=8, cast=int)
+LOGIN_HASH_TIMEOUT = config('LOGIN_HASH_TIMEOUT', default=5, cast=float)
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -165,8 +352,19 @@ SIMPLE_JWT = {
     'AUTH_HEADER_NAME': 'HTTP_AUTHORIZATION',
     'USER_ID_FIELD': 'id',
     'USER_ID_CLAIM': 'user_id',
+    'TOKEN_REFRESH_SERIALIZER': 'auth_app.serializers.RevocationAwareTokenRefreshSerializer',
 }
 
+# Token revocation (see auth_app.revocation): Bloom filter sizing and how
+# often each process picks up tokens revoked by other processes
+TOKEN_REVOCATION_BLOOM_CAPACITY = config('TOKEN_REVOCATION_BLOOM_CAPACITY', default=100000, cast=int)
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = config('TOKEN_REVOCATION_BLOOM_ERROR_RATE', default=0.001, cast=float)
+TOKEN_REVOCATION_SYNC_INTERVAL = config('TOKEN_REVOCATION_SYNC_INTERVAL', default=5, cast=int)
+
+# Per-process cache of authenticated users (see users.authentication)
+JWT_USER_CACHE_SIZE = config('JWT_USER_CACHE_SIZE', default=1024, cast=int)
+JWT_USER_CACHE_TTL = config('JWT_USER_CACHE_TTL', default=60, cast=int)
+
 # CORS Settings
 CORS_ALLOWED_ORIGINS = config(
     'CORS_ALLOWED_ORIGINS',
@@ -0,0 +1,70 @@
+"""
+Static files served around the WSGI and ASGI applications.
+
+WhiteNoise is sync-only: kept in MIDDLEWARE under ASGI, Django would adapt
+every request, static or not, to a thread. Instead its file index (built
+from STATIC_ROOT, STATIC_URL and the WHITENOISE_* settings, as the
+middleware does) wraps the application from outside Django. `StaticFiles`
+is the WSGI wrapper; `ASGIStaticFiles` answers static paths on the event
+loop, reading files in short thread hops, and hands every other request
+straight to Django's async handler.
+"""
+import asyncio
+
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+CHUNK_SIZE = 64 * 1024
+
+
+class StaticFiles(WhiteNoiseMiddleware):
+    """WhiteNoise configured from settings, wrapping a WSGI `application`"""
+
+    def __init__(self, application):
+        super().__init__()
+        self.application = application
+
+    # The plain WSGI entry point, not the middleware's Django request one
+    __call__ = WhiteNoise.__call__
+
+    def lookup(self, path):
+        return self.find_file(path) if self.autorefresh else self.files.get(path)
+
+
+class ASGIStaticFiles(StaticFiles):
+    """The same file index in front of an ASGI `application`"""
+
+    async def __call__(self, scope, receive, send):
+        static_file = None
+        if scope['type'] == 'http':
+            path = scope['path']
+            root_path = scope.get('root_path', '')
+            if root_path and path.startswith(root_path):
+                path = path[len(root_path):]
+            static_file = self.lookup(path)
+        if static_file is None:
+            return await self.application(scope, receive, send)
+        await self.respond(static_file, scope, send)
+
+    @staticmethod
+    async def respond(static_file, scope, send):
+        # WhiteNoise reads conditional and range headers WSGI-style
+        request_headers = {
+            'HTTP_' + name.decode('latin-1').upper().replace('-', '_'): value.decode('latin-1')
+            for name, value in scope['headers']
+        }
+        response = static_file.get_response(scope['method'], request_headers)
+        await send({
+            'type': 'http.response.start',
+            'status': int(response.status),
+            'headers': [(key.lower().encode('latin-1'), value.encode('latin-1')) for key, value in response.headers],
+        })
+        if response.file is None:
+            await send({'type': 'http.response.body', 'body': b''})
+            return
+        try:
+            while chunk := await asyncio.to_thread(response.file.read, CHUNK_SIZE):
+                await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            response.file.close()
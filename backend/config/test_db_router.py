@@ -0,0 +1,94 @@
+import uuid
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.models import Task
+from users.models import User
+from .db_router import ReplicaRouter, is_pinned, prefers_replica, replica_reads
+
+
+class ReplicaRouterTest(SimpleTestCase):
+    """Test cases for routing decisions"""
+
+    def test_reads_stay_on_primary_without_replica(self):
+        with replica_reads():
+            self.assertEqual(Task.objects.all().db, 'default')
+
+    @mock.patch('config.db_router.replica_alias', return_value='replica')
+    def test_opted_in_reads_use_replica(self, _alias):
+        self.assertEqual(Task.objects.all().db, 'default')
+        with replica_reads():
+            self.assertEqual(Task.objects.all().db, 'replica')
+            self.assertEqual(ReplicaRouter().db_for_write(Task), 'default')
+
+    @mock.patch('config.db_router.replica_alias', return_value='replica')
+    def test_reads_inside_transaction_use_primary(self, _alias):
+        with mock.patch.object(connection, 'in_atomic_block', True), replica_reads():
+            self.assertEqual(Task.objects.all().db, 'default')
+
+    def test_only_primary_is_migrated(self):
+        router = ReplicaRouter()
+        self.assertTrue(router.allow_migrate('default', 'tasks'))
+        self.assertFalse(router.allow_migrate('replica', 'tasks'))
+
+
+# The "replica" is the test database itself, so requests run normally while
+# the routing preference is observed at query time
+@mock.patch('config.db_router.replica_alias', return_value='default')
+class ReadYourWritesTest(TestCase):
+    """Safe requests read from the replica unless the user just wrote"""
+
+    def setUp(self):
+        cache.clear()
+        suffix = uuid.uuid4().hex[:8]
+        self.user = User.objects.create_user(
+            username=f'replica_{suffix}',
+            email=f'replica_{suffix}@example.com',
+            password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}'
+        )
+
+    def routing_of(self, method, url, data=None):
+        seen = []
+
+        def record(execute, sql, params, many, context):
+            seen.append(prefers_replica())
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = getattr(self.client, method)(url, data, format='json')
+        return response, seen
+
+    def test_get_reads_from_replica(self, _alias):
+        response, seen = self.routing_of('get', '/api/tasks/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any(seen))
+
+    def test_write_pins_user_to_primary(self, _alias):
+        response, seen = self.routing_of('post', '/api/tasks/', {'title': 'Pinned'})
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(any(seen))
+        self.assertTrue(is_pinned(self.user))
+
+        response, seen = self.routing_of('get', '/api/tasks/')
+        self.assertEqual(response.data['count'], 1)
+        self.assertFalse(any(seen))
+
+    def test_failed_write_does_not_pin(self, _alias):
+        response, _seen = self.routing_of('post', '/api/tasks/', {})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(is_pinned(self.user))
+
+    def test_async_endpoint_reads_from_replica(self, _alias):
+        response, seen = self.routing_of('get', '/api/async/tasks/statistics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any(seen))
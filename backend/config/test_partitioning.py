@@ -0,0 +1,159 @@
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection, models
+from django.test import SimpleTestCase, TestCase
+
+from auth_app.models import AdminActivityLog
+from jobs.scheduler import periodic_tasks
+from tasks.models import ActivityLog
+from .partitioning import (
+    add_months,
+    create_partition,
+    default_partition_name,
+    drop_partitions_before,
+    ensure_partitions,
+    is_partitioned,
+    maintain_partitions,
+    month_start,
+    months_between,
+    partition_name,
+    partition_table,
+    partitions,
+    unpartition_table,
+)
+
+
+class IdentityProbe(models.Model):
+    """Throwaway table with a database-generated (identity) primary key"""
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        app_label = 'auth_app'
+        db_table = 'partitioning_identity_probe'
+        managed = False
+
+
+def month(year, number):
+    return datetime(year, number, 1, tzinfo=dt_timezone.utc)
+
+
+def log(created_at):
+    return AdminActivityLog.objects.create(
+        action=AdminActivityLog.Action.OTHER, description='partitioned', created_at=created_at
+    )
+
+
+class MonthArithmeticTest(SimpleTestCase):
+    """Test cases for month boundaries"""
+
+    def test_month_start_is_utc(self):
+        moment = datetime(2026, 11, 1, 3, 0, tzinfo=dt_timezone.utc)
+        self.assertEqual(month_start(moment), month(2026, 11))
+
+    def test_add_months_crosses_years(self):
+        self.assertEqual(add_months(month(2026, 11), 3), month(2027, 2))
+        self.assertEqual(add_months(month(2026, 1), -1), month(2025, 12))
+
+    def test_months_between(self):
+        self.assertEqual(
+            list(months_between(datetime(2026, 11, 20, tzinfo=dt_timezone.utc), month(2027, 1))),
+            [month(2026, 11), month(2026, 12), month(2027, 1)],
+        )
+
+    def test_names(self):
+        self.assertEqual(partition_name('admin_activity_logs', month(2026, 3)), 'admin_activity_logs_p202603')
+        self.assertEqual(default_partition_name('admin_activity_logs'), 'admin_activity_logs_pdefault')
+
+
+class PartitionMaintenanceTest(TestCase):
+    """Works on every backend; whole partitions are dropped on PostgreSQL"""
+
+    def setUp(self):
+        if is_partitioned(AdminActivityLog):
+            for number in (1, 2, 3):
+                create_partition(AdminActivityLog, month(2026, number))
+        self.old = log(datetime(2026, 1, 15, tzinfo=dt_timezone.utc))
+        log(datetime(2026, 2, 1, tzinfo=dt_timezone.utc))
+        self.kept = log(datetime(2026, 3, 2, tzinfo=dt_timezone.utc))
+        # Run the deferred FK checks now: PostgreSQL will not drop a table
+        # with trigger events pending in the same transaction
+        connection.check_constraints()
+
+    def test_drop_before_keeps_later_months(self):
+        dropped, deleted = drop_partitions_before(AdminActivityLog, datetime(2026, 3, 9, tzinfo=dt_timezone.utc))
+        self.assertEqual(list(AdminActivityLog.objects.values_list('pk', flat=True)), [self.kept.pk])
+        if is_partitioned(AdminActivityLog):
+            self.assertIn('admin_activity_logs_p202601', dropped)
+        else:
+            self.assertEqual((dropped, deleted), ([], 2))
+
+    def test_partitions_list_months(self):
+        months = [p.start for p in partitions(AdminActivityLog) if p.start is not None]
+        self.assertTrue({month(2026, 1), month(2026, 2), month(2026, 3)} <= set(months))
+
+    def test_maintain_reports_every_model(self):
+        report = maintain_partitions(now=datetime(2026, 8, 10, tzinfo=dt_timezone.utc))
+        self.assertEqual(set(report), {'auth_app.AdminActivityLog', 'tasks.ActivityLog'})
+        if is_partitioned(AdminActivityLog):
+            self.assertIn('admin_activity_logs_p202608', report['auth_app.AdminActivityLog'])
+
+    def test_maintain_is_scheduled(self):
+        self.assertIn('auth_app.maintain_log_partitions', [task.name for task in periodic_tasks()])
+
+    def test_command(self):
+        out = StringIO()
+        call_command('log_partitions', '--ensure', '--drop-before', '2026-02', stdout=out)
+        self.assertIn('auth_app.AdminActivityLog: dropped', out.getvalue())
+        self.assertIn('admin_activity_logs_p202603', out.getvalue())
+        self.assertEqual(AdminActivityLog.objects.count(), 2)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'declarative partitioning is PostgreSQL only')
+class PostgresPartitionTest(TestCase):
+    """The migrations turn both log tables into monthly partitions"""
+
+    def test_tables_are_partitioned(self):
+        self.assertTrue(is_partitioned(AdminActivityLog))
+        self.assertTrue(is_partitioned(ActivityLog))
+
+    def test_ensure_creates_months_ahead(self):
+        created = ensure_partitions(AdminActivityLog, ahead=2, now=datetime(2099, 5, 3, tzinfo=dt_timezone.utc))
+        self.assertEqual(created, [f'admin_activity_logs_p2099{number:02}' for number in (5, 6, 7)])
+        self.assertEqual(ensure_partitions(AdminActivityLog, ahead=2, now=datetime(2099, 5, 3, tzinfo=dt_timezone.utc)), [])
+
+    def test_new_month_adopts_rows_from_the_default_partition(self):
+        entry = log(datetime(2098, 4, 10, tzinfo=dt_timezone.utc))
+        self.assertTrue(create_partition(AdminActivityLog, month(2098, 4)))
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT id FROM admin_activity_logs_p209804')
+            self.assertEqual([row[0] for row in cursor.fetchall()], [entry.pk])
+            cursor.execute('SELECT count(*) FROM admin_activity_logs_pdefault')
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_range_queries_prune_partitions(self):
+        ensure_partitions(AdminActivityLog, ahead=1)
+        now = month_start(datetime.now(dt_timezone.utc))
+        plan = AdminActivityLog.objects.filter(created_at__gte=now, created_at__lt=add_months(now, 1)).explain()
+        self.assertIn(partition_name('admin_activity_logs', now), plan)
+        self.assertNotIn(partition_name('admin_activity_logs', add_months(now, 1)), plan)
+
+    def test_rebuilt_tables_keep_generating_ids(self):
+        with connection.schema_editor() as schema_editor:
+            schema_editor.create_model(IdentityProbe)
+        try:
+            first = IdentityProbe.objects.create(created_at=datetime.now(dt_timezone.utc))
+            with connection.schema_editor() as schema_editor:
+                partition_table(schema_editor, IdentityProbe)
+            second = IdentityProbe.objects.create(created_at=datetime.now(dt_timezone.utc))
+            self.assertGreater(second.pk, first.pk)
+            with connection.schema_editor() as schema_editor:
+                unpartition_table(schema_editor, IdentityProbe)
+            third = IdentityProbe.objects.create(created_at=datetime.now(dt_timezone.utc))
+            self.assertGreater(third.pk, second.pk)
+        finally:
+            with connection.schema_editor() as schema_editor:
+                schema_editor.delete_model(IdentityProbe)
@@ -0,0 +1,115 @@
+import datetime
+import decimal
+import io
+import json
+import unittest
+import uuid
+import zoneinfo
+
+from django.test import SimpleTestCase, TestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tasks.models import Task
+from users.models import User
+from .renderers import MessagePackRenderer, ORJSONParser, ORJSONRenderer
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+PAYLOAD = {
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'count': 3,
+    'ratio': 0.25,
+    'price': decimal.Decimal('12.50'),
+    'utc': datetime.datetime(2026, 3, 1, 9, 30, 0, 123456, tzinfo=datetime.timezone.utc),
+    'local': datetime.datetime(2026, 3, 1, 9, 30, tzinfo=zoneinfo.ZoneInfo('Asia/Kolkata')),
+    'naive': datetime.datetime(2026, 3, 1, 9, 30),
+    'day': datetime.date(2026, 3, 1),
+    'at': datetime.time(9, 30),
+    'duration': datetime.timedelta(minutes=90),
+    'label': gettext_lazy('Task assigned'),
+    'text': 'naïve – line break',
+    'empty': None,
+    'flags': [True, False],
+    1: ('int', 'key'),
+    'nested': [{'id': uuid.UUID(int=1), 'tags': ['a']}],
+}
+
+
+class ORJSONRendererTest(SimpleTestCase):
+    """The orjson renderer must produce DRF's bytes"""
+
+    def test_matches_drf_output(self):
+        self.assertEqual(ORJSONRenderer().render(PAYLOAD), JSONRenderer().render(PAYLOAD))
+
+    def test_indent_falls_back_to_stdlib(self):
+        media_type = 'application/json; indent=2'
+        self.assertEqual(
+            ORJSONRenderer().render(PAYLOAD, media_type), JSONRenderer().render(PAYLOAD, media_type)
+        )
+
+    def test_integers_beyond_64_bits_fall_back(self):
+        data = {'big': 2 ** 70}
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+class ORJSONParserTest(SimpleTestCase):
+    """Test cases for the orjson parser"""
+
+    def test_parses_utf8(self):
+        body = '{"title": "naïve", "n": [1, 2]}'.encode()
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), {'title': 'naïve', 'n': [1, 2]})
+
+    def test_parses_other_charsets(self):
+        body = '{"title": "naïve"}'.encode('latin-1')
+        data = ORJSONParser().parse(io.BytesIO(body), parser_context={'encoding': 'latin-1'})
+        self.assertEqual(data, {'title': 'naïve'})
+
+    def test_invalid_json_is_a_parse_error(self):
+        for body in (b'{"title": ', b'', b'{"n": NaN}'):
+            with self.subTest(body=body), self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+@unittest.skipIf(msgpack is None, 'msgpack is not installed')
+class MessagePackTest(TestCase):
+    """application/msgpack is negotiated alongside JSON"""
+
+    def setUp(self):
+        suffix = uuid.uuid4().hex[:8]
+        self.user = User.objects.create_user(
+            username=f'msgpack_{suffix}', email=f'msgpack_{suffix}@example.com',
+            password='testpass123', role=User.Role.MANAGER,
+        )
+        Task.objects.create(title='Packed', created_by=self.user, assignee=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def test_renders_json_representation(self):
+        data = {key: value for key, value in PAYLOAD.items() if isinstance(key, str)}
+        packed = msgpack.unpackb(MessagePackRenderer().render(data))
+        self.assertEqual(packed, json.loads(JSONRenderer().render(data)))
+
+    def test_list_endpoint_negotiates_msgpack(self):
+        json_response = self.client.get('/api/tasks/')
+        response = self.client.get('/api/tasks/', HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        self.assertEqual(msgpack.unpackb(response.content), json_response.json())
+
+    def test_accepts_msgpack_requests(self):
+        response = self.client.post(
+            '/api/tasks/', msgpack.packb({'title': 'From msgpack'}), content_type='application/msgpack'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Task.objects.filter(title='From msgpack').exists())
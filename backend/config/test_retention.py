@@ -0,0 +1,141 @@
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from auth_app.models import AdminActivityLog, PasswordResetRequest
+from jobs.models import Job
+from jobs.scheduler import periodic_tasks
+from tasks.models import Notification, Task
+from users.models import User
+from .partitioning import create_partition, is_partitioned
+from .retention import apply_retention, retention_policies
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=dt_timezone.utc)
+
+
+def days_ago(days):
+    return NOW - timedelta(days=days)
+
+
+class RetentionTest(TestCase):
+    """Test cases for the retention policies and the chunked deletes"""
+
+    def setUp(self):
+        suffix = uuid.uuid4().hex[:8]
+        self.user = User.objects.create_user(
+            username=f'retain_{suffix}', email=f'retain_{suffix}@example.com', password='testpass123'
+        )
+        self.task = Task.objects.create(title='Retained', created_by=self.user)
+        self.sleeps = []
+
+    def notification(self, age, is_read):
+        notification = Notification.objects.create(
+            user=self.user, task=self.task, type='task_assigned', message='hi', is_read=is_read
+        )
+        # created_at is auto_now_add
+        Notification.objects.filter(pk=notification.pk).update(created_at=days_ago(age))
+        return notification
+
+    def run_policies(self, *names, **kwargs):
+        kwargs.setdefault('pause', 0)
+        return apply_retention(names=names, now=NOW, sleep=self.sleeps.append, **kwargs)
+
+    def test_notification_policies(self):
+        recent_read = self.notification(10, is_read=True)
+        old_unread = self.notification(40, is_read=False)
+        self.notification(40, is_read=True)
+        self.notification(200, is_read=False)
+
+        results = self.run_policies('read_notifications', 'notifications')
+        self.assertEqual([(r.policy, r.deleted) for r in results], [('read_notifications', 1), ('notifications', 1)])
+        self.assertEqual(set(Notification.objects.values_list('pk', flat=True)), {recent_read.pk, old_unread.pk})
+
+    def test_deletes_in_throttled_batches(self):
+        for _ in range(5):
+            self.notification(200, is_read=False)
+        result = self.run_policies('notifications', batch_size=2, pause=0.5)[0]
+        self.assertEqual((result.deleted, result.batches, result.complete), (5, 3, True))
+        # No sleep after the last, short batch
+        self.assertEqual(self.sleeps, [0.5, 0.5])
+        self.assertGreaterEqual(result.seconds, 0)
+
+    def test_stops_at_the_time_budget(self):
+        self.notification(200, is_read=False)
+        result = self.run_policies('notifications', max_seconds=0)[0]
+        self.assertEqual((result.deleted, result.complete), (0, False))
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_dry_run_only_counts(self):
+        self.notification(200, is_read=False)
+        self.assertEqual(self.run_policies('notifications', dry_run=True)[0].deleted, 1)
+        self.assertEqual(Notification.objects.count(), 1)
+
+    def test_password_resets_keep_open_requests(self):
+        for index, status in enumerate(PasswordResetRequest.Status.values):
+            reset = PasswordResetRequest.objects.create(user=self.user, token=f'{status}-{index}', status=status)
+            PasswordResetRequest.objects.filter(pk=reset.pk).update(created_at=days_ago(60))
+        self.assertEqual(self.run_policies('password_resets')[0].deleted, 3)
+        self.assertEqual(
+            set(PasswordResetRequest.objects.values_list('status', flat=True)),
+            {PasswordResetRequest.Status.PENDING, PasswordResetRequest.Status.APPROVED},
+        )
+
+    def test_finished_jobs(self):
+        Job.objects.create(name='old', status=Job.Status.DONE, finished_at=days_ago(8))
+        Job.objects.create(name='recent', status=Job.Status.FAILED, finished_at=days_ago(1))
+        Job.objects.create(name='waiting', status=Job.Status.QUEUED)
+        self.assertEqual(self.run_policies('finished_jobs')[0].deleted, 1)
+        self.assertEqual(sorted(Job.objects.values_list('name', flat=True)), ['recent', 'waiting'])
+
+    def test_admin_logs(self):
+        AdminActivityLog.objects.create(action='OTHER', description='old', created_at=days_ago(400))
+        AdminActivityLog.objects.create(action='OTHER', description='new', created_at=days_ago(10))
+        self.run_policies('admin_activity_logs')
+        self.assertEqual(list(AdminActivityLog.objects.values_list('description', flat=True)), ['new'])
+
+    @override_settings(RETENTION_POLICIES=[
+        {'name': 'kept', 'model': 'tasks.Notification', 'days': 0},
+    ])
+    def test_zero_days_keeps_forever(self):
+        self.assertEqual(retention_policies(), [])
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            retention_policies(['nope'])
+
+    def test_scheduled_and_command(self):
+        self.assertIn('auth_app.apply_retention', [task.name for task in periodic_tasks()])
+        self.notification(200, is_read=False)
+        out = StringIO()
+        call_command('apply_retention', '--policy', 'notifications', '--dry-run', stdout=out)
+        self.assertIn('would delete        1 rows', out.getvalue())
+        call_command('apply_retention', '--policy', 'notifications', '--pause', '0', stdout=out)
+        self.assertIn('Deleted 1 rows.', out.getvalue())
+        self.assertFalse(Notification.objects.exists())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'declarative partitioning is PostgreSQL only')
+class PartitionedRetentionTest(TestCase):
+    """Expired months of the log tables are dropped, not deleted"""
+
+    def test_drops_whole_months(self):
+        self.assertTrue(is_partitioned(AdminActivityLog))
+        for month in (8, 9, 10):
+            create_partition(AdminActivityLog, datetime(2025, month, 1, tzinfo=dt_timezone.utc))
+        for day in (datetime(2025, 8, 5), datetime(2025, 10, 5), datetime(2025, 10, 25)):
+            AdminActivityLog.objects.create(action='OTHER', description='x', created_at=day.replace(tzinfo=dt_timezone.utc))
+        connection.check_constraints()
+
+        # Cutoff 2025-10-20: August and September go whole, October row by row
+        result = apply_retention(names=['admin_activity_logs'], now=days_ago(0), pause=0)[0]
+        self.assertEqual(result.cutoff, days_ago(365))
+        self.assertIn('admin_activity_logs_p202508', result.dropped_partitions)
+        self.assertIn('admin_activity_logs_p202509', result.dropped_partitions)
+        self.assertNotIn('admin_activity_logs_p202510', result.dropped_partitions)
+        self.assertEqual(result.deleted, 1)
+        self.assertEqual(AdminActivityLog.objects.count(), 1)
@@ -0,0 +1,61 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import clear_url_caches, get_resolver
+
+from .server import RSSWatchdog, worker_settings
+from .warmup import warm_up
+
+
+class WorkerSettingsTest(SimpleTestCase):
+    """Test cases for the gunicorn worker model derivation"""
+
+    def test_sync_derives_from_cpus(self):
+        settings = worker_settings('sync', 2)
+        self.assertEqual(settings['worker_class'], 'sync')
+        self.assertEqual(settings['wsgi_app'], 'config.wsgi:application')
+        self.assertEqual(settings['workers'], 5)
+        self.assertEqual(settings['threads'], 1)
+
+    def test_gthread_uses_threads(self):
+        settings = worker_settings('gthread', 2)
+        self.assertEqual((settings['workers'], settings['threads']), (3, 4))
+        self.assertEqual(worker_settings('gthread', 2, threads=8)['threads'], 8)
+
+    def test_uvicorn_serves_asgi(self):
+        settings = worker_settings('uvicorn', 4)
+        self.assertEqual(settings['worker_class'], 'uvicorn_worker.UvicornWorker')
+        self.assertEqual(settings['wsgi_app'], 'config.asgi:application')
+        self.assertEqual(settings['workers'], 4)
+
+    def test_cap_and_explicit_count(self):
+        self.assertEqual(worker_settings('sync', 16, max_workers=4)['workers'], 4)
+        self.assertEqual(worker_settings('sync', 16, workers=6, max_workers=4)['workers'], 6)
+
+    def test_unknown_model_rejected(self):
+        with self.assertRaises(ValueError):
+            worker_settings('eventlet', 2)
+
+
+class RSSWatchdogTest(SimpleTestCase):
+    """Test cases for RSS-based worker recycling"""
+
+    def test_recycles_only_above_limit(self):
+        rss = [100]
+        exceeded = mock.Mock()
+        watchdog = RSSWatchdog(200, read_rss=lambda: rss[0], on_exceeded=exceeded)
+        self.assertFalse(watchdog.check())
+        exceeded.assert_not_called()
+        rss[0] = 250
+        self.assertTrue(watchdog.check())
+        exceeded.assert_called_once()
+
+
+class WarmUpTest(TestCase):
+    """Warm-up runs in the gunicorn master, so it must not touch the database"""
+
+    def test_warm_up_issues_no_queries(self):
+        clear_url_caches()
+        with self.assertNumQueries(0), self.assertNoLogs('config.warmup', 'ERROR'):
+            warm_up()
+        self.assertTrue(get_resolver()._populated)
@@ -0,0 +1,57 @@
+import tempfile
+from pathlib import Path
+
+from asgiref.sync import async_to_sync
+from django.test import SimpleTestCase, override_settings
+
+from .static import ASGIStaticFiles
+
+
+def call(app, path, headers=()):
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b''}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {'type': 'http', 'method': 'GET', 'path': path, 'root_path': '', 'headers': list(headers)}
+    async_to_sync(app)(scope, receive, send)
+    return sent
+
+
+class ASGIStaticFilesTest(SimpleTestCase):
+    """Test cases for serving static files around the ASGI application"""
+
+    def setUp(self):
+        root = tempfile.TemporaryDirectory()
+        self.addCleanup(root.cleanup)
+        Path(root.name, 'app.css').write_bytes(b'body{}' * 20000)
+        self.django_calls = []
+
+        async def django_app(scope, receive, send):
+            self.django_calls.append(scope['path'])
+            await send({'type': 'http.response.start', 'status': 200, 'headers': []})
+            await send({'type': 'http.response.body', 'body': b'django'})
+
+        with override_settings(STATIC_ROOT=root.name, STATIC_URL='django_static/', DEBUG=False):
+            self.app = ASGIStaticFiles(django_app)
+
+    def test_serves_static_file_without_django(self):
+        sent = call(self.app, '/django_static/app.css')
+        self.assertEqual(sent[0]['status'], 200)
+        self.assertIn((b'content-type', b'text/css; charset="utf-8"'), sent[0]['headers'])
+        self.assertEqual(b''.join(m['body'] for m in sent[1:]), b'body{}' * 20000)
+        self.assertFalse(sent[-1].get('more_body'))
+        self.assertEqual(self.django_calls, [])
+
+    def test_range_request(self):
+        sent = call(self.app, '/django_static/app.css', [(b'range', b'bytes=0-3')])
+        self.assertEqual(sent[0]['status'], 206)
+        self.assertEqual(b''.join(m['body'] for m in sent[1:]), b'body')
+
+    def test_other_paths_reach_django(self):
+        sent = call(self.app, '/api/async/tasks/')
+        self.assertEqual(sent[1]['body'], b'django')
+        self.assertEqual(self.django_calls, ['/api/async/tasks/'])
@@ -0,0 +1,145 @@
+import time
+import uuid
+from unittest import mock
+
+from django.db import connections, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth_app.models import AdminActivityLog
+from tasks.models import ActivityLog
+from users.models import User
+from .write_behind import WriteBehindBuffer, write_behind
+
+
+def make_admin():
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'audit_{suffix}', email=f'audit_{suffix}@example.com',
+        password='testpass123', role=User.Role.ADMIN,
+    )
+
+
+class WriteBehindBufferTest(TestCase):
+    """Test cases for queueing and flushing buffered rows"""
+
+    def setUp(self):
+        self.admin = make_admin()
+        # Long interval: these tests flush by hand
+        self.buffer = WriteBehindBuffer(batch_size=100, flush_interval=60)
+
+    def entry(self, **kwargs):
+        kwargs.setdefault('action', AdminActivityLog.Action.OTHER)
+        return AdminActivityLog(admin_user=self.admin, description='audit', **kwargs)
+
+    def test_rows_are_queued_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.buffer.add(self.entry())
+            self.assertEqual(self.buffer.stats()['pending'], 0)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.buffer.stats()['pending'], 1)
+        self.assertFalse(AdminActivityLog.objects.exists())
+
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(AdminActivityLog.objects.get().admin_user, self.admin)
+        self.assertEqual(self.buffer.stats()['pending'], 0)
+
+    def test_rolled_back_rows_are_dropped(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError), transaction.atomic():
+                self.buffer.add(self.entry())
+                raise ValueError
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertFalse(AdminActivityLog.objects.exists())
+
+    def test_one_insert_per_model(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(3):
+                self.buffer.add(self.entry())
+                self.buffer.add(ActivityLog(user=self.admin, action='create'))
+        # savepoint, INSERT, release for each model
+        with self.assertNumQueries(6):
+            self.assertEqual(self.buffer.flush(), 6)
+        self.assertEqual((AdminActivityLog.objects.count(), ActivityLog.objects.count()), (3, 3))
+
+    def test_keeps_the_action_time(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add(self.entry())
+        logged_before = timezone.now()
+        self.buffer.flush()
+        self.assertLess(AdminActivityLog.objects.get().created_at, logged_before)
+
+    def test_bad_row_does_not_drop_the_batch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.buffer.add(self.entry())
+            self.buffer.add(self.entry(action=None))
+        with self.assertLogs('config.write_behind', 'ERROR'):
+            self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(self.buffer.stats()['failed'], 1)
+        self.assertEqual(AdminActivityLog.objects.count(), 1)
+
+    def test_disabled_inserts_immediately(self):
+        buffer = WriteBehindBuffer(enabled=False)
+        buffer.add(self.entry())
+        self.assertEqual(AdminActivityLog.objects.count(), 1)
+
+    def test_deleting_a_user_logs_without_a_reference(self):
+        target = make_admin()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.admin).access_token}')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(f'/api/users/{target.pk}/')
+        self.assertEqual(response.status_code, 204)
+        write_behind.flush()
+        entry = AdminActivityLog.objects.get(action=AdminActivityLog.Action.DELETE_USER)
+        self.assertIsNone(entry.target_user_id)
+        self.assertEqual(entry.metadata['target_user_email'], target.email)
+
+
+class WriteBehindThreadTest(TransactionTestCase):
+    """The background thread flushes on size and on age"""
+
+    def setUp(self):
+        self.admin = make_admin()
+
+    def wait_for(self, count):
+        deadline = time.monotonic() + 5
+        while AdminActivityLog.objects.count() < count and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return AdminActivityLog.objects.count()
+
+    def add(self, buffer, n):
+        for _ in range(n):
+            buffer.add(AdminActivityLog(admin_user=self.admin, action=AdminActivityLog.Action.OTHER))
+
+    def test_flushes_when_full(self):
+        buffer = WriteBehindBuffer(batch_size=3, flush_interval=60)
+        self.add(buffer, 3)
+        self.assertEqual(self.wait_for(3), 3)
+
+    def test_flushes_after_interval(self):
+        buffer = WriteBehindBuffer(batch_size=100, flush_interval=0.1)
+        self.add(buffer, 1)
+        self.assertEqual(self.wait_for(1), 1)
+        self.assertEqual(buffer.stats()['flushes'], 1)
+
+    def test_idle_thread_releases_its_connection(self):
+        buffer = WriteBehindBuffer(batch_size=1, flush_interval=60)
+        close_all = connections.close_all
+        flushes_seen = []
+
+        def record_close():
+            flushes_seen.append(buffer.flushes)
+            close_all()
+
+        with mock.patch.object(connections, 'close_all', side_effect=record_close):
+            self.add(buffer, 1)
+            self.assertEqual(self.wait_for(1), 1)
+            deadline = time.monotonic() + 5
+            while not any(flushes_seen) and time.monotonic() < deadline:
+                time.sleep(0.02)
+        # Back to waiting after the flush, with its connection closed
+        self.assertIn(1, flushes_seen)
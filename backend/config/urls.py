@@ -1,16 +1,18 @@
 """
 URL configuration for config project.
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
+
+from config.lazy import lazy_view
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 from auth_app.views import (
     RegisterView, login_view, logout_view,
     request_password_reset, check_reset_status, confirm_password_reset,
     PasswordResetRequestViewSet, AdminActivityLogViewSet,
-    system_status, user_activity_stats
+    system_status, slow_queries, user_activity_stats
 )
 from users.views import UserViewSet
 from tasks.views import TaskViewSet, NotificationViewSet, ProjectViewSet, ActivityLogViewSet
@@ -28,10 +30,6 @@ router.register(r'admin/logs', AdminActivityLogViewSet, basename='admin-log')
 
 urlpatterns = [
     path('django-admin/', admin.site.urls),
-    # API Documentation
-    path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
-    path('api/docs/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
-    path('api/redoc/', SpectacularRedocView.as_view(url_name='schema'), name='redoc'),
     # Authentication Endpoints
     path('api/auth/register/', RegisterView.as_view(), name='register'),
     path('api/auth/login/', login_view, name='login'),
@@ -43,7 +41,26 @@ urlpatterns = [
     path('api/auth/password-reset/confirm/', confirm_password_reset, name='password-reset-confirm'),
     # Admin Monitoring Endpoints
     path('api/admin/system-status/', system_status, name='system-status'),
+    path('api/admin/slow-queries/', slow_queries, name='slow-queries'),
     path('api/admin/user-activity-stats/', user_activity_stats, name='user-activity-stats'),
+    # Async (ASGI) read endpoints, mirroring the sync ones below
+    path('api/async/', include('tasks.async_urls')),
     # Router URLs
     path('api/', include(router.urls)),
 ]
+
+if settings.ENABLE_API_DOCS:
+    # drf_spectacular's schema machinery is only imported when the docs are requested
+    urlpatterns += [
+        path('api/schema/', lazy_view('config.api_docs.SpectacularAPIView'), name='schema'),
+        path(
+            'api/docs/',
+            lazy_view('config.api_docs.SpectacularSwaggerView', url_name='schema'),
+            name='swagger-ui',
+        ),
+        path(
+            'api/redoc/',
+            lazy_view('config.api_docs.SpectacularRedocView', url_name='schema'),
+            name='redoc',
+        ),
+    ]
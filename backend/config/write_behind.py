@@ -0,0 +1,147 @@
+"""
+Write-behind buffer for append-only rows such as audit log entries.
+
+``write_behind.add(AdminActivityLog(...))`` queues an unsaved instance in
+process memory instead of inserting it. A daemon thread inserts queued rows
+with one ``bulk_create`` per model once WRITE_BEHIND_BATCH_SIZE rows are
+waiting or WRITE_BEHIND_FLUSH_INTERVAL seconds after the oldest arrived;
+whatever is left is flushed at exit (atexit, and gunicorn's ``worker_exit``).
+
+Rows added inside a transaction join the queue from ``on_commit``: a
+rolled-back action leaves no entry and nothing becomes visible before the
+data it describes. Instances should set their own timestamps (a default,
+not ``auto_now_add``) so they record when the action happened, not when
+the batch was written.
+
+The cost is durability: a process that is killed outright (SIGKILL, OOM)
+loses up to one interval of entries. WRITE_BEHIND_ENABLED=False inserts
+each row synchronously instead.
+"""
+import atexit
+import logging
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections, connections, router, transaction
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Queue of unsaved instances flushed in bulk by a background thread"""
+
+    def __init__(self, batch_size=100, flush_interval=2.0, enabled=True, name='write_behind'):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.enabled = enabled
+        self.name = name
+        self._pending = []
+        self._oldest = None
+        self._cond = threading.Condition()
+        # Serializes flushes from the thread, exit hooks and callers
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+
+    def add(self, instance):
+        """Insert `instance` soon after the current transaction commits (now if there is none)"""
+        if not self.enabled:
+            instance.save(force_insert=True)
+            return
+        using = router.db_for_write(type(instance))
+        transaction.on_commit(partial(self._append, instance), using=using)
+
+    def _append(self, instance):
+        with self._cond:
+            if not self._pending:
+                self._oldest = time.monotonic()
+            self._pending.append(instance)
+            if self._thread is None or not self._thread.is_alive():
+                # Started lazily, so a forked gunicorn worker gets its own
+                self._thread = threading.Thread(target=self._run, name=f'ttms-{self.name}', daemon=True)
+                self._thread.start()
+            if len(self._pending) >= self.batch_size:
+                self._cond.notify()
+
+    def _wait_for_batch(self):
+        with self._cond:
+            if not self._pending:
+                # An idle thread should not pin a database connection
+                connections.close_all()
+            while not self._pending:
+                self._cond.wait()
+            while len(self._pending) < self.batch_size:
+                remaining = self._oldest + self.flush_interval - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+    def _run(self):
+        while True:
+            self._wait_for_batch()
+            close_old_connections()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('%s flush failed', self.name)
+
+    def flush(self):
+        """Insert every queued row now; returns the number written"""
+        with self._flush_lock:
+            with self._cond:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+            by_model = {}
+            for instance in batch:
+                by_model.setdefault(type(instance), []).append(instance)
+            written = 0
+            for model, rows in by_model.items():
+                written += self._insert(model, rows)
+            self.written += written
+            self.flushes += 1
+            return written
+
+    def _insert(self, model, rows):
+        using = router.db_for_write(model)
+        try:
+            with transaction.atomic(using=using):
+                model.objects.bulk_create(rows, batch_size=self.batch_size)
+            return len(rows)
+        except Exception:
+            logger.exception('%s: bulk insert of %s %s rows failed; retrying one by one',
+                             self.name, len(rows), model.__name__)
+        # One bad row should not cost the whole batch
+        written = 0
+        for row in rows:
+            try:
+                with transaction.atomic(using=using):
+                    row.save(force_insert=True)
+                written += 1
+            except Exception:
+                self.failed += 1
+                logger.exception('%s: dropped %s row %s', self.name, model.__name__, row.pk)
+        return written
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'enabled': self.enabled,
+            'pending': pending,
+            'written': self.written,
+            'flushes': self.flushes,
+            'failed': self.failed,
+        }
+
+
+write_behind = WriteBehindBuffer(
+    batch_size=getattr(settings, 'WRITE_BEHIND_BATCH_SIZE', 100),
+    flush_interval=getattr(settings, 'WRITE_BEHIND_FLUSH_INTERVAL', 2.0),
+    enabled=getattr(settings, 'WRITE_BEHIND_ENABLED', True),
+)
+atexit.register(write_behind.flush)
@@ -5,12 +5,16 @@ It exposes the WSGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/wsgi/
+
+Static files are answered by WhiteNoise around Django (see config.static).
 """
 
 import os
 
 from django.core.wsgi import get_wsgi_application
 
+from config.static import StaticFiles
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_wsgi_application()
+application = StaticFiles(get_wsgi_application())
@@ -1,15 +1,48 @@
 # Gunicorn configuration file
+#
+# Worker model, counts and recycling are environment-driven:
+#   GUNICORN_WORKER_CLASS  sync | gthread | uvicorn (ASGI, serves config.asgi)
+#   GUNICORN_WORKERS       0 derives from the CPU count (see config.server)
+#   GUNICORN_MAX_WORKERS   cap for the derived count
+#   GUNICORN_THREADS       threads per gthread worker
+#   GUNICORN_MAX_RSS_MB    recycle a worker once its RSS crosses this (0 disables)
 import multiprocessing
+import os
+import sys
+
+from decouple import config as env
+
+# Make the project importable before gunicorn chdirs into it
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config.server import (  # noqa: E402
+    RSSWatchdog,
+    close_connections,
+    close_inherited_connections,
+    worker_settings,
+)
 
 # Server socket
-# Server socket
-bind = "0.0.0.0:10000"  # Render expects port 10000 by default or $PORT
+bind = f"0.0.0.0:{env('PORT', default='10000')}"  # Render expects port 10000 by default or $PORT
 
 # Worker processes
-workers = 4  # Default to a safe number or use multiprocessing logic safely
+_workers = worker_settings(
+    env('GUNICORN_WORKER_CLASS', default='sync'),
+    multiprocessing.cpu_count(),
+    workers=env('GUNICORN_WORKERS', default=0, cast=int),
+    threads=env('GUNICORN_THREADS', default=0, cast=int),
+    max_workers=env('GUNICORN_MAX_WORKERS', default=4, cast=int),
+)
+worker_class = _workers['worker_class']
+wsgi_app = _workers['wsgi_app']
+workers = _workers['workers']
+threads = _workers['threads']
+
+# Load Django once in the master and fork workers from it
+preload_app = env('GUNICORN_PRELOAD', default=True, cast=bool)
 
 # Logging - Render captures stdout/stderr automatically
-accesslog = "-" 
+accesslog = "-"
 errorlog = "-"
 loglevel = "info"
 
@@ -25,9 +58,12 @@ tmp_upload_dir = None
 # keyfile = "/path/to/keyfile"
 # certfile = "/path/to/certfile"
 
-# Max requests
-max_requests = 1000
-max_requests_jitter = 100
+# Worker recycling is driven by memory (GUNICORN_MAX_RSS_MB) rather than a
+# fixed request count; set GUNICORN_MAX_REQUESTS to re-enable the latter
+max_requests = env('GUNICORN_MAX_REQUESTS', default=0, cast=int)
+max_requests_jitter = env('GUNICORN_MAX_REQUESTS_JITTER', default=100, cast=int)
+_max_rss_mb = env('GUNICORN_MAX_RSS_MB', default=400, cast=int)
+_rss_check_interval = env('GUNICORN_RSS_CHECK_INTERVAL', default=10, cast=float)
 
 # Graceful timeout
 graceful_timeout = 30
@@ -36,3 +72,47 @@ graceful_timeout = 30
 raw_env = [
     'DJANGO_SETTINGS_MODULE=config.settings'
 ]
+
+
+def _warm_up():
+    from config.warmup import warm_up
+
+    warm_up()
+
+
+def when_ready(server):
+    # Runs in the master after the app is preloaded and before any fork
+    if preload_app:
+        _warm_up()
+        close_connections()
+
+
+def post_fork(server, worker):
+    close_inherited_connections()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        _warm_up()
+    if _max_rss_mb > 0:
+        worker.rss_watchdog = RSSWatchdog(_max_rss_mb * 2**20, interval=_rss_check_interval)
+        worker.rss_watchdog.start()
+    from django.conf import settings
+
+    if settings.SCHEDULER_IN_PROCESS:
+        # Every worker runs one; the lease row picks the leader
+        from jobs.scheduler import Scheduler
+
+        worker.scheduler = Scheduler().start()
+
+
+def worker_exit(server, worker):
+    watchdog = getattr(worker, 'rss_watchdog', None)
+    if watchdog is not None:
+        watchdog.stop()
+    scheduler = getattr(worker, 'scheduler', None)
+    if scheduler is not None:
+        scheduler.shutdown()
+    from config.write_behind import write_behind
+
+    write_behind.flush()
@@ -0,0 +1,23 @@
+from django.contrib import admin
+from .models import Job, ScheduledRun, SchedulerLease
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'name', 'queue', 'status', 'attempts', 'run_at', 'locked_by', 'finished_at']
+    list_filter = ['status', 'queue', 'name']
+    search_fields = ['name', 'last_error']
+    readonly_fields = ['created_at', 'finished_at']
+    ordering = ['-created_at']
+
+
+@admin.register(ScheduledRun)
+class ScheduledRunAdmin(admin.ModelAdmin):
+    list_display = ['name', 'scheduled_for', 'status', 'duration', 'lag', 'overran', 'runner']
+    list_filter = ['status', 'overran', 'name']
+    search_fields = ['name', 'error']
+
+
+@admin.register(SchedulerLease)
+class SchedulerLeaseAdmin(admin.ModelAdmin):
+    list_display = ['name', 'holder', 'acquired_at', 'renewed_at', 'expires_at']
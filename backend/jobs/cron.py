@@ -0,0 +1,118 @@
+"""
+Five-field cron expressions (minute hour day-of-month month day-of-week).
+
+Fields accept ``*``, numbers, ranges (``1-5``), steps (``*/15``, ``0-30/10``)
+and comma-separated lists; ``@hourly``, ``@daily``, ``@weekly`` and
+``@monthly`` are shorthands. Day of week is 0-6 from Sunday (7 is also
+Sunday). As in cron, when both day fields are restricted a day matches if
+either does. Times are evaluated in the project's TIME_ZONE.
+"""
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+# (name, lowest, highest)
+FIELDS = (
+    ('minute', 0, 59),
+    ('hour', 0, 23),
+    ('day of month', 1, 31),
+    ('month', 1, 12),
+    ('day of week', 0, 7),
+)
+# Give up instead of looping forever on e.g. "0 0 31 2 *"
+MAX_DAYS_AHEAD = 366 * 5
+
+
+class CronError(ValueError):
+    pass
+
+
+def _parse_field(text, name, low, high):
+    values = set()
+    for part in text.split(','):
+        expr, _, step = part.partition('/')
+        try:
+            step = int(step) if step else 1
+            if expr == '*':
+                start, end = low, high
+            elif '-' in expr:
+                start, end = (int(bound) for bound in expr.split('-', 1))
+            else:
+                start = end = int(expr)
+                if step != 1:
+                    end = high
+        except ValueError:
+            raise CronError(f'Invalid {name} field {text!r}')
+        if step <= 0 or not low <= start <= end <= high:
+            raise CronError(f'{name.capitalize()} field {text!r} is out of range {low}-{high}')
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronSchedule:
+    """A parsed cron expression; `next_after` finds the next matching minute"""
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        fields = ALIASES.get(self.expression, self.expression).split()
+        if len(fields) != 5:
+            raise CronError(f'Cron expression {expression!r} needs 5 fields')
+        parsed = [_parse_field(text, *spec) for text, spec in zip(fields, FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = frozenset(day % 7 for day in weekdays)
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def __repr__(self):
+        return f'CronSchedule({self.expression!r})'
+
+    def __eq__(self, other):
+        return isinstance(other, CronSchedule) and self.expression == other.expression
+
+    def __hash__(self):
+        return hash(self.expression)
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        in_month = day.day in self.days
+        # Python: Monday is 0; cron: Sunday is 0
+        in_week = (day.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return in_month and in_week
+        return in_month or in_week
+
+    def next_after(self, moment):
+        """First matching minute strictly after the aware datetime `moment`"""
+        tz = timezone.get_current_timezone()
+        local = timezone.localtime(moment, tz).replace(tzinfo=None, second=0, microsecond=0)
+        candidate = local + timedelta(minutes=1)
+        limit = candidate + timedelta(days=MAX_DAYS_AHEAD)
+        while candidate < limit:
+            if not self._day_matches(candidate):
+                candidate = datetime.combine(candidate.date() + timedelta(days=1), time())
+                continue
+            if candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return timezone.make_aware(candidate, tz)
+        raise CronError(f'Cron expression {self.expression!r} never matches')
+
+    def latest_between(self, start, end):
+        """Last matching minute in (start, end], or None"""
+        latest = None
+        moment = self.next_after(start)
+        while moment <= end:
+            latest = moment
+            moment = self.next_after(moment)
+        return latest
@@ -0,0 +1,37 @@
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.scheduler import Scheduler, periodic_tasks
+
+
+class Command(BaseCommand):
+    help = 'Run periodic housekeeping tasks; safe to start on several nodes, one leader runs them'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tick', type=float, default=settings.SCHEDULER_TICK_SECONDS)
+        parser.add_argument('--lease', type=int, default=settings.SCHEDULER_LEASE_SECONDS)
+        parser.add_argument('--once', action='store_true', help='Run one tick and exit')
+        parser.add_argument('--list', action='store_true', help='List registered tasks and exit')
+
+    def handle(self, *args, **options):
+        if options['list']:
+            for task in periodic_tasks():
+                self.stdout.write(f'{task.name:40} {task.schedule.expression}')
+            return
+
+        scheduler = Scheduler(lease_seconds=options['lease'], tick_seconds=options['tick'])
+        if not options['once']:
+            self.stdout.write(f'Scheduler {scheduler.holder} ticking every {scheduler.tick_seconds}s')
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, lambda *_: scheduler.stop.set())
+            scheduler.run()
+            return
+
+        runs = scheduler.tick()
+        if not scheduler.is_leader:
+            self.stdout.write('Another scheduler holds the lease.')
+        for run in runs:
+            self.stdout.write(f'{run.name}: {run.status} in {run.duration:.2f}s')
+        self.stdout.write(self.style.SUCCESS(f'Ran {len(runs)} periodic tasks.'))
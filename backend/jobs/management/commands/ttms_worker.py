@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.worker import run_workers
+
+
+class Command(BaseCommand):
+    help = 'Run background job workers (threads) that claim and execute queued jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=settings.JOBS_WORKER_CONCURRENCY)
+        parser.add_argument('--queue', action='append', dest='queues', help='Queue to consume (repeatable)')
+        parser.add_argument('--batch-size', type=int, default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument('--poll-interval', type=float, default=settings.JOBS_POLL_INTERVAL)
+        parser.add_argument('--visibility-timeout', type=int, default=settings.JOBS_VISIBILITY_TIMEOUT)
+        parser.add_argument('--once', action='store_true', help='Run one batch per worker and exit')
+
+    def handle(self, *args, **options):
+        queues = options['queues'] or ['default']
+        self.stdout.write(
+            f"Starting {options['concurrency']} workers on {', '.join(queues)}"
+        )
+        processed = run_workers(
+            concurrency=options['concurrency'],
+            queues=queues,
+            once=options['once'],
+            batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'],
+            visibility_timeout=options['visibility_timeout'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} jobs.'))
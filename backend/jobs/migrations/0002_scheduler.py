@@ -0,0 +1,44 @@
+# Generated by Django 5.1.2 on 2026-10-19 01:48
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerLease',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('holder', models.CharField(blank=True, max_length=100)),
+                ('acquired_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('renewed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ScheduledRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('scheduled_for', models.DateTimeField()),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('duration', models.FloatField(blank=True, null=True)),
+                ('lag', models.FloatField(default=0)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='running', max_length=10)),
+                ('overran', models.BooleanField(default=False)),
+                ('runner', models.CharField(blank=True, max_length=100)),
+                ('error', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-scheduled_for', 'name'],
+                'constraints': [models.UniqueConstraint(fields=('name', 'scheduled_for'), name='unique_scheduled_run')],
+            },
+        ),
+    ]
@@ -0,0 +1,83 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """A unit of background work claimed by `ttms_worker` processes"""
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=100)
+    queue = models.CharField(max_length=50, default='default')
+    payload = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED)
+    # Not eligible before run_at (delayed jobs and retry backoff)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # Claim: a running job whose locked_until has passed is claimable again
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            models.Index(fields=['queue', 'status', 'run_at'], name='jobs_claim_idx'),
+            models.Index(fields=['status', 'locked_until'], name='jobs_expired_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+
+class SchedulerLease(models.Model):
+    """Lock row for scheduler leader election: the holder runs periodic tasks until expires_at"""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    holder = models.CharField(max_length=100, blank=True)
+    acquired_at = models.DateTimeField(default=timezone.now)
+    renewed_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.name}: {self.holder or 'vacant'} until {self.expires_at}"
+
+
+class ScheduledRun(models.Model):
+    """One run of a periodic task, keyed by the cron slot it ran for"""
+
+    class Status(models.TextChoices):
+        RUNNING = 'running', 'Running'
+        DONE = 'done', 'Done'
+        FAILED = 'failed', 'Failed'
+
+    name = models.CharField(max_length=100)
+    scheduled_for = models.DateTimeField()
+    started_at = models.DateTimeField(default=timezone.now)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Seconds the task ran for, and how late it started after its slot
+    duration = models.FloatField(null=True, blank=True)
+    lag = models.FloatField(default=0)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.RUNNING)
+    # Still running when its next slot came due
+    overran = models.BooleanField(default=False)
+    runner = models.CharField(max_length=100, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['-scheduled_for', 'name']
+        constraints = [
+            # A slot runs once, even if two leaders briefly overlap
+            models.UniqueConstraint(fields=['name', 'scheduled_for'], name='unique_scheduled_run'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} @ {self.scheduled_for} ({self.status})"
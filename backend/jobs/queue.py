@@ -0,0 +1,194 @@
+"""
+Database-backed job queue.
+
+Handlers are plain functions registered with `@job` (conventionally in an
+app's ``jobs.py``, which is autodiscovered) and take JSON-serializable
+keyword arguments::
+
+    @job('tasks.create_notification')
+    def create_notification(user_id, message):
+        ...
+
+    create_notification.enqueue(user_id=user.pk, message='Hi')
+
+`enqueue` inserts a `Job` row, inside the caller's transaction, so work
+queued by a request that rolls back never runs. With JOBS_EAGER (the
+default) the handler runs inline instead, exactly as the code it replaced,
+unless it was registered with ``eager=False``: such jobs are always queued.
+
+Workers claim due rows in batches. On PostgreSQL a claim is one
+``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent workers never wait on
+each other; elsewhere (SQLite) each candidate is claimed with a
+compare-and-swap UPDATE and lost races are skipped. A claim holds a job for
+JOBS_VISIBILITY_TIMEOUT seconds: a worker that dies mid-job leaves it
+claimable again once that passes, unless that was its last attempt, in
+which case it is marked failed. Failures are retried with exponential
+backoff until `max_attempts`, then marked failed with the last traceback.
+"""
+import json
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, router, transaction
+from django.db.models import Count, F, Min, Q
+from django.utils import timezone
+
+from .models import Job
+
+_registry = {}
+
+
+class UnknownJob(LookupError):
+    pass
+
+
+def job(name, queue='default', max_attempts=None, eager=True):
+    """
+    Register `func` as the handler for `name` and give it an `enqueue` method;
+    with `eager=False` it is queued even under JOBS_EAGER
+    """
+    def decorator(func):
+        if name in _registry and _registry[name] is not func:
+            raise ValueError(f'Job {name!r} is already registered')
+        _registry[name] = func
+
+        def enqueue_func(run_at=None, **kwargs):
+            return enqueue(name, kwargs, queue=queue, run_at=run_at, max_attempts=max_attempts, eager=eager)
+
+        func.job_name = name
+        func.enqueue = enqueue_func
+        return func
+    return decorator
+
+
+def get_handler(name):
+    try:
+        return _registry[name]
+    except KeyError:
+        raise UnknownJob(f'No handler registered for job {name!r}')
+
+
+def registered_jobs():
+    return dict(_registry)
+
+
+def _roundtrip(kwargs):
+    # What a worker would see: forces payloads to be JSON-serializable
+    return json.loads(json.dumps(kwargs, cls=DjangoJSONEncoder))
+
+
+def enqueue(name, kwargs=None, queue='default', run_at=None, max_attempts=None, eager=True):
+    """Queue `name` with `kwargs`; returns the Job, or None when run eagerly"""
+    handler = get_handler(name)
+    payload = _roundtrip(kwargs or {})
+    if eager and settings.JOBS_EAGER and run_at is None:
+        handler(**payload)
+        return None
+    return Job.objects.create(
+        name=name,
+        queue=queue,
+        payload=payload,
+        run_at=run_at or timezone.now(),
+        max_attempts=max_attempts or settings.JOBS_MAX_ATTEMPTS,
+    )
+
+
+def _claimable(queues, now):
+    due = Q(status=Job.Status.QUEUED, run_at__lte=now)
+    # A claim that expired on its last attempt is failed by claim(), not retried
+    expired = Q(status=Job.Status.RUNNING, locked_until__lt=now, attempts__lt=F('max_attempts'))
+    return Job.objects.filter(due | expired, queue__in=queues).order_by('run_at', 'id')
+
+
+def _fail_abandoned(queues, now):
+    """Fail jobs whose worker died or timed out on their last attempt"""
+    abandoned = Q(status=Job.Status.RUNNING, locked_until__lt=now, attempts__gte=F('max_attempts'))
+    return Job.objects.filter(abandoned, queue__in=queues).update(
+        status=Job.Status.FAILED,
+        locked_until=None,
+        last_error='Claim expired on the last attempt (worker died or timed out)',
+        finished_at=now,
+    )
+
+
+def claim(worker_id, queues=('default',), limit=1, visibility_timeout=None, now=None):
+    """Claim up to `limit` due jobs for `worker_id` and return them"""
+    now = now or timezone.now()
+    visibility_timeout = visibility_timeout or settings.JOBS_VISIBILITY_TIMEOUT
+    locked_until = now + timedelta(seconds=visibility_timeout)
+    claim_fields = {
+        'status': Job.Status.RUNNING,
+        'locked_by': worker_id,
+        'locked_until': locked_until,
+        'attempts': F('attempts') + 1,
+    }
+    connection = connections[router.db_for_write(Job)]
+    _fail_abandoned(queues, now)
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic(using=connection.alias):
+            ids = list(
+                _claimable(queues, now).select_for_update(skip_locked=True).values_list('id', flat=True)[:limit]
+            )
+            if ids:
+                Job.objects.filter(id__in=ids).update(**claim_fields)
+    else:
+        ids = []
+        for candidate in _claimable(queues, now).values('id', 'status', 'locked_until')[:limit]:
+            # Compare-and-swap: only one worker sees the row unchanged
+            won = Job.objects.filter(
+                id=candidate['id'], status=candidate['status'], locked_until=candidate['locked_until']
+            ).update(**claim_fields)
+            if won:
+                ids.append(candidate['id'])
+    return list(Job.objects.filter(id__in=ids, locked_by=worker_id).order_by('run_at', 'id'))
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number `attempts` (1-based), with jitter"""
+    delay = min(settings.JOBS_BACKOFF_BASE * 2 ** (attempts - 1), settings.JOBS_BACKOFF_MAX)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _owned(claimed):
+    # A job that outlived its visibility timeout may have been claimed again
+    return Job.objects.filter(pk=claimed.pk, locked_by=claimed.locked_by, status=Job.Status.RUNNING)
+
+
+def run(claimed):
+    """Run a claimed job and record the outcome; returns the new status"""
+    try:
+        get_handler(claimed.name)(**claimed.payload)
+    except Exception:
+        error = traceback.format_exc()
+        now = timezone.now()
+        if claimed.attempts < claimed.max_attempts:
+            _owned(claimed).update(
+                status=Job.Status.QUEUED,
+                run_at=now + timedelta(seconds=backoff(claimed.attempts)),
+                locked_by='',
+                locked_until=None,
+                last_error=error,
+            )
+            return Job.Status.QUEUED
+        _owned(claimed).update(
+            status=Job.Status.FAILED, locked_until=None, last_error=error, finished_at=now
+        )
+        return Job.Status.FAILED
+    _owned(claimed).update(status=Job.Status.DONE, locked_until=None, finished_at=timezone.now())
+    return Job.Status.DONE
+
+
+def queue_stats():
+    """Job counts per status, plus the age of the oldest due job in seconds"""
+    counts = dict(Job.objects.values_list('status').annotate(n=Count('id')).values_list('status', 'n'))
+    oldest = Job.objects.filter(status=Job.Status.QUEUED, run_at__lte=timezone.now()).aggregate(
+        oldest=Min('run_at')
+    )['oldest']
+    return {
+        **{status: counts.get(status, 0) for status in Job.Status.values},
+        'oldest_due_seconds': round((timezone.now() - oldest).total_seconds(), 1) if oldest else 0,
+    }
@@ -0,0 +1,288 @@
+"""
+Periodic task scheduler with single-leader election.
+
+Housekeeping functions are registered with `@periodic` and a cron
+expression, conventionally next to the app's job handlers in ``jobs.py``::
+
+    @periodic('auth_app.expire_password_resets', '*/15 * * * *')
+    def expire_password_resets():
+        ...
+
+A `Scheduler` can run in every gunicorn worker (SCHEDULER_IN_PROCESS) or
+in a `manage.py ttms_scheduler` process, on any number of nodes: each tick
+it renews or takes over the `SchedulerLease` lock row with one conditional
+UPDATE, and only the holder runs tasks. A leader that stops renewing (it
+crashed, or lost the database) is replaced once SCHEDULER_LEASE_SECONDS
+pass; the lease is renewed while a long task runs.
+
+Every run is recorded as a `ScheduledRun` keyed by its cron slot. That
+row is inserted before the task starts and is unique per (task, slot), so
+a slot runs at most once even across a leadership change, and the newest
+row tells a new leader where the schedule stands. After downtime only the
+latest missed slot runs. Duration, start lag and overruns (still running
+when the next slot came due) are stored on the row and logged.
+"""
+import logging
+import os
+import socket
+import threading
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, connections, transaction
+from django.db.models import Case, Count, F, Max, Q, Value, When
+from django.utils import timezone
+
+from .cron import CronSchedule
+from .models import ScheduledRun, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+LEASE = 'scheduler'
+# A task that has never run starts with the slot that just passed
+FIRST_RUN_LOOKBACK = timedelta(minutes=1)
+
+_registry = {}
+
+
+@dataclass(frozen=True)
+class PeriodicTask:
+    name: str
+    schedule: CronSchedule
+    func: object
+
+    def __call__(self):
+        return self.func()
+
+
+def periodic(name, cron):
+    """Run the decorated function on the `cron` schedule from the scheduler leader"""
+    schedule = CronSchedule(cron)
+
+    def decorator(func):
+        if name in _registry and _registry[name].func is not func:
+            raise ValueError(f'Periodic task {name!r} is already registered')
+        _registry[name] = PeriodicTask(name, schedule, func)
+        func.periodic_name = name
+        return func
+    return decorator
+
+
+def periodic_tasks():
+    """Registered tasks, minus SCHEDULER_DISABLED"""
+    disabled = set(settings.SCHEDULER_DISABLED)
+    return [task for name, task in sorted(_registry.items()) if name not in disabled]
+
+
+def acquire_lease(holder, ttl=None, name=LEASE, now=None):
+    """Take or renew the lease for `holder`; True while `holder` is the leader"""
+    now = now or timezone.now()
+    ttl = ttl or settings.SCHEDULER_LEASE_SECONDS
+    SchedulerLease.objects.bulk_create(
+        [SchedulerLease(name=name, holder='', expires_at=now)], ignore_conflicts=True
+    )
+    # Compare-and-swap: our own lease, or one nobody renewed in time
+    return bool(SchedulerLease.objects.filter(Q(holder=holder) | Q(expires_at__lte=now), name=name).update(
+        holder=holder,
+        acquired_at=Case(When(holder=holder, then=F('acquired_at')), default=Value(now)),
+        renewed_at=now,
+        expires_at=now + timedelta(seconds=ttl),
+    ))
+
+
+def release_lease(holder, name=LEASE):
+    """Give the lease up so another scheduler takes over on its next tick"""
+    SchedulerLease.objects.filter(name=name, holder=holder).update(holder='', expires_at=timezone.now())
+
+
+def due_slots(tasks, now):
+    """[(task, slot)] for tasks whose latest cron slot up to `now` has not run yet"""
+    last_runs = dict(
+        ScheduledRun.objects.filter(name__in=[task.name for task in tasks])
+        .values('name').annotate(last=Max('scheduled_for')).values_list('name', 'last')
+    )
+    due = []
+    for task in tasks:
+        since = last_runs.get(task.name) or now - FIRST_RUN_LOOKBACK
+        slot = task.schedule.latest_between(since, now)
+        if slot is not None:
+            due.append((task, slot))
+    return due
+
+
+def run_task(task, slot, runner=''):
+    """Run `task` for `slot` and record it; None if the slot was already taken"""
+    started = timezone.now()
+    try:
+        with transaction.atomic():
+            record = ScheduledRun.objects.create(
+                name=task.name,
+                scheduled_for=slot,
+                started_at=started,
+                lag=max((started - slot).total_seconds(), 0),
+                runner=runner,
+            )
+    except IntegrityError:
+        return None
+
+    try:
+        task()
+    except Exception:
+        record.status = ScheduledRun.Status.FAILED
+        record.error = traceback.format_exc()
+    else:
+        record.status = ScheduledRun.Status.DONE
+    record.finished_at = timezone.now()
+    record.duration = (record.finished_at - started).total_seconds()
+    record.overran = record.finished_at > task.schedule.next_after(slot)
+    record.save(update_fields=['status', 'error', 'finished_at', 'duration', 'overran'])
+
+    if record.status == ScheduledRun.Status.FAILED:
+        logger.error('Periodic task %s (%s) failed:\n%s', task.name, slot, record.error)
+    elif record.overran:
+        logger.warning('Periodic task %s (%s) overran: %.1fs', task.name, slot, record.duration)
+    else:
+        logger.info('Periodic task %s (%s) done in %.2fs', task.name, slot, record.duration)
+    return record
+
+
+class _LeaseHeartbeat(threading.Thread):
+    """Renews the lease while a task runs longer than a third of it"""
+
+    def __init__(self, holder, ttl):
+        super().__init__(name='ttms-scheduler-heartbeat', daemon=True)
+        self.holder = holder
+        self.ttl = ttl
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            while not self.done.wait(self.ttl / 3):
+                if not acquire_lease(self.holder, self.ttl):
+                    logger.warning('Scheduler %s lost its lease during a task', self.holder)
+        finally:
+            connections.close_all()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.done.set()
+        self.join()
+
+
+class Scheduler:
+    """Ticks every SCHEDULER_TICK_SECONDS; only the lease holder runs tasks"""
+
+    def __init__(self, holder=None, lease_seconds=None, tick_seconds=None, stop=None, tasks=None):
+        self.holder = holder or f'{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}'
+        self.lease_seconds = lease_seconds or settings.SCHEDULER_LEASE_SECONDS
+        self.tick_seconds = tick_seconds or settings.SCHEDULER_TICK_SECONDS
+        self.stop = stop or threading.Event()
+        # Defaults to every registered task, looked up on each tick
+        self.tasks = tasks
+        self.is_leader = False
+        self.thread = None
+
+    def tick(self, now=None):
+        """Take or keep the lease and, as leader, run every due task; returns the runs"""
+        now = now or timezone.now()
+        leader = acquire_lease(self.holder, self.lease_seconds, now=now)
+        if leader != self.is_leader:
+            logger.info('Scheduler %s %s the lease', self.holder, 'acquired' if leader else 'lost')
+            self.is_leader = leader
+        if not leader:
+            return []
+
+        runs = []
+        for task, slot in due_slots(self.tasks if self.tasks is not None else periodic_tasks(), now):
+            if self.stop.is_set():
+                break
+            with _LeaseHeartbeat(self.holder, self.lease_seconds):
+                record = run_task(task, slot, self.holder)
+            if record is not None:
+                runs.append(record)
+        return runs
+
+    def run(self):
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                try:
+                    self.tick()
+                except Exception:
+                    logger.exception('Scheduler %s tick failed', self.holder)
+                self.stop.wait(self.tick_seconds)
+        finally:
+            if self.is_leader:
+                try:
+                    release_lease(self.holder)
+                except Exception:
+                    logger.exception('Scheduler %s could not release its lease', self.holder)
+            connections.close_all()
+
+    def start(self):
+        """Run in a daemon thread (for SCHEDULER_IN_PROCESS)"""
+        self.thread = threading.Thread(target=self.run, name='ttms-scheduler', daemon=True)
+        self.thread.start()
+        return self
+
+    def shutdown(self, timeout=10):
+        self.stop.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
+
+
+def scheduler_status(now=None):
+    """Leader, per-task last run and next slot, and 24h failure/overrun counts"""
+    now = now or timezone.now()
+    lease = SchedulerLease.objects.filter(name=LEASE).first()
+    tasks = periodic_tasks()
+    last_runs = {
+        run.name: run
+        for run in ScheduledRun.objects.filter(
+            id__in=ScheduledRun.objects.filter(name__in=[task.name for task in tasks])
+            .values('name').annotate(latest=Max('id')).values('latest')
+        )
+    }
+    recent = ScheduledRun.objects.filter(started_at__gte=now - timedelta(hours=24)).aggregate(
+        runs=Count('id'),
+        failed=Count('id', filter=Q(status=ScheduledRun.Status.FAILED)),
+        overran=Count('id', filter=Q(overran=True)),
+    )
+    return {
+        'leader': lease.holder if lease and lease.holder and lease.expires_at > now else None,
+        'lease_expires_at': lease.expires_at if lease else None,
+        'runs_24h': recent,
+        'tasks': {
+            task.name: {
+                'schedule': task.schedule.expression,
+                'next_run': task.schedule.next_after(now),
+                'last_run': _describe_run(last_runs.get(task.name)),
+            }
+            for task in tasks
+        },
+    }
+
+
+def _describe_run(run):
+    if run is None:
+        return None
+    return {
+        'scheduled_for': run.scheduled_for,
+        'status': run.status,
+        'duration': run.duration,
+        'lag': run.lag,
+        'overran': run.overran,
+    }
+
+
+@periodic('jobs.prune_scheduler_history', '@daily')
+def prune_scheduler_history():
+    """Drop ScheduledRun rows older than SCHEDULER_HISTORY_DAYS (keeping each task's latest)"""
+    cutoff = timezone.now() - timedelta(days=settings.SCHEDULER_HISTORY_DAYS)
+    latest = ScheduledRun.objects.values('name').annotate(latest=Max('id')).values('latest')
+    return ScheduledRun.objects.filter(scheduled_for__lt=cutoff).exclude(id__in=latest).delete()[0]
@@ -0,0 +1,338 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from auth_app.jobs import expire_password_resets
+from auth_app.models import PasswordResetRequest
+from tasks.models import Notification
+from users.models import User
+from .cron import CronError, CronSchedule
+from .models import Job, ScheduledRun, SchedulerLease
+from .queue import claim, enqueue, job, queue_stats, run
+from .scheduler import PeriodicTask, Scheduler, acquire_lease, periodic_tasks, release_lease, scheduler_status
+from .worker import run_workers
+
+calls = []
+
+
+@job('tests.record')
+def record(value):
+    calls.append(value)
+
+
+@job('tests.deferred', eager=False)
+def deferred(value):
+    calls.append(value)
+
+
+@job('tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('boom')
+
+
+@override_settings(JOBS_EAGER=False)
+class JobQueueTest(TestCase):
+    """Test cases for enqueueing, claiming and running jobs"""
+
+    def setUp(self):
+        calls.clear()
+
+    @override_settings(JOBS_EAGER=True)
+    def test_eager_runs_inline(self):
+        self.assertIsNone(record.enqueue(value=1))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(JOBS_EAGER=True)
+    def test_never_eager_job_is_queued(self):
+        queued = deferred.enqueue(value=1)
+        self.assertEqual(calls, [])
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+
+    def test_payload_must_be_json(self):
+        with self.assertRaises(TypeError):
+            record.enqueue(value=object())
+
+    def test_enqueue_claim_run(self):
+        queued = record.enqueue(value=uuid.UUID(int=7))
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+
+        claimed = claim('w1', limit=5)
+        self.assertEqual([j.pk for j in claimed], [queued.pk])
+        self.assertEqual(claimed[0].attempts, 1)
+        self.assertEqual(claim('w2', limit=5), [])
+
+        self.assertEqual(run(claimed[0]), Job.Status.DONE)
+        self.assertEqual(calls, [str(uuid.UUID(int=7))])
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.DONE)
+        self.assertIsNotNone(queued.finished_at)
+
+    def test_rolled_back_enqueue_never_runs(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            record.enqueue(value=1)
+            raise ValueError
+        self.assertFalse(Job.objects.exists())
+
+    def test_delayed_jobs_wait(self):
+        enqueue('tests.record', {'value': 1}, run_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual(claim('w1'), [])
+        self.assertEqual(len(claim('w1', now=timezone.now() + timedelta(minutes=6))), 1)
+
+    def test_failures_back_off_then_fail(self):
+        queued = explode.enqueue()
+        self.assertEqual(run(claim('w1')[0]), Job.Status.QUEUED)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.QUEUED)
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertIn('RuntimeError: boom', queued.last_error)
+        self.assertEqual(claim('w1'), [])
+
+        retry = claim('w1', now=queued.run_at)[0]
+        self.assertEqual(retry.attempts, 2)
+        self.assertEqual(run(retry), Job.Status.FAILED)
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.FAILED)
+
+    def test_expired_claim_is_reclaimed(self):
+        record.enqueue(value=1)
+        stale = claim('w1', visibility_timeout=30)[0]
+        later = timezone.now() + timedelta(seconds=31)
+        fresh = claim('w2', visibility_timeout=30, now=later)[0]
+        self.assertEqual(fresh.pk, stale.pk)
+        self.assertEqual(fresh.attempts, 2)
+
+        # The first worker finishing late does not overwrite the new claim
+        run(stale)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, Job.Status.RUNNING)
+        self.assertEqual(fresh.locked_by, 'w2')
+
+    def test_expired_last_attempt_fails(self):
+        queued = explode.enqueue()
+        later = timezone.now()
+        for _ in range(queued.max_attempts):
+            # The worker dies every time, so run() never records an outcome
+            self.assertEqual([j.pk for j in claim('w1', visibility_timeout=30, now=later)], [queued.pk])
+            later += timedelta(seconds=31)
+        self.assertEqual(claim('w2', visibility_timeout=30, now=later), [])
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, Job.Status.FAILED)
+        self.assertEqual(queued.attempts, queued.max_attempts)
+        self.assertIn('last attempt', queued.last_error)
+
+    def test_claims_are_disjoint(self):
+        for value in range(6):
+            record.enqueue(value=value)
+        first = {j.pk for j in claim('w1', limit=4)}
+        second = {j.pk for j in claim('w2', limit=4)}
+        self.assertEqual(len(first), 4)
+        self.assertEqual(len(second), 2)
+        self.assertFalse(first & second)
+
+    def test_queues_are_separate(self):
+        enqueue('tests.record', {'value': 1}, queue='mail')
+        self.assertEqual(claim('w1'), [])
+        self.assertEqual(len(claim('w1', queues=['mail'])), 1)
+
+    def test_stats(self):
+        record.enqueue(value=1)
+        record.enqueue(value=2)
+        run(claim('w1')[0])
+        stats = queue_stats()
+        self.assertEqual((stats['queued'], stats['done']), (1, 1))
+
+    def test_task_views_enqueue_notifications(self):
+        suffix = uuid.uuid4().hex[:8]
+        manager = User.objects.create_user(
+            username=f'jobs_{suffix}', email=f'jobs_{suffix}@example.com',
+            password='testpass123', role=User.Role.MANAGER,
+        )
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(manager).access_token}')
+        response = client.post('/api/tasks/', {'title': 'Queued', 'assignee': str(manager.pk)}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse(Notification.objects.exists())
+
+        self.assertEqual(Job.objects.get().name, 'tasks.create_notification')
+        run(claim('w1')[0])
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, manager)
+        self.assertEqual(notification.task.title, 'Queued')
+
+
+@override_settings(JOBS_EAGER=False)
+class WorkerTest(TransactionTestCase):
+    """Workers in threads share the queue without running a job twice"""
+
+    def setUp(self):
+        calls.clear()
+
+    def test_workers_run_every_job_once(self):
+        for value in range(12):
+            record.enqueue(value=value)
+        processed = 0
+        # A worker that loses a claim race comes back with a smaller batch
+        while Job.objects.exclude(status=Job.Status.DONE).exists():
+            processed += run_workers(concurrency=3, once=True, batch_size=4)
+        self.assertEqual(processed, 12)
+        self.assertEqual(sorted(calls), list(range(12)))
+        self.assertEqual(Job.objects.filter(status=Job.Status.DONE).count(), 12)
+
+    def test_command(self):
+        record.enqueue(value='cmd')
+        out = StringIO()
+        call_command('ttms_worker', '--once', '--concurrency', '1', stdout=out)
+        self.assertIn('Processed 1 jobs.', out.getvalue())
+        self.assertEqual(calls, ['cmd'])
+
+
+def at(hour, minute, day=19, month=10):
+    return timezone.make_aware(timezone.datetime(2026, month, day, hour, minute))
+
+
+class CronScheduleTest(SimpleTestCase):
+    """Test cases for cron expression parsing"""
+
+    def test_next_after(self):
+        moment = at(10, 7) + timedelta(seconds=30)
+        cases = {
+            '* * * * *': at(10, 8),
+            '*/15 * * * *': at(10, 15),
+            '5/20 * * * *': at(10, 25),
+            '@hourly': at(11, 0),
+            '@daily': at(0, 0, day=20),
+            '0 9 * * 1-5': at(9, 0, day=20),
+            '0 9 * * 6,7': at(9, 0, day=24),
+            '0 0 1 1 *': timezone.make_aware(timezone.datetime(2027, 1, 1)),
+        }
+        for expression, expected in cases.items():
+            with self.subTest(expression=expression):
+                self.assertEqual(CronSchedule(expression).next_after(moment), expected)
+
+    def test_either_day_field_matches(self):
+        # 2026-10-19 is a Monday: the next Friday comes before the 13th
+        self.assertEqual(CronSchedule('0 0 13 * 5').next_after(at(12, 0)), at(0, 0, day=23))
+
+    def test_latest_between(self):
+        schedule = CronSchedule('*/15 * * * *')
+        self.assertEqual(schedule.latest_between(at(9, 50), at(10, 40)), at(10, 30))
+        self.assertIsNone(schedule.latest_between(at(10, 31), at(10, 44)))
+
+    def test_invalid_expressions(self):
+        for expression in ('* * * *', '60 * * * *', '*/0 * * * *', '5-1 * * * *', 'x * * * *', '0 0 31 2 *'):
+            with self.subTest(expression=expression), self.assertRaises(CronError):
+                CronSchedule(expression).next_after(at(0, 0))
+
+
+class SchedulerTest(TestCase):
+    """Test cases for leader election and periodic runs"""
+
+    def setUp(self):
+        self.calls = []
+        self.every_minute = PeriodicTask('tests.every_minute', CronSchedule('* * * * *'), lambda: self.calls.append('m'))
+        self.hourly = PeriodicTask('tests.hourly', CronSchedule('@hourly'), lambda: self.calls.append('h'))
+
+    def scheduler(self, holder='a', **kwargs):
+        return Scheduler(holder=holder, lease_seconds=30, tasks=[self.every_minute, self.hourly], **kwargs)
+
+    def test_single_leader(self):
+        now = at(10, 0)
+        self.assertTrue(acquire_lease('a', 30, now=now))
+        self.assertFalse(acquire_lease('b', 30, now=now + timedelta(seconds=10)))
+        self.assertTrue(acquire_lease('a', 30, now=now + timedelta(seconds=20)))
+        # Renewed at +20s, so still held at +45s
+        self.assertFalse(acquire_lease('b', 30, now=now + timedelta(seconds=45)))
+        self.assertTrue(acquire_lease('b', 30, now=now + timedelta(seconds=51)))
+        self.assertEqual(SchedulerLease.objects.get().holder, 'b')
+
+    def test_release_hands_over(self):
+        self.assertTrue(acquire_lease('a', 30))
+        release_lease('a')
+        self.assertTrue(acquire_lease('b', 30))
+
+    def test_only_the_leader_runs_tasks(self):
+        leader, follower = self.scheduler('a'), self.scheduler('b')
+        self.assertEqual(len(leader.tick(now=at(10, 0))), 2)
+        self.assertEqual(follower.tick(now=at(10, 0) + timedelta(seconds=5)), [])
+        self.assertEqual((leader.is_leader, follower.is_leader), (True, False))
+        self.assertEqual(sorted(self.calls), ['h', 'm'])
+
+    def test_each_slot_runs_once(self):
+        scheduler = self.scheduler()
+        scheduler.tick(now=at(10, 0))
+        self.assertEqual(scheduler.tick(now=at(10, 0) + timedelta(seconds=30)), [])
+        runs = scheduler.tick(now=at(10, 1))
+        self.assertEqual([(run.name, run.scheduled_for) for run in runs], [('tests.every_minute', at(10, 1))])
+
+    def test_new_leader_continues_the_schedule(self):
+        self.scheduler('a').tick(now=at(10, 0))
+        # "a" died; "b" takes over after the lease lapsed and skips slots "a" ran
+        runs = self.scheduler('b').tick(now=at(10, 0) + timedelta(seconds=31))
+        self.assertEqual(runs, [])
+        self.assertEqual(len(self.calls), 2)
+
+    def test_missed_slots_run_once(self):
+        scheduler = self.scheduler()
+        scheduler.tick(now=at(10, 0))
+        runs = scheduler.tick(now=at(13, 20))
+        self.assertEqual(sorted((run.name, run.scheduled_for) for run in runs), [
+            ('tests.every_minute', at(13, 20)), ('tests.hourly', at(13, 0)),
+        ])
+
+    def test_failures_and_overruns_are_recorded(self):
+        def explode():
+            raise RuntimeError('boom')
+
+        scheduler = Scheduler(holder='a', tasks=[PeriodicTask('tests.explode', CronSchedule('* * * * *'), explode)])
+        with self.assertLogs('jobs.scheduler', 'ERROR'):
+            run_record = scheduler.tick(now=timezone.now() - timedelta(hours=1))[0]
+        self.assertEqual(run_record.status, ScheduledRun.Status.FAILED)
+        self.assertIn('RuntimeError: boom', run_record.error)
+        # Slot was long ago, so the run finished after the next slot
+        self.assertTrue(run_record.overran)
+        self.assertGreater(run_record.lag, 0)
+        self.assertIsNotNone(run_record.duration)
+
+    @override_settings(SCHEDULER_DISABLED=['tasks.send_deadline_reminders'])
+    def test_registered_tasks(self):
+        names = [task.name for task in periodic_tasks()]
+        self.assertIn('auth_app.expire_password_resets', names)
+        self.assertIn('jobs.prune_scheduler_history', names)
+        self.assertNotIn('tasks.send_deadline_reminders', names)
+
+    def test_status(self):
+        scheduler = Scheduler(holder='a', tasks=[])
+        scheduler.tick()
+        status = scheduler_status()
+        self.assertEqual(status['leader'], 'a')
+        self.assertIn('auth_app.expire_password_resets', status['tasks'])
+
+    def test_expire_password_resets(self):
+        suffix = uuid.uuid4().hex[:8]
+        user = User.objects.create_user(
+            username=f'reset_{suffix}', email=f'reset_{suffix}@example.com', password='testpass123'
+        )
+        stale = PasswordResetRequest.objects.create(
+            user=user, token=f'stale-{suffix}', expires_at=timezone.now() - timedelta(minutes=1)
+        )
+        fresh = PasswordResetRequest.objects.create(user=user, token=f'fresh-{suffix}')
+        self.assertEqual(expire_password_resets(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.status, PasswordResetRequest.Status.EXPIRED)
+        self.assertEqual(fresh.status, PasswordResetRequest.Status.PENDING)
+
+    def test_command(self):
+        out = StringIO()
+        call_command('ttms_scheduler', '--list', stdout=out)
+        self.assertIn('tasks.send_deadline_reminders', out.getvalue())
+        call_command('ttms_scheduler', '--once', stdout=out)
+        self.assertIn('tasks.send_deadline_reminders: done', out.getvalue())
@@ -0,0 +1,82 @@
+"""
+Worker loop for the job queue.
+
+`run_workers` starts N threads in one process; each polls for due jobs,
+claims a batch and runs it. Handlers are mostly database-bound, so threads
+overlap well; run more processes for CPU-bound work. SIGTERM/SIGINT stop
+claiming new work and let the current job finish.
+"""
+import logging
+import os
+import signal
+import socket
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+
+from . import queue
+
+logger = logging.getLogger(__name__)
+
+
+class Worker:
+    """One polling loop; `stop` is shared between the workers of a process"""
+
+    def __init__(self, index=0, queues=('default',), batch_size=None, poll_interval=None,
+                 visibility_timeout=None, stop=None):
+        self.id = f'{socket.gethostname()}:{os.getpid()}:{index}'
+        self.queues = tuple(queues)
+        self.batch_size = batch_size or settings.JOBS_BATCH_SIZE
+        self.poll_interval = settings.JOBS_POLL_INTERVAL if poll_interval is None else poll_interval
+        self.visibility_timeout = visibility_timeout or settings.JOBS_VISIBILITY_TIMEOUT
+        self.stop = stop or threading.Event()
+        self.processed = 0
+
+    def run_once(self):
+        """Claim and run one batch; returns the number of jobs run"""
+        close_old_connections()
+        claimed = queue.claim(self.id, self.queues, self.batch_size, self.visibility_timeout)
+        for job in claimed:
+            status = queue.run(job)
+            self.processed += 1
+            log = logger.warning if status != 'done' else logger.info
+            log('Job %s #%s (attempt %s/%s): %s', job.name, job.pk, job.attempts, job.max_attempts, status)
+            if self.stop.is_set():
+                break
+        return len(claimed)
+
+    def run(self, once=False):
+        try:
+            while not self.stop.is_set():
+                try:
+                    ran = self.run_once()
+                except Exception:
+                    logger.exception('Worker %s failed to claim jobs', self.id)
+                    ran = 0
+                if once:
+                    return
+                if not ran:
+                    self.stop.wait(self.poll_interval)
+        finally:
+            connections.close_all()
+
+
+def run_workers(concurrency=None, queues=('default',), once=False, **options):
+    """Run `concurrency` workers in threads until SIGTERM/SIGINT (or one batch each with `once`)"""
+    concurrency = concurrency or settings.JOBS_WORKER_CONCURRENCY
+    stop = threading.Event()
+    if threading.current_thread() is threading.main_thread():
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stop.set())
+
+    workers = [Worker(index, queues, stop=stop, **options) for index in range(concurrency)]
+    threads = [
+        threading.Thread(target=worker.run, kwargs={'once': once}, name=f'ttms-worker-{worker.id}')
+        for worker in workers
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(worker.processed for worker in workers)
@@ -0,0 +1,95 @@
+"""
+Hot/cold archival of completed tasks.
+
+Most tasks end up done and are never touched again, yet every list, search
+and count scans them. `archive_completed_tasks` moves tasks that have been
+done for TASK_ARCHIVE_AFTER_DAYS (going by ``updated_at``) into
+`ArchivedTask`, together with their comments and notifications, so the hot
+``tasks`` table and its indexes stay small. Each batch of
+TASK_ARCHIVE_BATCH_SIZE tasks is one transaction: the rows are copied with
+``INSERT ... SELECT`` (ids and timestamps kept) and the hot rows deleted,
+which also drops their deadline reminders. Tasks locked by a concurrent
+update are skipped on PostgreSQL and picked up by the next run.
+
+`restore_task` moves a task back, e.g. when someone reopens it; the
+TaskViewSet does that transparently on update. Reads see only hot tasks
+unless ``?include_archived=true`` asks for a UNION with the archive (see
+tasks.queries.with_archived).
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.utils import timezone
+
+from .models import ArchivedComment, ArchivedNotification, ArchivedTask, Comment, Notification, Task
+
+logger = logging.getLogger(__name__)
+
+
+def _copy(source, model):
+    """INSERT INTO `model`'s table the rows of the `source` queryset; returns the count"""
+    connection = connections[router.db_for_write(model)]
+    qn = connection.ops.quote_name
+    fields = model._meta.concrete_fields
+    select, params = source.order_by().values_list(*[field.attname for field in fields]).query.sql_with_params()
+    columns = ', '.join(qn(field.column) for field in fields)
+    with connection.cursor() as cursor:
+        cursor.execute(f'INSERT INTO {qn(model._meta.db_table)} ({columns}) {select}', params)
+        return cursor.rowcount
+
+
+def archive_tasks(ids):
+    """Move the tasks `ids` with their comments and notifications to the archive"""
+    tasks = Task.objects.filter(pk__in=ids)
+    with transaction.atomic(using=router.db_for_write(Task)):
+        moved = _copy(tasks, ArchivedTask)
+        _copy(Comment.objects.filter(task_id__in=ids), ArchivedComment)
+        _copy(Notification.objects.filter(task_id__in=ids), ArchivedNotification)
+        tasks.delete()
+    return moved
+
+
+def restore_task(pk):
+    """Move archived task `pk` back to the hot tables and return it"""
+    with transaction.atomic(using=router.db_for_write(Task)):
+        archived = ArchivedTask.objects.select_for_update().filter(pk=pk)
+        status = archived.values_list('status', flat=True).first()
+        if status is None:
+            raise ArchivedTask.DoesNotExist(f'Task {pk} is not archived')
+        # Its old rank may clash with ones handed out since: go last in the column
+        rank = Task.end_rank(status)
+        _copy(archived, Task)
+        _copy(ArchivedComment.objects.filter(task_id=pk), Comment)
+        _copy(ArchivedNotification.objects.filter(task_id=pk), Notification)
+        archived.delete()
+        # A fresh updated_at keeps it out of the next archive run (and the fragment cache)
+        Task.objects.filter(pk=pk).update(updated_at=timezone.now(), rank=rank)
+    logger.info('Restored archived task %s', pk)
+    return Task.objects.get(pk=pk)
+
+
+def archive_completed_tasks(days=None, batch_size=None, now=None, pause=None, sleep=time.sleep):
+    """Archive tasks done for more than `days`, in batches; returns how many moved"""
+    days = settings.TASK_ARCHIVE_AFTER_DAYS if days is None else days
+    if days <= 0:
+        return 0
+    batch_size = batch_size or settings.TASK_ARCHIVE_BATCH_SIZE
+    pause = settings.TASK_ARCHIVE_PAUSE_SECONDS if pause is None else pause
+    cutoff = (now or timezone.now()) - timedelta(days=days)
+    candidates = Task.objects.filter(status=Task.DONE, updated_at__lt=cutoff).order_by('pk')
+
+    archived = 0
+    while True:
+        with transaction.atomic(using=router.db_for_write(Task)):
+            ids = list(candidates.select_for_update(skip_locked=True).values_list('pk', flat=True)[:batch_size])
+            if ids:
+                archived += archive_tasks(ids)
+        if len(ids) < batch_size:
+            break
+        sleep(pause)
+    if archived:
+        logger.info('Archived %s tasks done before %s', archived, cutoff.date())
+    return archived
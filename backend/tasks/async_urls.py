@@ -0,0 +1,15 @@
+from django.urls import path
+
+from . import async_views
+
+urlpatterns = [
+    path('tasks/', async_views.task_list, name='async-task-list'),
+    path('tasks/my_tasks/', async_views.my_tasks, name='async-task-my-tasks'),
+    path('tasks/statistics/', async_views.task_statistics, name='async-task-statistics'),
+    path('notifications/', async_views.notification_list, name='async-notification-list'),
+    path(
+        'notifications/unread_count/',
+        async_views.notification_unread_count,
+        name='async-notification-unread-count',
+    ),
+]
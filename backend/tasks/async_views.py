@@ -0,0 +1,186 @@
+"""
+Async read endpoints for the hottest polling paths.
+
+These mirror the sync `TaskViewSet`/`NotificationViewSet` actions (same
+querysets, serializers, pagination and JSON shape) but are plain Django
+async views, so under ASGI a request waiting on the database does not hold
+a worker. Queries go through the async ORM (`acount`, `aaggregate`) or one
+thread hop per page and read from the replica like the sync viewsets do;
+authentication runs the regular JWT backend in a thread.
+
+They are routed under `/api/async/` and work under WSGI too (Django runs
+them in an event loop per request), but only pay off behind an ASGI server.
+"""
+import functools
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework import exceptions
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+
+from config.db_router import replica_allowed, replica_reads
+from config.fast_serializer import fast_serializer_for
+from config.renderers import ORJSONRenderer
+from users.authentication import CachedJWTAuthentication
+from .queries import (
+    get_role_kind,
+    visible_tasks,
+    archived_tasks,
+    include_archived,
+    with_archived,
+    atask_statistics,
+    user_notifications,
+    unread_notifications,
+)
+from .serializers import TaskSerializer, NotificationSerializer
+from .views import TaskViewSet, NotificationViewSet
+
+
+def _render(data, status=200, headers=None):
+    response = HttpResponse(
+        ORJSONRenderer().render(data), status=status, content_type='application/json'
+    )
+    for name, value in (headers or {}).items():
+        response[name] = value
+    return response
+
+
+def _error(exc):
+    """Render an APIException the way DRF's default exception handler does"""
+    if isinstance(exc.detail, (list, dict)):
+        data = exc.detail
+    else:
+        data = {'detail': exc.detail}
+    headers = {}
+    if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+        headers['WWW-Authenticate'] = CachedJWTAuthentication().authenticate_header(None)
+    return _render(data, status=exc.status_code, headers=headers)
+
+
+async def _authenticate(request):
+    """Return a DRF Request with the authenticated user, or raise NotAuthenticated"""
+    result = await sync_to_async(CachedJWTAuthentication().authenticate)(request)
+    if result is None:
+        raise exceptions.NotAuthenticated()
+    drf_request = Request(request)
+    drf_request.user, drf_request.auth = result
+    return drf_request
+
+
+def _view(viewset_class, request, action):
+    return viewset_class(request=request, format_kwarg=None, action=action, args=(), kwargs={})
+
+
+def _filter(view, queryset):
+    for backend in view.filter_backends:
+        queryset = backend().filter_queryset(view.request, queryset, view)
+    return queryset
+
+
+async def _fetch(queryset):
+    # Not aiterator(): values_list() iterables run their query as soon as they
+    # are created, which Django refuses to do on the event loop
+    return await sync_to_async(list)(queryset)
+
+
+def _serializer(serializer_class, context):
+    """Return (queryset transform, list serializer) using the fast path when possible"""
+    fast = fast_serializer_for(serializer_class)
+    if fast is None:
+        return (lambda queryset: queryset), (
+            lambda rows: serializer_class(rows, many=True, context=context).data
+        )
+    return fast.rows, (lambda rows: fast.serialize(rows, context))
+
+
+async def _paginate(request, queryset, serializer_class):
+    """Async counterpart of PageNumberPagination: one `acount` plus one page fetch"""
+    pagination = PageNumberPagination()
+    page_size = pagination.get_page_size(request)
+    context = {'request': request, 'format': None}
+    prepare, serialize = _serializer(serializer_class, context)
+    queryset = prepare(queryset)
+    if not page_size:
+        return serialize(await _fetch(queryset))
+
+    paginator = pagination.django_paginator_class(queryset, page_size)
+    # Prime Paginator.count so validation and slicing never query synchronously
+    paginator.count = await queryset.acount()
+    page_number = pagination.get_page_number(request, paginator)
+    try:
+        page = paginator.page(page_number)
+    except InvalidPage as exc:
+        msg = pagination.invalid_page_message.format(page_number=page_number, message=str(exc))
+        raise exceptions.NotFound(msg)
+
+    page.object_list = await _fetch(page.object_list)
+    pagination.page = page
+    pagination.request = request
+    return {
+        'count': paginator.count,
+        'next': pagination.get_next_link(),
+        'previous': pagination.get_previous_link(),
+        'results': serialize(page.object_list),
+    }
+
+
+def api_view(func):
+    """Authenticate the request and turn APIExceptions into DRF-shaped responses"""
+    @require_GET
+    @functools.wraps(func)
+    async def wrapper(request, *args, **kwargs):
+        try:
+            drf_request = await _authenticate(request)
+            with replica_reads(replica_allowed(request.method, drf_request.user)):
+                data = await func(drf_request, *args, **kwargs)
+            return _render(data)
+        except exceptions.APIException as exc:
+            return _error(exc)
+    return wrapper
+
+
+@api_view
+async def task_list(request):
+    """Async GET /api/tasks/"""
+    view = _view(TaskViewSet, request, 'list')
+    queryset = _filter(view, visible_tasks(request.user, request.query_params))
+    if include_archived(request.query_params):
+        queryset = with_archived(queryset, _filter(view, archived_tasks(request.user, request.query_params)))
+    return await _paginate(request, queryset, TaskSerializer)
+
+
+@api_view
+async def my_tasks(request):
+    """Async GET /api/tasks/my_tasks/"""
+    user = request.user
+    queryset = visible_tasks(user, request.query_params).filter(assignee=user)
+    if include_archived(request.query_params):
+        queryset = with_archived(queryset, archived_tasks(user, request.query_params).filter(assignee=user))
+    return await _paginate(request, queryset, TaskSerializer)
+
+
+@api_view
+async def task_statistics(request):
+    """Async GET /api/tasks/statistics/"""
+    user = request.user
+    role_kind = get_role_kind(user)
+    queryset = visible_tasks(user, request.query_params, role_kind)
+    archived = archived_tasks(user, request.query_params, role_kind) if include_archived(request.query_params) else None
+    return await atask_statistics(queryset, user, role_kind, archived)
+
+
+@api_view
+async def notification_list(request):
+    """Async GET /api/notifications/"""
+    view = _view(NotificationViewSet, request, 'list')
+    queryset = _filter(view, user_notifications(request.user))
+    return await _paginate(request, queryset, NotificationSerializer)
+
+
+@api_view
+async def notification_unread_count(request):
+    """Async GET /api/notifications/unread_count/"""
+    return {'unread': await unread_notifications(request.user).acount()}
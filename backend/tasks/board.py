@@ -0,0 +1,217 @@
+"""
+Kanban board reads and moves.
+
+`board_tasks` returns the first `limit` tasks of every status column and
+each column's size in one query: ``ROW_NUMBER()`` and ``COUNT(*)`` window
+functions partitioned by status, with the filter on the row number applied
+to the wrapped query (Django's QUALIFY emulation). Columns are sorted by one
+of ORDERINGS: ``priority`` (high first, then deadline with none last, then
+id), which follows the (-priority, deadline) index, or ``rank``, the manual drag-and-drop order (see tasks.ranking), which
+the (status, rank) index serves directly.
+
+`column_tasks` loads more of one column with a keyset cursor over that same
+order, so a page deep in a long backlog costs the same as the first.
+Cursors are opaque URL-safe strings; `decode_cursor` raises ValueError on
+anything it did not produce.
+
+`move_task` places a task between two neighbours by writing its own row
+only. `rebalance_column` re-spaces a column whose keys have grown long or
+tied; it rewrites the whole column, so it runs as the
+``tasks.rebalance_ranks`` job, never in a request.
+
+Read rows with `board_rows`, not values_list(): Django's wrapper for the
+window filter misaligns the result when two paths select the same column
+(``assignee`` and ``assignee__id``, as a nested serializer produces).
+"""
+import base64
+import json
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Task
+from .ranking import RankError, rank_between, spaced_ranks
+
+COLUMNS = Task.STATUS_CHOICES
+# Sort keys per ordering as (field, nulls last), '-' for descending; `id` last keeps the order total
+ORDERINGS = {
+    'priority': (('-priority', False), ('deadline', True), ('id', False)),
+    'rank': (('rank', False), ('id', False)),
+}
+DEFAULT_ORDERING = 'priority'
+RANK_MAX_LENGTH = Task._meta.get_field('rank').max_length
+
+
+def _datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None:
+        raise ValueError(value)
+    return parsed
+
+
+def _priority(value):
+    if value not in Task.PRIORITY_CODES:
+        raise ValueError(value)
+    return value
+
+
+def _text(value):
+    if not isinstance(value, str):
+        raise TypeError(value)
+    return value
+
+
+# How cursor values come back from JSON
+_CURSOR_TYPES = {'priority': _priority, 'deadline': _datetime, 'rank': _text, 'id': int}
+
+
+def _sort_keys(ordering):
+    """(field, descending, nulls last) per key of `ordering`"""
+    return [(key.lstrip('-'), key.startswith('-'), nulls_last) for key, nulls_last in ORDERINGS[ordering]]
+
+
+def board_order(ordering=DEFAULT_ORDERING):
+    return [
+        (F(field).desc if descending else F(field).asc)(nulls_last=nulls_last or None)
+        for field, descending, nulls_last in _sort_keys(ordering)
+    ]
+
+
+def cursor_fields(ordering=DEFAULT_ORDERING):
+    """Row values a cursor is built from"""
+    return tuple(field for field, _, _ in _sort_keys(ordering))
+
+
+def board_tasks(queryset, limit, ordering=DEFAULT_ORDERING):
+    """First `limit` tasks per status, each annotated with its `column_total`"""
+    column = [F('status')]
+    return (
+        queryset.annotate(
+            board_position=Window(RowNumber(), partition_by=column, order_by=board_order(ordering)),
+            column_total=Window(Count('id'), partition_by=column),
+        )
+        .filter(board_position__lte=limit)
+        .order_by('status', 'board_position')
+    )
+
+
+def _column_key(model, path):
+    """`path` without a trailing ``__<pk>`` of a foreign key's target (same SQL column)"""
+    *relations, last = path.split('__')
+    field = None
+    for name in relations:
+        field = model._meta.get_field(name)
+        model = field.related_model
+    if field is not None and field.many_to_one and last in ('pk', field.target_field.name):
+        return '__'.join(relations)
+    return path
+
+
+def board_rows(queryset, columns):
+    """``queryset.values_list(*columns)`` as a list, selecting each column once"""
+    keys = [_column_key(queryset.model, column) for column in columns]
+    unique = list(dict.fromkeys(keys))
+    positions = [unique.index(key) for key in keys]
+    return [tuple(row[position] for position in positions) for row in queryset.values_list(*unique)]
+
+
+def column_tasks(queryset, status, cursor=None, limit=20, ordering=DEFAULT_ORDERING):
+    """Up to `limit` + 1 tasks of one column after `cursor` (the extra one tells if there are more)"""
+    queryset = queryset.filter(status=status)
+    if cursor is not None:
+        queryset = queryset.filter(_after(ordering, cursor))
+    return queryset.order_by(*board_order(ordering))[:limit + 1]
+
+
+def _after(ordering, values):
+    """Rows sorting after `values` in `ordering`"""
+    after, same = Q(pk__in=[]), Q()
+    for (field, descending, nulls_last), value in zip(_sort_keys(ordering), values):
+        if value is None:
+            # Nothing sorts after a trailing null
+            same &= Q(**{f'{field}__isnull': True})
+            continue
+        greater = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+        if nulls_last:
+            greater |= Q(**{f'{field}__isnull': True})
+        after |= same & greater
+        same &= Q(**{field: value})
+    return after
+
+
+def encode_cursor(values, ordering=DEFAULT_ORDERING):
+    values = [value.isoformat() if hasattr(value, 'isoformat') else value for value in values]
+    payload = json.dumps([ordering, *values], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, ordering=DEFAULT_ORDERING):
+    """The `cursor_fields` values from `encode_cursor`; ValueError when malformed or for another ordering"""
+    try:
+        name, *values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        fields = cursor_fields(ordering)
+        if name != ordering or len(values) != len(fields):
+            raise ValueError
+        return tuple(
+            None if value is None else _CURSOR_TYPES[field](value) for field, value in zip(fields, values)
+        )
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError(f'Invalid board cursor {cursor!r}')
+
+
+class RebalanceNeeded(RankError):
+    """No usable key between the neighbours until the `status` column is rebalanced"""
+
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+def _neighbour_ranks(task, status, after, before):
+    """Ranks `task` must fall between to sit right after `after` / right before `before`"""
+    if any(neighbour is not None and not neighbour.rank for neighbour in (after, before)):
+        raise RebalanceNeeded('Unranked neighbour', status)
+    column = Task.objects.filter(status=status).exclude(pk=task.pk).order_by()
+    if after is not None and before is not None:
+        if after.rank == before.rank:
+            raise RebalanceNeeded(f'Neighbours share rank {after.rank!r}', status)
+        return after.rank, before.rank
+    if after is not None:
+        return after.rank, column.filter(rank__gt=after.rank).aggregate(rank=Min('rank'))['rank']
+    if before is not None:
+        return column.filter(rank__lt=before.rank).aggregate(rank=Max('rank'))['rank'], before.rank
+    return column.aggregate(rank=Max('rank'))['rank'], None
+
+
+def move_task(task, status=None, after=None, before=None):
+    """
+    Put `task` in the `status` column (default: its own) right after `after`,
+    right before `before`, or last; only the task's own row is written.
+
+    Raises RebalanceNeeded when the neighbours are unranked, tied or leave
+    no key short enough (queue `tasks.rebalance_ranks`, then retry), and
+    RankError when `after` does not sort before `before`.
+    """
+    status = status or task.status
+    rank = rank_between(*_neighbour_ranks(task, status, after, before))
+    if len(rank) > RANK_MAX_LENGTH:
+        raise RebalanceNeeded(f'Rank {rank!r} is too long', status)
+    task.status, task.rank = status, rank
+    task.save(update_fields=['status', 'rank', 'updated_at'])
+    return task
+
+
+def rebalance_column(status):
+    """Give the `status` column short, evenly spaced ranks in its current order"""
+    with transaction.atomic():
+        ids = list(
+            Task.objects.select_for_update().filter(status=status).order_by('rank', 'id').values_list('id', flat=True)
+        )
+        # A new updated_at also retires the cached fragments (keyed by pk and updated_at)
+        now = timezone.now()
+        tasks = [Task(id=pk, rank=rank, updated_at=now) for pk, rank in zip(ids, spaced_ranks(len(ids)))]
+        Task.objects.bulk_update(tasks, ['rank', 'updated_at'], batch_size=500)
+    return len(ids)
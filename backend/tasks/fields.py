@@ -0,0 +1,47 @@
+from django.core import exceptions
+from django.db import models
+from django.utils.functional import cached_property
+
+
+class ChoiceIntegerField(models.PositiveSmallIntegerField):
+    """
+    A choice field stored as a small integer.
+
+    `choices` are (value, label) pairs with string values, as for a
+    CharField, and `codes` maps each value to the integer written to the
+    database. Python code, query lookups, forms and serializers keep using
+    the strings; only the column is compact, and ordering follows the codes
+    rather than the alphabet.
+    """
+
+    def __init__(self, *args, codes=None, **kwargs):
+        self.codes = dict(codes or {})
+        self.values = {code: value for value, code in self.codes.items()}
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['codes'] = self.codes
+        return name, path, args, kwargs
+
+    @cached_property
+    def validators(self):
+        # The integer range validators would compare against the string value
+        return [*self.default_validators, *self._validators]
+
+    def from_db_value(self, value, expression, connection):
+        return self.values.get(value, value)
+
+    def to_python(self, value):
+        if value is None or value in self.codes:
+            return value
+        if value in self.values:
+            return self.values[value]
+        raise exceptions.ValidationError(
+            self.error_messages['invalid_choice'], code='invalid_choice', params={'value': value}
+        )
+
+    def get_prep_value(self, value):
+        if isinstance(value, str) and value in self.codes:
+            return self.codes[value]
+        return super().get_prep_value(value)
@@ -0,0 +1,45 @@
+from django.conf import settings
+
+from jobs.queue import claim, job, run
+from jobs.scheduler import periodic
+from .archive import archive_completed_tasks
+from .board import rebalance_column
+from .models import Notification
+from .reminders import send_deadline_reminders
+
+
+@job('tasks.create_notification')
+def create_notification(user_id, type, message, task_id=None):
+    Notification.objects.create(user_id=user_id, task_id=task_id, type=type, message=message)
+
+
+# Never run inline: a move only writes its own row, even under JOBS_EAGER
+@job('tasks.rebalance_ranks', queue='ranks', eager=False)
+def rebalance_ranks(status):
+    return rebalance_column(status)
+
+
+def notify(user, type, message, task=None):
+    """Queue a notification for `user` (created inline when JOBS_EAGER)"""
+    create_notification.enqueue(
+        user_id=user.pk, task_id=task.pk if task is not None else None, type=type, message=message
+    )
+
+
+@periodic('tasks.send_deadline_reminders', '* * * * *')
+def deadline_reminders():
+    return send_deadline_reminders()
+
+
+@periodic('tasks.run_rank_rebalances', '* * * * *')
+def run_rank_rebalances():
+    """Run queued column rebalances when no worker consumes the `ranks` queue"""
+    claimed = claim('scheduler', queues=('ranks',), limit=settings.JOBS_BATCH_SIZE)
+    for queued in claimed:
+        run(queued)
+    return len(claimed)
+
+
+@periodic('tasks.archive_completed_tasks', settings.TASK_ARCHIVE_SCHEDULE)
+def archive_tasks():
+    return archive_completed_tasks()
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tasks.archive import archive_completed_tasks, restore_task
+from tasks.models import ArchivedTask
+
+
+class Command(BaseCommand):
+    help = 'Move long-done tasks (with comments and notifications) to the archive tables, or restore some'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=None, help='Archive tasks done for more than this many days')
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--restore', type=int, action='append', metavar='ID', help='Restore this task (repeatable)')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            for pk in options['restore']:
+                try:
+                    task = restore_task(pk)
+                except ArchivedTask.DoesNotExist as exc:
+                    raise CommandError(exc)
+                self.stdout.write(self.style.SUCCESS(f'Restored task {task.pk}: {task.title}'))
+            return
+
+        archived = archive_completed_tasks(days=options['days'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} tasks.'))
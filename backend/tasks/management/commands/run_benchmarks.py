@@ -0,0 +1,134 @@
+import json
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases, teardown_test_environment
+
+from benchmarks.harness import compare, failures, format_table, load_baseline, write_baseline
+from tasks.models import Task
+
+DATASET_OPTIONS = ('users', 'projects', 'tasks', 'comments', 'notifications', 'activity_logs', 'seed')
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark the hot API endpoints on a generated dataset, recording p50/p95 latency '
+        'and query counts, and fail when a run regresses past the JSON baseline'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=200)
+        parser.add_argument('--projects', type=int, default=20)
+        parser.add_argument('--tasks', type=int, default=5000)
+        parser.add_argument('--comments', type=int, default=2000)
+        parser.add_argument('--notifications', type=int, default=5000)
+        parser.add_argument('--activity-logs', type=int, default=2000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--iterations', type=int, default=20, help='Timed requests per endpoint')
+        parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per endpoint')
+        parser.add_argument('--rows', type=int, default=500, help='Rows per serializer throughput benchmark')
+        parser.add_argument('--only', nargs='*', help='Only run benchmarks whose name starts with one of these prefixes')
+        parser.add_argument(
+            '--baseline', default=str(settings.BASE_DIR / 'benchmarks' / 'baseline.json'),
+            help='Baseline JSON file to compare against (created when missing)'
+        )
+        parser.add_argument('--update-baseline', action='store_true', help='Overwrite the baseline with this run')
+        parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed p95 slowdown as a fraction')
+        parser.add_argument('--slack-ms', type=float, default=2.0, help='Absolute p95 slack in milliseconds')
+        parser.add_argument('--output', help='Also write this run to a JSON file')
+        parser.add_argument('--keep-db', action='store_true', help='Reuse the benchmark database between runs')
+
+    def handle(self, *args, **options):
+        dataset = {key: options[key] for key in DATASET_OPTIONS}
+        dataset['vendor'] = connections['default'].vendor
+
+        self.configure_database()
+        setup_test_environment()
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keep_db'], aliases={'default'})
+        try:
+            self.seed(dataset, options['keep_db'])
+            results = self.run_suites(options)
+        finally:
+            if not options['keep_db']:
+                teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+        self.report(results, dataset, options)
+
+    def configure_database(self):
+        conn = connections['default']
+        if conn.vendor == 'sqlite':
+            # Benchmark against a file, not the in-memory default used by the test runner
+            conn.settings_dict.setdefault('TEST', {})
+            if not conn.settings_dict['TEST'].get('NAME'):
+                conn.settings_dict['TEST']['NAME'] = str(settings.BASE_DIR / 'benchmarks' / 'benchmark.sqlite3')
+
+    def seed(self, dataset, keep_db):
+        if keep_db and Task.objects.exists():
+            self.stdout.write('Reusing existing benchmark dataset.')
+            return
+        call_command(
+            'seed_demo_data',
+            users=dataset['users'],
+            projects=dataset['projects'],
+            tasks=dataset['tasks'],
+            comments=dataset['comments'],
+            notifications=dataset['notifications'],
+            activity_logs=dataset['activity_logs'],
+            seed=dataset['seed'],
+            stdout=self.stdout,
+        )
+
+    def run_suites(self, options):
+        from benchmarks.endpoints import EndpointBenchmark, MissingActor
+        from benchmarks.serialization import SerializationBenchmark
+
+        try:
+            results = EndpointBenchmark(
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                only=options['only'],
+            ).run()
+        except MissingActor as exc:
+            raise CommandError(str(exc))
+        results.update(SerializationBenchmark(
+            iterations=options['iterations'],
+            warmup=options['warmup'],
+            only=options['only'],
+            rows=options['rows'],
+        ).run())
+        return results
+
+    def report(self, results, dataset, options):
+        baseline_path = options['baseline']
+        baseline = load_baseline(baseline_path)
+
+        self.stdout.write(format_table(results, baseline))
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({'dataset': dataset, 'results': results}, fh, indent=2, sort_keys=True)
+
+        # A broken endpoint's numbers must neither become nor pass the baseline
+        failed = failures(results)
+        if failed:
+            raise CommandError('Benchmark cases failed:\n  ' + '\n  '.join(failed))
+
+        if baseline is None or options['update_baseline']:
+            write_baseline(baseline_path, results, dataset)
+            self.stdout.write(self.style.SUCCESS(f'Baseline written to {baseline_path}'))
+            return
+
+        if baseline.get('dataset') != dataset:
+            raise CommandError(
+                'Baseline was recorded on a different dataset '
+                f"({baseline.get('dataset')}); rerun with --update-baseline"
+            )
+
+        regressions = compare(
+            results, baseline, tolerance=options['tolerance'], slack_ms=options['slack_ms'], only=options['only']
+        )
+        if regressions:
+            raise CommandError('Performance regressions detected:\n  ' + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS('No regressions against baseline.'))
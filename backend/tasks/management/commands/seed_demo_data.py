@@ -1,14 +1,76 @@
+import itertools
+import random
+import time
+import uuid
+from datetime import timedelta
+
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, Max, Min
 from tasks.models import Project, Task, Comment, Notification, ActivityLog
+from tasks.ranking import rank_between, spaced_ranks
 from django.utils import timezone
 
 User = get_user_model()
 
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.ttms.local'
+
+STATUS_WEIGHTS = [(Task.TODO, 25), (Task.IN_PROGRESS, 15), (Task.DONE, 60)]
+PRIORITY_WEIGHTS = [(Task.LOW, 30), (Task.MEDIUM, 50), (Task.HIGH, 20)]
+# Share of open tasks (todo, in progress) seeded past their deadline
+OVERDUE_SHARE = 0.1
+ROLE_WEIGHTS = [(User.Role.ADMIN, 2), (User.Role.MANAGER, 10), (User.Role.MEMBER, 88)]
+NOTIFICATION_WEIGHTS = [
+    (Notification.TASK_ASSIGNED, 45),
+    (Notification.TASK_STARTED, 15),
+    (Notification.TASK_DONE, 15),
+    (Notification.TASK_REMINDER, 10),
+    (Notification.TASK_COMMENTED, 15),
+]
+WORDS = (
+    'api auth backend billing cache dashboard deploy design docs export frontend '
+    'index invoice login metrics migrate mobile onboarding payments profile report '
+    'schema search settings signup sync tests upload webhook'
+).split()
+VERBS = ('Fix', 'Implement', 'Review', 'Refactor', 'Document', 'Test', 'Optimize', 'Design')
+
+
+def auto_timestamp_fields(model):
+    """Fields bulk_create stamps with the current time (auto_now/auto_now_add)"""
+    return [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+
+
 class Command(BaseCommand):
     help = 'Seed demo data: roles, users, projects, tasks, comments, notifications, activity logs'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=0, help='Number of synthetic users to generate')
+        parser.add_argument('--projects', type=int, default=0, help='Number of synthetic projects to generate')
+        parser.add_argument('--tasks', type=int, default=0, help='Number of synthetic tasks to generate')
+        parser.add_argument('--comments', type=int, default=0, help='Number of synthetic comments to generate')
+        parser.add_argument('--notifications', type=int, default=0, help='Number of synthetic notifications to generate')
+        parser.add_argument('--activity-logs', type=int, default=0, help='Number of synthetic activity log rows to generate')
+        parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible datasets')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk_create batch')
+        parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent for assignee/author skew')
+        parser.add_argument('--password', default='password123', help='Password shared by all synthetic users')
+        parser.add_argument('--days', type=int, default=365, help='Spread generated rows over this many past days')
+        parser.add_argument('--skip-demo', action='store_true', help='Do not (re)create the demo accounts')
+
     def handle(self, *args, **options):
+        if not options['skip_demo']:
+            self.seed_demo()
+
+        counts = [options[key] for key in ('users', 'projects', 'tasks', 'comments', 'notifications', 'activity_logs')]
+        if any(counts):
+            self.seed_synthetic(options)
+
+    def seed_demo(self):
         self.stdout.write('Seeding demo data...')
 
         # Create demo users
@@ -80,3 +142,276 @@ class Command(BaseCommand):
         ActivityLog.objects.create(user=manager, action='created_project', model='Project', object_id=str(project.id), detail={'project': project.name})
 
         self.stdout.write(self.style.SUCCESS('Demo data seeded.'))
+
+    # Synthetic dataset generation
+
+    def seed_synthetic(self, options):
+        self.rng = random.Random(options['seed'])
+        self.batch_size = max(1, options['batch_size'])
+        self.now = timezone.now()
+        self.span = timedelta(days=max(1, options['days']))
+
+        self.stdout.write('Generating synthetic dataset...')
+        started = time.perf_counter()
+
+        if options['users']:
+            self.generate_users(options['users'], options['password'])
+        self.load_user_pool(options['zipf'])
+
+        if options['projects']:
+            self.generate_projects(options['projects'])
+        if options['tasks']:
+            self.generate_tasks(options['tasks'])
+        if options['comments']:
+            self.generate_comments(options['comments'])
+        if options['notifications']:
+            self.generate_notifications(options['notifications'])
+        if options['activity_logs']:
+            self.generate_activity_logs(options['activity_logs'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Synthetic dataset generated in {time.perf_counter() - started:.1f}s.'
+        ))
+
+    def weighted(self, choices):
+        values, weights = zip(*choices)
+        return lambda: self.rng.choices(values, weights)[0]
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past(self):
+        return self.now - self.span * self.rng.random()
+
+    def sentence(self, words=6):
+        return ' '.join(self.rng.choice(WORDS) for _ in range(words))
+
+    def bulk_insert(self, label, model, total, build):
+        """
+        Insert `total` rows produced by `build(index)` in bulk_create batches.
+        bulk_create stamps auto_now/auto_now_add fields with the current time,
+        so the backdated values `build` set are written back afterwards with
+        bulk_update (which leaves them alone).
+        """
+        started = time.perf_counter()
+        inserted = 0
+        stamped = auto_timestamp_fields(model)
+        for offset in range(0, total, self.batch_size):
+            size = min(self.batch_size, total - offset)
+            rows = [build(offset + i) for i in range(size)]
+            fields = [name for name in stamped if getattr(rows[0], name) is not None]
+            backdated = [[getattr(row, name) for name in fields] for row in rows]
+            with transaction.atomic():
+                model.objects.bulk_create(rows, batch_size=self.batch_size)
+                if fields:
+                    for row, values in zip(rows, backdated):
+                        for name, value in zip(fields, values):
+                            setattr(row, name, value)
+                    model.objects.bulk_update(rows, fields, batch_size=self.batch_size)
+            inserted += size
+        elapsed = time.perf_counter() - started
+        rate = inserted / elapsed if elapsed else inserted
+        self.stdout.write(f'  {label}: {inserted} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)')
+
+    def generate_users(self, total, password):
+        # Hash once: PBKDF2 per row would dominate the run time
+        password_hash = make_password(password)
+        role = self.weighted(ROLE_WEIGHTS)
+        start = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').count()
+
+        def build(i):
+            n = start + i
+            joined = self.past()
+            return User(
+                id=self.uuid(),
+                username=f'synth_user_{n}',
+                email=f'user{n}@{SYNTHETIC_EMAIL_DOMAIN}',
+                first_name=f'User{n}',
+                last_name='Synthetic',
+                password=password_hash,
+                role=role(),
+                is_active=self.rng.random() > 0.03,
+                date_joined=joined,
+                created_at=joined,
+                updated_at=joined,
+            )
+
+        self.bulk_insert('users', User, total, build)
+
+    def load_user_pool(self, zipf):
+        users = list(User.objects.filter(is_active=True).values_list('id', 'role'))
+        if not users:
+            self.users = self.managers = []
+            return
+        self.rng.shuffle(users)
+        self.users = [user_id for user_id, _ in users]
+        self.managers = [user_id for user_id, role in users if role in (User.Role.ADMIN, User.Role.MANAGER)] or self.users
+        # Zipf-distributed popularity: a few users carry most of the work
+        self.user_weights = list(itertools.accumulate(1 / (rank ** zipf) for rank in range(1, len(self.users) + 1)))
+
+    def zipf_user(self):
+        return self.rng.choices(self.users, cum_weights=self.user_weights)[0]
+
+    def generate_projects(self, total):
+        if not self.users:
+            self.stderr.write('  projects: skipped (no users)')
+            return
+        projects = []
+
+        def build(i):
+            created = self.past()
+            start_date = created.date()
+            project = Project(
+                id=self.uuid(),
+                name=f'Project {self.sentence(2).title()} {i}',
+                description=self.sentence(12),
+                start_date=start_date,
+                end_date=start_date + timedelta(days=self.rng.randint(30, 365)) if self.rng.random() < 0.7 else None,
+                manager_id=self.rng.choice(self.managers),
+                created_at=created,
+                updated_at=created,
+            )
+            projects.append(project.id)
+            return project
+
+        self.bulk_insert('projects', Project, total, build)
+
+        Membership = Project.members.through
+        memberships = []
+        for project_id in projects:
+            size = min(len(self.users), self.rng.randint(3, 15))
+            members = {self.zipf_user() for _ in range(size)}
+            memberships.extend(Membership(project_id=project_id, user_id=user_id) for user_id in members)
+        for offset in range(0, len(memberships), self.batch_size):
+            Membership.objects.bulk_create(memberships[offset:offset + self.batch_size], ignore_conflicts=True)
+        self.stdout.write(f'  project members: {len(memberships)} rows')
+
+    def generate_tasks(self, total):
+        if not self.users:
+            self.stderr.write('  tasks: skipped (no users)')
+            return
+        status = self.weighted(STATUS_WEIGHTS)
+        priority = self.weighted(PRIORITY_WEIGHTS)
+        # bulk_create skips Task.save(), which would hand out the ranks
+        statuses = [status() for _ in range(total)]
+        ranks = {column: iter(self.column_ranks(column, statuses.count(column))) for column, _ in Task.STATUS_CHOICES}
+
+        def build(i):
+            created = self.past()
+            task_status = statuses[i]
+            if self.rng.random() < 0.15:
+                deadline = None
+            elif task_status == Task.DONE:
+                deadline = created + timedelta(days=self.rng.expovariate(1 / 10))
+            elif self.rng.random() < OVERDUE_SHARE:
+                deadline = max(created, self.now - timedelta(days=self.rng.expovariate(1 / 5)))
+            else:
+                # Open work is mostly due soon, as the reminder and board benchmarks expect
+                deadline = self.now + timedelta(days=self.rng.expovariate(1 / 14))
+            updated = created
+            if task_status != Task.TODO:
+                updated = min(self.now, created + timedelta(days=self.rng.expovariate(1 / 5)))
+            return Task(
+                title=f'{self.rng.choice(VERBS)} {self.sentence(3)} #{i}',
+                description=self.sentence(20) if self.rng.random() < 0.8 else '',
+                status=task_status,
+                priority=priority(),
+                rank=next(ranks[task_status]),
+                deadline=deadline,
+                assignee_id=self.zipf_user() if self.rng.random() > 0.1 else None,
+                created_by_id=self.rng.choice(self.managers),
+                created_at=created,
+                updated_at=updated,
+            )
+
+        self.bulk_insert('tasks', Task, total, build)
+
+    def column_ranks(self, column, count):
+        """`count` ranks in order, after every task already in the `column` status"""
+        last = Task.objects.filter(status=column).aggregate(last=Max('rank'))['last']
+        if not last:
+            return spaced_ranks(count)
+        ranks = []
+        for _ in range(count):
+            last = rank_between(last)
+            ranks.append(last)
+        return ranks
+
+    def task_picker(self):
+        """Return a callable yielding random existing task ids, or None when there are no tasks"""
+        bounds = Task.objects.aggregate(low=Min('id'), high=Max('id'), total=Count('id'))
+        low, high = bounds['low'], bounds['high']
+        if low is None:
+            return None
+        if bounds['total'] == high - low + 1:
+            # Contiguous ids: no need to load them all
+            return lambda: self.rng.randint(low, high)
+        task_ids = list(Task.objects.values_list('id', flat=True))
+        return lambda: self.rng.choice(task_ids)
+
+    def generate_comments(self, total):
+        task_id = self.task_picker()
+        if task_id is None or not self.users:
+            self.stderr.write('  comments: skipped (no tasks)')
+            return
+
+        def build(i):
+            created = self.past()
+            return Comment(
+                id=self.uuid(),
+                task_id=task_id(),
+                author_id=self.zipf_user(),
+                content=self.sentence(self.rng.randint(4, 30)),
+                created_at=created,
+            )
+
+        self.bulk_insert('comments', Comment, total, build)
+
+    def generate_notifications(self, total):
+        task_id = self.task_picker()
+        if task_id is None or not self.users:
+            self.stderr.write('  notifications: skipped (no tasks)')
+            return
+        kind = self.weighted(NOTIFICATION_WEIGHTS)
+
+        def build(i):
+            created = self.past()
+            age = (self.now - created) / self.span
+            return Notification(
+                id=self.uuid(),
+                user_id=self.zipf_user(),
+                task_id=task_id(),
+                type=kind(),
+                message=f'Synthetic notification: {self.sentence(5)}',
+                # Older notifications are far more likely to have been read
+                is_read=self.rng.random() < 0.3 + 0.7 * age,
+                created_at=created,
+            )
+
+        self.bulk_insert('notifications', Notification, total, build)
+
+    def generate_activity_logs(self, total):
+        task_id = self.task_picker()
+        if task_id is None or not self.users:
+            self.stderr.write('  activity logs: skipped (no tasks)')
+            return
+        actions = ('created_task', 'updated_task', 'completed_task', 'commented')
+        project_ids = list(Project.objects.values_list('id', flat=True))
+
+        def build(i):
+            created = self.past()
+            if project_ids and self.rng.random() < 0.05:
+                action, model, object_id = 'created_project', 'Project', self.rng.choice(project_ids)
+            else:
+                action, model, object_id = self.rng.choice(actions), 'Task', task_id()
+            return ActivityLog(
+                id=self.uuid(),
+                user_id=self.zipf_user(),
+                action=action,
+                model=model,
+                object_id=str(object_id),
+                detail={'synthetic': True},
+                created_at=created,
+            )
+
+        self.bulk_insert('activity logs', ActivityLog, total, build)
@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tasks.reminders import send_deadline_reminders
+
+
+class Command(BaseCommand):
+    help = 'Send TASK_REMINDER notifications for deadlines inside the reminder windows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--loop', action='store_true', help='Keep running, one tick every --interval seconds')
+        parser.add_argument('--interval', type=int, default=None)
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.DEADLINE_REMINDER_INTERVAL
+        while True:
+            sent = send_deadline_reminders(batch_size=options['batch_size'])
+            summary = ', '.join(f'{window}: {count}' for window, count in sent.items())
+            self.stdout.write(self.style.SUCCESS(f'Sent {sum(sent.values())} reminders ({summary}).'))
+            if not options['loop']:
+                return
+            time.sleep(interval)
@@ -0,0 +1,25 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0007_task_priority'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DeadlineReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=20)),
+                ('deadline', models.DateTimeField()),
+                ('sent_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='deadline_reminders', to='tasks.task')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('task', 'window', 'deadline'), name='unique_deadline_reminder')],
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations
+
+from config.partitioning import partition_table, unpartition_table
+
+
+def partition(apps, schema_editor):
+    partition_table(schema_editor, apps.get_model('tasks', 'ActivityLog'))
+
+
+def unpartition(apps, schema_editor):
+    unpartition_table(schema_editor, apps.get_model('tasks', 'ActivityLog'))
+
+
+class Migration(migrations.Migration):
+    """Monthly created_at partitions on PostgreSQL; nothing to do elsewhere"""
+
+    dependencies = [
+        ('tasks', '0009_activitylog_created_at_default'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+from tasks.ranking import spaced_ranks
+
+PRIORITY_ORDER = {'high': 0, 'medium': 1, 'low': 2}
+
+
+def assign_ranks(apps, schema_editor):
+    # Start from the board's priority/deadline order
+    Task = apps.get_model('tasks', 'Task')
+    statuses = Task.objects.values_list('status', flat=True).distinct().order_by()
+    for status in list(statuses):
+        rows = list(Task.objects.filter(status=status).values_list('id', 'priority', 'deadline'))
+        rows.sort(key=lambda row: (PRIORITY_ORDER.get(row[1], 3), row[2] is None, row[2] or 0, row[0]))
+        tasks = [Task(id=row[0], rank=rank) for row, rank in zip(rows, spaced_ranks(len(rows)))]
+        Task.objects.bulk_update(tasks, ['rank'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0012_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedtask',
+            name='rank',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='rank',
+            field=models.CharField(blank=True, default='', editable=False, max_length=64),
+        ),
+        migrations.RunPython(assign_ranks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'rank'], name='tasks_status_ee0526_idx'),
+        ),
+    ]
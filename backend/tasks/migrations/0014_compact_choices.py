@@ -0,0 +1,119 @@
+from django.db import migrations, models, transaction
+from django.db.models import Case, Value, When
+
+import tasks.fields
+
+BATCH_SIZE = 1000
+STATUS_CHOICES = [('todo', 'Todo'), ('in_progress', 'In Progress'), ('done', 'Done')]
+STATUS_CODES = {'todo': 1, 'in_progress': 2, 'done': 3}
+PRIORITY_CHOICES = [('low', 'Low'), ('medium', 'Medium'), ('high', 'High')]
+PRIORITY_CODES = {'low': 1, 'medium': 2, 'high': 3}
+# model: ((column, codes, default), ...)
+COLUMNS = {
+    'task': (('status', STATUS_CODES, 'todo'), ('priority', PRIORITY_CODES, 'medium')),
+    'archivedtask': (('status', STATUS_CODES, 'done'), ('priority', PRIORITY_CODES, 'medium')),
+}
+
+
+def _recode(model, using, mappings):
+    """Apply {target: Case} updates in primary key batches, each in its own transaction"""
+    pks = model.objects.using(using).order_by('pk').values_list('pk', flat=True)
+    last = None
+    while True:
+        batch = list((pks if last is None else pks.filter(pk__gt=last))[:BATCH_SIZE])
+        if not batch:
+            return
+        with transaction.atomic(using=using):
+            model.objects.using(using).filter(pk__gte=batch[0], pk__lte=batch[-1]).update(**mappings)
+        last = batch[-1]
+
+
+def encode(apps, schema_editor):
+    for model_name, columns in COLUMNS.items():
+        model = apps.get_model('tasks', model_name)
+        _recode(model, schema_editor.connection.alias, {
+            f'{column}_code': Case(
+                *[When(**{column: value}, then=Value(code)) for value, code in codes.items()],
+                default=Value(codes[default]),
+            )
+            for column, codes, default in columns
+        })
+
+
+def decode(apps, schema_editor):
+    for model_name, columns in COLUMNS.items():
+        model = apps.get_model('tasks', model_name)
+        _recode(model, schema_editor.connection.alias, {
+            column: Case(
+                *[When(**{f'{column}_code': code}, then=Value(value)) for value, code in codes.items()],
+                default=Value(default),
+            )
+            for column, codes, default in columns
+        })
+
+
+class Migration(migrations.Migration):
+    # Rows are converted in short batches rather than one long transaction
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0013_task_rank'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(model_name='task', name='tasks_status_031d4c_idx'),
+        migrations.RemoveIndex(model_name='task', name='tasks_status_ee0526_idx'),
+        migrations.AddField(
+            model_name='task', name='status_code', field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='task', name='priority_code', field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedtask', name='status_code', field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.AddField(
+            model_name='archivedtask', name='priority_code', field=models.PositiveSmallIntegerField(null=True),
+        ),
+        migrations.RunPython(encode, decode),
+        migrations.RemoveField(model_name='task', name='status'),
+        migrations.RemoveField(model_name='task', name='priority'),
+        migrations.RemoveField(model_name='archivedtask', name='status'),
+        migrations.RemoveField(model_name='archivedtask', name='priority'),
+        migrations.RenameField(model_name='task', old_name='status_code', new_name='status'),
+        migrations.RenameField(model_name='task', old_name='priority_code', new_name='priority'),
+        migrations.RenameField(model_name='archivedtask', old_name='status_code', new_name='status'),
+        migrations.RenameField(model_name='archivedtask', old_name='priority_code', new_name='priority'),
+        migrations.AlterField(
+            model_name='task',
+            name='status',
+            field=tasks.fields.ChoiceIntegerField(choices=STATUS_CHOICES, codes=STATUS_CODES, default='todo'),
+        ),
+        migrations.AlterField(
+            model_name='task',
+            name='priority',
+            field=tasks.fields.ChoiceIntegerField(choices=PRIORITY_CHOICES, codes=PRIORITY_CODES, default='medium'),
+        ),
+        migrations.AlterField(
+            model_name='archivedtask',
+            name='status',
+            field=tasks.fields.ChoiceIntegerField(choices=STATUS_CHOICES, codes=STATUS_CODES, default='done'),
+        ),
+        migrations.AlterField(
+            model_name='archivedtask',
+            name='priority',
+            field=tasks.fields.ChoiceIntegerField(choices=PRIORITY_CHOICES, codes=PRIORITY_CODES, default='medium'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status'], name='tasks_status_031d4c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['status', 'rank'], name='tasks_status_ee0526_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='task',
+            index=models.Index(fields=['-priority', 'deadline'], name='tasks_priority_deadline_idx'),
+        ),
+    ]
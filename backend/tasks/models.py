@@ -1,8 +1,12 @@
 import uuid
 
 from django.db import models
+from django.db.models import Max
 from django.core.validators import MinLengthValidator
+from django.utils import timezone
 from users.models import User
+from .fields import ChoiceIntegerField
+from .ranking import rank_between
 
 
 class Task(models.Model):
@@ -16,15 +20,17 @@ class Task(models.Model):
         (IN_PROGRESS, 'In Progress'),
         (DONE, 'Done'),
     ]
+    # Stored codes: workflow order
+    STATUS_CODES = {TODO: 1, IN_PROGRESS: 2, DONE: 3}
     
     title = models.CharField(
         max_length=200,
         validators=[MinLengthValidator(3)]
     )
     description = models.TextField(blank=True)
-    status = models.CharField(
-        max_length=20,
+    status = ChoiceIntegerField(
         choices=STATUS_CHOICES,
+        codes=STATUS_CODES,
         default=TODO
     )
     
@@ -37,12 +43,16 @@ class Task(models.Model):
         (MEDIUM, 'Medium'),
         (HIGH, 'High'),
     ]
+    # Stored codes: -priority sorts high first
+    PRIORITY_CODES = {LOW: 1, MEDIUM: 2, HIGH: 3}
     
-    priority = models.CharField(
-        max_length=10,
+    priority = ChoiceIntegerField(
         choices=PRIORITY_CHOICES,
+        codes=PRIORITY_CODES,
         default=MEDIUM
     )
+    # Manual order within the status column (see tasks.ranking)
+    rank = models.CharField(max_length=64, blank=True, default='', editable=False)
     deadline = models.DateTimeField(null=True, blank=True)
     assignee = models.ForeignKey(
         User,
@@ -68,10 +78,25 @@ class Task(models.Model):
             models.Index(fields=['assignee']),
             models.Index(fields=['created_by']),
             models.Index(fields=['deadline']),
+            models.Index(fields=['status', 'rank']),
+            models.Index(fields=['-priority', 'deadline'], name='tasks_priority_deadline_idx'),
         ]
     
     def __str__(self):
         return f"{self.title} - {self.get_status_display()}"
+
+    def save(self, *args, **kwargs):
+        if not self.rank:
+            # New tasks go to the bottom of their column
+            self.rank = Task.end_rank(self.status)
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'rank'}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def end_rank(status):
+        """A rank after every task in the `status` column"""
+        return rank_between(Task.objects.filter(status=status).aggregate(last=Max('rank'))['last'])
     
     def can_be_edited_by(self, user):
         """Check if user can edit this task"""
@@ -92,6 +117,37 @@ class Task(models.Model):
         return False
 
 
+class ArchivedTask(models.Model):
+    """
+    A completed task moved out of the hot `tasks` table (see tasks.archive).
+
+    Same columns in the same order as Task, so the two tables can be read
+    with one UNION; the id is kept so links and activity logs stay valid.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True)
+    status = ChoiceIntegerField(choices=Task.STATUS_CHOICES, codes=Task.STATUS_CODES, default=Task.DONE)
+    priority = ChoiceIntegerField(choices=Task.PRIORITY_CHOICES, codes=Task.PRIORITY_CODES, default=Task.MEDIUM)
+    rank = models.CharField(max_length=64, blank=True, default='', editable=False)
+    deadline = models.DateTimeField(null=True, blank=True)
+    assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'tasks_archive'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.title} - {self.get_status_display()} (archived)"
+
+    def as_task(self):
+        """Unsaved Task with this row's values, for permission checks and serializers"""
+        return Task(**{field.attname: getattr(self, field.attname) for field in Task._meta.concrete_fields})
+
+
 class Notification(models.Model):
     """Simple notification for task events"""
 
@@ -121,11 +177,32 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Range scans for retention
+            models.Index(fields=["created_at"], name="tasks_notif_created_idx"),
+        ]
 
     def __str__(self):
         return f"{self.get_type_display()}: {self.message}"
 
 
+class DeadlineReminder(models.Model):
+    """A deadline reminder already sent for a task, window and deadline"""
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='deadline_reminders')
+    window = models.CharField(max_length=20)
+    # The deadline the reminder was for; moving the deadline re-arms every window
+    deadline = models.DateTimeField()
+    sent_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'window', 'deadline'], name='unique_deadline_reminder'),
+        ]
+
+    def __str__(self):
+        return f"{self.task_id} {self.window} @ {self.deadline}"
+
+
 class Comment(models.Model):
     """Task comments"""
 
@@ -142,6 +219,39 @@ class Comment(models.Model):
         return f"Comment by {self.author} on {self.task}"
 
 
+class ArchivedComment(models.Model):
+    """Comment of an archived task"""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name="comments")
+    author = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    content = models.TextField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "tasks_archivedcomment"
+        ordering = ["created_at"]
+
+
+class ArchivedNotification(models.Model):
+    """Notification about an archived task"""
+
+    id = models.UUIDField(primary_key=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    task = models.ForeignKey(ArchivedTask, on_delete=models.CASCADE, related_name="notifications")
+    type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES)
+    message = models.TextField()
+    is_read = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = "tasks_archivednotification"
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["created_at"], name="tasks_archnotif_created_idx"),
+        ]
+
+
 class Project(models.Model):
     """Project model grouping tasks and members"""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -171,7 +281,8 @@ class ActivityLog(models.Model):
     model = models.CharField(max_length=100, blank=True)
     object_id = models.CharField(max_length=100, blank=True)
     detail = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when the action happens; rows may be inserted later in a batch
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
 
     class Meta:
         ordering = ['-created_at']
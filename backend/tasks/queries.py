@@ -0,0 +1,141 @@
+"""
+Queryset builders shared by the sync viewsets and the async read endpoints.
+"""
+from django.db.models import Count, Q
+
+from .models import ArchivedTask, Task, Notification
+
+
+def get_role_kind(u):
+    """Return a simple role kind: 'admin' | 'manager' | 'member' | None
+
+    This centralizes heuristic mapping so views don't rely on
+    optional convenience properties that may not be present.
+    """
+    try:
+        # One memoized lookup instead of three is_* property checks
+        role_category = getattr(u, '_role_category', None)
+        if callable(role_category):
+            kind = role_category()
+            if kind:
+                return kind
+    except Exception:
+        # if these properties exist but error, ignore and fallback
+        pass
+
+    role = getattr(u, 'role', None)
+    if not role:
+        if getattr(u, 'is_superuser', False) or getattr(u, 'is_staff', False):
+            return 'admin'
+        return None
+
+    r = str(role).upper()
+    if 'ADMIN' in r or 'SYSTEM' in r or 'DIRECTOR' in r:
+        return 'admin'
+    if 'MANAGER' in r or 'OFFICER' in r:
+        return 'manager'
+    return 'member'
+
+
+def visible_tasks(user, params, role_kind=None, model=Task):
+    """Tasks `user` may see, filtered by the `status`/`assignee` query params
+
+    `model` is Task for the hot table or ArchivedTask for the archive.
+    """
+    role_kind = role_kind or get_role_kind(user)
+
+    # Base queryset based on role_kind
+    if role_kind == 'admin' or role_kind == 'manager':
+        queryset = model.objects.select_related('assignee', 'created_by').all()
+    elif role_kind == 'member':
+        queryset = model.objects.select_related('assignee', 'created_by').filter(
+            assignee=user
+        )
+    else:
+        return model.objects.none()
+
+    # Filter by status if provided
+    status_filter = params.get('status', None)
+    if status_filter:
+        if status_filter not in Task.STATUS_CODES:
+            # Stored as an integer code: an unknown status matches nothing
+            return queryset.none()
+        queryset = queryset.filter(status=status_filter)
+
+    # Filter by assignee if provided
+    assignee_filter = params.get('assignee', None)
+    if assignee_filter:
+        queryset = queryset.filter(assignee_id=assignee_filter)
+
+    return queryset
+
+
+def archived_tasks(user, params, role_kind=None):
+    return visible_tasks(user, params, role_kind, model=ArchivedTask)
+
+
+def include_archived(params):
+    """True for ?include_archived=true (or 1/yes)"""
+    return str(params.get('include_archived', '')).lower() in ('1', 'true', 'yes')
+
+
+def with_archived(hot, archived):
+    """
+    One UNION ALL queryset over hot and archived tasks, in `hot`'s ordering.
+
+    Filter both sides first: a union can still be ordered, sliced, counted
+    and narrowed with values_list(), but not filtered.
+    """
+    ordering = hot.query.order_by or hot.model._meta.ordering
+    return hot.order_by().union(archived.order_by(), all=True).order_by(*ordering)
+
+
+STATUS_KEYS = (
+    ('todo', Task.TODO),
+    ('in_progress', Task.IN_PROGRESS),
+    ('done', Task.DONE),
+)
+
+
+def statistics_aggregates(user, role_kind):
+    """Aggregate expressions computing every task statistic in a single query"""
+    aggregates = {'total': Count('id')}
+    for key, value in STATUS_KEYS:
+        aggregates[key] = Count('id', filter=Q(status=value))
+
+    # Add user-specific stats for members and managers (who also work on tasks)
+    if role_kind in ('member', 'manager'):
+        mine = Q(assignee=user)
+        aggregates['my_total'] = Count('id', filter=mine)
+        for key, value in STATUS_KEYS:
+            aggregates[f'my_{key}'] = Count('id', filter=mine & Q(status=value))
+    return aggregates
+
+
+def _add_counts(stats, more):
+    return {key: value + more[key] for key, value in stats.items()}
+
+
+def task_statistics(queryset, user, role_kind, archived=None):
+    """Counts over `queryset`, plus the `archived` queryset when given"""
+    aggregates = statistics_aggregates(user, role_kind)
+    stats = queryset.order_by().aggregate(**aggregates)
+    if archived is not None:
+        stats = _add_counts(stats, archived.order_by().aggregate(**aggregates))
+    return stats
+
+
+async def atask_statistics(queryset, user, role_kind, archived=None):
+    aggregates = statistics_aggregates(user, role_kind)
+    stats = await queryset.order_by().aaggregate(**aggregates)
+    if archived is not None:
+        stats = _add_counts(stats, await archived.order_by().aaggregate(**aggregates))
+    return stats
+
+
+def user_notifications(user):
+    return Notification.objects.select_related('task').filter(user=user)
+
+
+def unread_notifications(user):
+    return Notification.objects.filter(user=user, is_read=False)
@@ -0,0 +1,89 @@
+"""
+Fractional rank keys for manual task order.
+
+A rank is a base-36 string (``0-9a-z``) read as a fraction: ``"h"`` is
+17/36, ``"h8"`` sits between ``"h"`` and ``"i"``. Plain string comparison
+gives the same order (no key ends in ``0``, so no two keys are equal as
+fractions), which lets the database sort and index ranks as text.
+`rank_between` returns a key strictly between two neighbours, so placing
+a task never touches any other row. Between two keys it takes the shortest
+midpoint, which grows by about one character per five moves into the same
+gap; past either end of a column it steps by one unit in the STEP_WIDTH-th
+digit, so appends keep keys short. `spaced_ranks` hands out short, evenly
+spaced keys in the middle of the range when a column is rebalanced.
+"""
+ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+BASE = len(ALPHABET)
+_DIGITS = {char: value for value, char in enumerate(ALPHABET)}
+# Appends and prepends move by 1 / BASE ** STEP_WIDTH
+STEP_WIDTH = 4
+
+
+class RankError(ValueError):
+    pass
+
+
+def _validate(key):
+    if key and (key[-1] == ALPHABET[0] or any(char not in _DIGITS for char in key)):
+        raise RankError(f'Invalid rank {key!r}')
+
+
+def _midpoint(low, high):
+    # `low` may be '' (zero), `high` None (one); low < high as fractions
+    if high is not None:
+        common = 0
+        while (low[common] if common < len(low) else ALPHABET[0]) == high[common]:
+            common += 1
+        if common:
+            return high[:common] + _midpoint(low[common:], high[common:])
+    low_digit = _DIGITS[low[0]] if low else 0
+    high_digit = _DIGITS[high[0]] if high is not None else BASE
+    if high_digit - low_digit > 1:
+        return ALPHABET[(low_digit + high_digit + 1) // 2]
+    if high is not None and len(high) > 1:
+        return high[0]
+    # Consecutive first digits: keep low's and look further right
+    return ALPHABET[low_digit] + _midpoint(low[1:], None)
+
+
+def _encode(value, width):
+    digits = []
+    for _ in range(width):
+        value, digit = divmod(value, BASE)
+        digits.append(ALPHABET[digit])
+    return ''.join(reversed(digits)).rstrip(ALPHABET[0])
+
+
+def _decode(key, width):
+    return int(key.ljust(width, ALPHABET[0]), BASE)
+
+
+def rank_between(before=None, after=None):
+    """A key sorting after `before` and before `after` (None or '' for an open end)"""
+    before = before or ''
+    after = after or None
+    _validate(before)
+    _validate(after)
+    if after is not None and before >= after:
+        raise RankError(f'No rank between {before!r} and {after!r}')
+    if before and after is None:
+        width = max(len(before), STEP_WIDTH)
+        value = _decode(before, width) + 1
+        if value < BASE ** width:
+            return _encode(value, width)
+    elif after is not None and not before:
+        width = max(len(after), STEP_WIDTH)
+        value = _decode(after, width) - 1
+        if value > 0:
+            return _encode(value, width)
+    return _midpoint(before, after)
+
+
+def spaced_ranks(count):
+    """`count` short keys spread evenly over the middle half of the range, in order"""
+    width = 1
+    # At least BASE units between neighbours
+    while BASE ** width < 2 * (count + 1) * BASE:
+        width += 1
+    span = BASE ** width
+    return [_encode(span // 4 + position * span // (2 * (count + 1)), width) for position in range(1, count + 1)]
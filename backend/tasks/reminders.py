@@ -0,0 +1,133 @@
+"""
+Deadline reminders.
+
+Each tick looks at a few deadline ranges relative to now, one per window:
+with the default ``24h,1h`` windows plus overdue, a task is reminded once
+when its deadline is within 24 hours, again within the last hour, and
+once after it passes (for up to DEADLINE_REMINDER_OVERDUE_LOOKBACK_HOURS).
+
+Every window is a range scan on the ``deadline`` index, walked in
+``(deadline, id)`` keyset batches, so the cost of a tick depends on the
+tasks due inside the windows, not on the number of open tasks. Tasks that
+are done or unassigned are skipped. `DeadlineReminder` rows record what
+was sent (per task, window and deadline, so moving a deadline re-arms the
+reminders); candidates with a matching row are excluded in the query, and
+each batch inserts its reminder rows and TASK_REMINDER notifications with
+two bulk inserts in one transaction.
+
+Run it from a single process, normally the scheduler leader (it is the
+``tasks.send_deadline_reminders`` periodic task); two concurrent runs could
+both send a reminder before either commits.
+"""
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import DeadlineReminder, Notification, Task
+
+OVERDUE = 'overdue'
+_WINDOW_RE = re.compile(r'^(\d+)([mhd])$')
+_UNITS = {'m': ('minutes', 'minute'), 'h': ('hours', 'hour'), 'd': ('days', 'day')}
+
+
+def parse_window(label):
+    """'24h' -> timedelta(hours=24); minutes, hours and days are accepted"""
+    match = _WINDOW_RE.match(label.strip())
+    if not match:
+        raise ValueError(f'Invalid reminder window {label!r}; use e.g. 30m, 1h or 2d')
+    amount, unit = int(match.group(1)), match.group(2)
+    if amount <= 0:
+        raise ValueError(f'Reminder window {label!r} must be positive')
+    return timedelta(**{_UNITS[unit][0]: amount})
+
+
+def describe_window(label):
+    amount, unit = int(label[:-1]), label[-1]
+    plural, singular = _UNITS[unit]
+    return f"{amount} {singular if amount == 1 else plural}"
+
+
+def reminder_windows(now, labels=None, overdue_lookback=None):
+    """
+    Return [(window, start, end)]: reminders for deadlines in (start, end].
+
+    Lead windows are nested (the 24h window starts where the 1h one ends),
+    so every deadline falls in at most one window per tick.
+    """
+    labels = settings.DEADLINE_REMINDER_WINDOWS if labels is None else labels
+    if overdue_lookback is None:
+        overdue_lookback = timedelta(hours=settings.DEADLINE_REMINDER_OVERDUE_LOOKBACK_HOURS)
+    leads = sorted((parse_window(label), label.strip()) for label in labels)
+
+    windows = []
+    lower = timedelta(0)
+    for lead, label in leads:
+        windows.append((label, now + lower, now + lead))
+        lower = lead
+    if overdue_lookback:
+        windows.append((OVERDUE, now - overdue_lookback, now))
+    return windows
+
+
+def due_tasks(window, start, end):
+    """Open, assigned tasks with a deadline in (start, end] not yet reminded for `window`"""
+    already_sent = DeadlineReminder.objects.filter(
+        task=OuterRef('pk'), window=window, deadline=OuterRef('deadline')
+    )
+    return (
+        Task.objects.filter(deadline__gt=start, deadline__lte=end, assignee__isnull=False)
+        .exclude(status=Task.DONE)
+        .exclude(Exists(already_sent))
+        .order_by('deadline', 'pk')
+    )
+
+
+def reminder_message(window, title):
+    if window == OVERDUE:
+        return f"Task '{title}' is overdue."
+    return f"Task '{title}' is due within {describe_window(window)}."
+
+
+def _send(window, rows):
+    reminders = []
+    notifications = []
+    for pk, title, deadline, assignee_id in rows:
+        reminders.append(DeadlineReminder(task_id=pk, window=window, deadline=deadline))
+        notifications.append(Notification(
+            user_id=assignee_id,
+            task_id=pk,
+            type=Notification.TASK_REMINDER,
+            message=reminder_message(window, title),
+        ))
+    with transaction.atomic():
+        DeadlineReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+        Notification.objects.bulk_create(notifications)
+
+
+def send_deadline_reminders(now=None, batch_size=None, labels=None, overdue_lookback=None):
+    """Send every reminder due at `now`; return {window: reminders sent}"""
+    now = now or timezone.now()
+    batch_size = batch_size or settings.DEADLINE_REMINDER_BATCH_SIZE
+    sent = {}
+    for window, start, end in reminder_windows(now, labels, overdue_lookback):
+        candidates = due_tasks(window, start, end).values_list('pk', 'title', 'deadline', 'assignee_id')
+        sent[window] = 0
+        cursor = None
+        while True:
+            batch = candidates
+            if cursor is not None:
+                deadline, pk = cursor
+                batch = batch.filter(Q(deadline__gt=deadline) | Q(deadline=deadline, pk__gt=pk))
+            rows = list(batch[:batch_size])
+            if not rows:
+                break
+            _send(window, rows)
+            sent[window] += len(rows)
+            if len(rows) < batch_size:
+                break
+            cursor = (rows[-1][2], rows[-1][0])
+    return sent
@@ -3,10 +3,12 @@ from users.models import User
 from .models import Task, Notification, Comment
 from .models import Project, ActivityLog
 from users.serializers import UserSerializer
+from config.fragment_cache import FragmentCacheMixin, task_fragments
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for Task model"""
+    fragment_cache = task_fragments
     status_display = serializers.CharField(source='get_status_display', read_only=True)
     assignee_detail = UserSerializer(source='assignee', read_only=True)
     created_by_detail = UserSerializer(source='created_by', read_only=True)
@@ -14,7 +16,7 @@ class TaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Task
         fields = [
-            'id', 'title', 'description', 'status', 'status_display', 'priority',
+            'id', 'title', 'description', 'status', 'status_display', 'priority', 'rank',
             'deadline', 'assignee', 'assignee_detail',
             'created_by', 'created_by_detail',
             'created_at', 'updated_at'
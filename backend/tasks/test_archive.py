@@ -0,0 +1,206 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from jobs.models import Job
+from jobs.scheduler import periodic_tasks
+from users.models import User
+from .archive import archive_completed_tasks, restore_task
+from .models import (
+    ArchivedComment,
+    ArchivedNotification,
+    ArchivedTask,
+    Comment,
+    DeadlineReminder,
+    Notification,
+    Task,
+)
+
+
+def make_user(role):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'archive_{suffix}', email=f'archive_{suffix}@example.com', password='testpass123', role=role
+    )
+
+
+class ArchiveTestMixin:
+    def setUp(self):
+        self.manager = make_user(User.Role.MANAGER)
+        self.member = make_user(User.Role.MEMBER)
+        self.old_done = self.make_task('Old done', Task.DONE, days=200)
+        self.recent_done = self.make_task('Recent done', Task.DONE, days=5)
+        self.old_open = self.make_task('Old open', Task.IN_PROGRESS, days=200)
+
+    def make_task(self, title, status, days):
+        task = Task.objects.create(title=title, status=status, assignee=self.member, created_by=self.manager)
+        # updated_at is auto_now
+        Task.objects.filter(pk=task.pk).update(updated_at=timezone.now() - timedelta(days=days))
+        task.refresh_from_db()
+        return task
+
+
+class ArchiveTest(ArchiveTestMixin, TestCase):
+    """Test cases for moving tasks between the hot and archive tables"""
+
+    def test_moves_only_old_done_tasks(self):
+        self.assertEqual(archive_completed_tasks(days=90, pause=0), 1)
+        self.assertEqual(list(ArchivedTask.objects.values_list('pk', flat=True)), [self.old_done.pk])
+        self.assertEqual(
+            set(Task.objects.values_list('pk', flat=True)), {self.recent_done.pk, self.old_open.pk}
+        )
+        archived = ArchivedTask.objects.get()
+        self.assertEqual(
+            (archived.title, archived.assignee_id, archived.created_at, archived.updated_at),
+            (self.old_done.title, self.member.pk, self.old_done.created_at, self.old_done.updated_at),
+        )
+
+    def test_comments_and_notifications_follow(self):
+        comment = Comment.objects.create(task=self.old_done, author=self.member, content='Shipped')
+        notification = Notification.objects.create(
+            user=self.manager, task=self.old_done, type=Notification.TASK_DONE, message='Done'
+        )
+        DeadlineReminder.objects.create(task=self.old_done, window='1h', deadline=timezone.now())
+        archive_completed_tasks(days=90, pause=0)
+
+        self.assertFalse(Comment.objects.exists())
+        self.assertFalse(Notification.objects.exists())
+        self.assertFalse(DeadlineReminder.objects.exists())
+        archived_comment = ArchivedComment.objects.get()
+        self.assertEqual((archived_comment.pk, archived_comment.content), (comment.pk, 'Shipped'))
+        self.assertEqual(ArchivedNotification.objects.get().pk, notification.pk)
+
+    def test_batches(self):
+        for i in range(4):
+            self.make_task(f'Batch {i}', Task.DONE, days=200)
+        sleeps = []
+        self.assertEqual(archive_completed_tasks(days=90, batch_size=2, pause=0.5, sleep=sleeps.append), 5)
+        self.assertEqual(sleeps, [0.5, 0.5])
+
+    def test_zero_days_disables(self):
+        self.assertEqual(archive_completed_tasks(days=0), 0)
+        self.assertFalse(ArchivedTask.objects.exists())
+
+    def test_restore_brings_everything_back(self):
+        comment = Comment.objects.create(task=self.old_done, author=self.member, content='Shipped')
+        archive_completed_tasks(days=90, pause=0)
+        task = restore_task(self.old_done.pk)
+
+        self.assertEqual((task.pk, task.created_at), (self.old_done.pk, self.old_done.created_at))
+        # Fresh updated_at: not archived again on the next run
+        self.assertGreater(task.updated_at, self.old_done.updated_at)
+        self.assertEqual(Comment.objects.get().created_at, comment.created_at)
+        self.assertFalse(ArchivedTask.objects.exists())
+        self.assertFalse(ArchivedComment.objects.exists())
+        self.assertEqual(archive_completed_tasks(days=90, pause=0), 0)
+
+    def test_restore_unknown(self):
+        with self.assertRaises(ArchivedTask.DoesNotExist):
+            restore_task(self.recent_done.pk)
+
+    def test_scheduled_and_command(self):
+        self.assertIn('tasks.archive_completed_tasks', [task.name for task in periodic_tasks()])
+        out = StringIO()
+        call_command('archive_tasks', '--days', '90', stdout=out)
+        call_command('archive_tasks', '--restore', str(self.old_done.pk), stdout=out)
+        self.assertIn('Archived 1 tasks.', out.getvalue())
+        self.assertIn(f'Restored task {self.old_done.pk}', out.getvalue())
+        self.assertTrue(Task.objects.filter(pk=self.old_done.pk).exists())
+
+
+@override_settings(FAST_SERIALIZERS_ENABLED=True)
+class ArchiveApiTest(ArchiveTestMixin, TestCase):
+    """TaskViewSet reads hot tasks unless ?include_archived=true"""
+
+    def setUp(self):
+        super().setUp()
+        archive_completed_tasks(days=90, pause=0)
+        self.client = self.client_for(self.manager)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200, response.content)
+        return [task['id'] for task in response.json()['results']]
+
+    def test_list_is_hot_only_by_default(self):
+        self.assertNotIn(self.old_done.pk, self.ids(self.client.get('/api/tasks/')))
+        self.assertEqual(self.client.get(f'/api/tasks/{self.old_done.pk}/').status_code, 404)
+
+    def test_include_archived_lists_both(self):
+        response = self.client.get('/api/tasks/', {'include_archived': 'true', 'ordering': 'created_at'})
+        self.assertEqual(self.ids(response), [self.old_done.pk, self.recent_done.pk, self.old_open.pk])
+        self.assertEqual(response.json()['count'], 3)
+        archived = response.json()['results'][0]
+        self.assertEqual(archived['status_display'], 'Done')
+        self.assertEqual(archived['assignee_detail']['id'], str(self.member.pk))
+
+    @override_settings(FAST_SERIALIZERS_ENABLED=False)
+    def test_include_archived_without_fast_serializer(self):
+        response = self.client.get('/api/tasks/', {'include_archived': 'true', 'ordering': 'created_at'})
+        self.assertEqual(self.ids(response), [self.old_done.pk, self.recent_done.pk, self.old_open.pk])
+
+    def test_include_archived_applies_filters(self):
+        params = {'include_archived': 'true', 'status': Task.DONE, 'search': 'Old'}
+        self.assertEqual(self.ids(self.client.get('/api/tasks/', params)), [self.old_done.pk])
+        member = self.client_for(self.member)
+        self.assertEqual(
+            len(self.ids(member.get('/api/tasks/my_tasks/', {'include_archived': 'true'}))), 3
+        )
+
+    def test_statistics(self):
+        self.assertEqual(self.client.get('/api/tasks/statistics/').json()['done'], 1)
+        stats = self.client.get('/api/tasks/statistics/', {'include_archived': 'true'}).json()
+        self.assertEqual((stats['total'], stats['done']), (3, 2))
+
+    def test_retrieve_archived(self):
+        response = self.client.get(f'/api/tasks/{self.old_done.pk}/', {'include_archived': 'true'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Old done')
+        self.assertFalse(Task.objects.filter(pk=self.old_done.pk).exists())
+
+    def test_reopen_restores(self):
+        response = self.client.patch(f'/api/tasks/{self.old_done.pk}/', {'status': Task.TODO}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Task.objects.get(pk=self.old_done.pk).status, Task.TODO)
+        self.assertFalse(ArchivedTask.objects.exists())
+
+    def test_invalid_update_keeps_task_archived(self):
+        archived = ArchivedTask.objects.get(pk=self.old_done.pk)
+        response = self.client.patch(f'/api/tasks/{self.old_done.pk}/', {'title': 'ab'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post(f'/api/tasks/{self.old_done.pk}/move/', {'status': 'later'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        # A move that has to wait for a column rebalance
+        Task.objects.filter(pk=self.old_open.pk).update(rank='')
+        response = self.client.post(
+            f'/api/tasks/{self.old_done.pk}/move/',
+            {'status': Task.IN_PROGRESS, 'after_id': self.old_open.pk},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertTrue(Job.objects.filter(name='tasks.rebalance_ranks').exists())
+        self.assertFalse(Task.objects.filter(pk=self.old_done.pk).exists())
+        self.assertEqual(ArchivedTask.objects.get(pk=self.old_done.pk).updated_at, archived.updated_at)
+
+    def test_restore_action_checks_permissions(self):
+        other = self.client_for(make_user(User.Role.MEMBER))
+        self.assertEqual(other.post(f'/api/tasks/{self.old_done.pk}/restore/').status_code, 404)
+        response = self.client.post(f'/api/tasks/{self.old_done.pk}/restore/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.old_done.pk)
+        self.assertTrue(Task.objects.filter(pk=self.old_done.pk).exists())
+
+    def test_async_list_matches(self):
+        params = {'include_archived': 'true', 'ordering': 'created_at'}
+        sync = self.client.get('/api/tasks/', params)
+        self.assertEqual(self.client.get('/api/async/tasks/', params).json(), sync.json())
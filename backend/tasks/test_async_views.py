@@ -0,0 +1,100 @@
+import uuid
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from .models import Task, Notification
+
+
+def make_user(role):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'async_{suffix}',
+        email=f'async_{suffix}@example.com',
+        password='testpass123',
+        role=role,
+    )
+
+
+class AsyncReadEndpointsTest(TestCase):
+    """The async endpoints must return exactly what their sync counterparts do"""
+
+    def setUp(self):
+        self.manager = make_user(User.Role.MANAGER)
+        self.member = make_user(User.Role.MEMBER)
+        for i in range(25):
+            task = Task.objects.create(
+                title=f'Task {i}',
+                description='alpha' if i % 3 == 0 else 'beta',
+                status=[Task.TODO, Task.IN_PROGRESS, Task.DONE][i % 3],
+                assignee=self.member if i % 2 == 0 else self.manager,
+                created_by=self.manager,
+            )
+            Notification.objects.create(
+                user=self.member,
+                task=task,
+                type=Notification.TASK_ASSIGNED,
+                message=f'Assigned {i}',
+                is_read=i % 4 == 0,
+            )
+
+    def client_for(self, user):
+        client = APIClient()
+        token = RefreshToken.for_user(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def assertSameResponse(self, user, sync_url, async_url):
+        client = self.client_for(user)
+        sync_response = client.get(sync_url)
+        async_response = client.get(async_url)
+        self.assertEqual(async_response.status_code, sync_response.status_code)
+        # Pagination links point back at the endpoint that served the page
+        self.assertEqual(async_response.content.replace(b'/api/async/', b'/api/'), sync_response.content)
+        return async_response
+
+    def test_task_list_matches_sync(self):
+        for query in ('', '?page=2', '?search=alpha', '?ordering=deadline', '?status=done'):
+            with self.subTest(query=query):
+                self.assertSameResponse(self.manager, f'/api/tasks/{query}', f'/api/async/tasks/{query}')
+
+    def test_member_only_sees_own_tasks(self):
+        response = self.assertSameResponse(self.member, '/api/tasks/', '/api/async/tasks/')
+        self.assertEqual(response.json()['count'], 13)
+
+    def test_my_tasks_matches_sync(self):
+        self.assertSameResponse(self.manager, '/api/tasks/my_tasks/', '/api/async/tasks/my_tasks/')
+
+    def test_statistics_matches_sync(self):
+        for user in (self.manager, self.member):
+            with self.subTest(role=user.role):
+                self.assertSameResponse(user, '/api/tasks/statistics/', '/api/async/tasks/statistics/')
+
+    def test_statistics_is_a_single_query(self):
+        client = self.client_for(self.manager)
+        client.get('/api/tasks/statistics/')  # warm the auth caches
+        with self.assertNumQueries(1):
+            client.get('/api/tasks/statistics/')
+
+    def test_notifications_match_sync(self):
+        self.assertSameResponse(self.member, '/api/notifications/', '/api/async/notifications/')
+        response = self.assertSameResponse(
+            self.member, '/api/notifications/unread_count/', '/api/async/notifications/unread_count/'
+        )
+        self.assertEqual(response.json(), {'unread': 18})
+
+    def test_invalid_page_is_404(self):
+        self.assertSameResponse(self.manager, '/api/tasks/?page=99', '/api/async/tasks/?page=99')
+
+    def test_requires_authentication(self):
+        sync_response = APIClient().get('/api/tasks/')
+        async_response = APIClient().get('/api/async/tasks/')
+        self.assertEqual(async_response.status_code, 401)
+        self.assertEqual(async_response.content, sync_response.content)
+        self.assertEqual(async_response['WWW-Authenticate'], sync_response['WWW-Authenticate'])
+
+    def test_rejects_writes(self):
+        response = self.client_for(self.manager).post('/api/async/tasks/', {})
+        self.assertEqual(response.status_code, 405)
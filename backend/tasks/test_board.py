@@ -0,0 +1,129 @@
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from .board import board_tasks, decode_cursor, encode_cursor
+from .models import Task
+
+
+def make_user(role):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'board_{suffix}', email=f'board_{suffix}@example.com', password='testpass123', role=role
+    )
+
+
+class BoardTest(TestCase):
+    """Test cases for the kanban board endpoint"""
+
+    def setUp(self):
+        self.manager = make_user(User.Role.MANAGER)
+        self.member = make_user(User.Role.MEMBER)
+        now = timezone.now()
+        self.low = self.make(Task.TODO, Task.LOW, now + timedelta(days=1))
+        self.high_late = self.make(Task.TODO, Task.HIGH, now + timedelta(days=5))
+        self.high_soon = self.make(Task.TODO, Task.HIGH, now + timedelta(days=2))
+        self.high_undated = self.make(Task.TODO, Task.HIGH, None)
+        self.medium = self.make(Task.TODO, Task.MEDIUM, now)
+        self.started = self.make(Task.IN_PROGRESS, Task.LOW, None, assignee=self.member)
+        self.client = self.client_for(self.manager)
+
+    def make(self, status, priority, deadline, assignee=None):
+        return Task.objects.create(
+            title=f'{status} {priority}', status=status, priority=priority, deadline=deadline,
+            assignee=assignee, created_by=self.manager,
+        )
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def board(self, client=None, **params):
+        response = (client or self.client).get('/api/tasks/board/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return {column['status']: column for column in response.json()['columns']}
+
+    def ids(self, column):
+        return [task['id'] for task in column['results']]
+
+    def test_one_query_for_every_column(self):
+        with self.assertNumQueries(1):
+            rows = list(board_tasks(Task.objects.all(), 2).values_list('id', 'status', 'column_total'))
+        self.assertEqual(
+            rows, [(self.high_soon.pk, Task.TODO, 5), (self.high_late.pk, Task.TODO, 5), (self.started.pk, Task.IN_PROGRESS, 1)]
+        )
+
+    def test_columns_ordered_by_priority_then_deadline(self):
+        with CaptureQueriesContext(connection) as queries:
+            columns = self.board()
+        self.assertEqual(sum('ROW_NUMBER' in query['sql'] for query in queries), 1)
+        self.assertEqual(list(columns), [Task.TODO, Task.IN_PROGRESS, Task.DONE])
+        self.assertEqual(
+            self.ids(columns[Task.TODO]),
+            [self.high_soon.pk, self.high_late.pk, self.high_undated.pk, self.medium.pk, self.low.pk],
+        )
+        self.assertEqual((columns[Task.TODO]['count'], columns[Task.TODO]['next']), (5, None))
+        self.assertEqual(columns[Task.TODO]['label'], 'Todo')
+        self.assertEqual(columns[Task.TODO]['results'][0]['title'], 'todo high')
+        self.assertEqual((columns[Task.DONE]['count'], columns[Task.DONE]['results']), (0, []))
+
+    def test_limit_and_cursor_walk_a_column(self):
+        columns = self.board(limit=2)
+        todo = columns[Task.TODO]
+        self.assertEqual((todo['count'], self.ids(todo)), (5, [self.high_soon.pk, self.high_late.pk]))
+        self.assertIsNone(columns[Task.IN_PROGRESS]['next'])
+
+        seen = self.ids(todo)
+        cursor = todo['next']
+        while cursor:
+            response = self.client.get('/api/tasks/board/', {'column': Task.TODO, 'cursor': cursor, 'limit': 2})
+            self.assertEqual(response.status_code, 200)
+            seen += self.ids(response.json())
+            cursor = response.json()['next']
+        self.assertEqual(seen, [self.high_soon.pk, self.high_late.pk, self.high_undated.pk, self.medium.pk, self.low.pk])
+
+    @override_settings(FAST_SERIALIZERS_ENABLED=False)
+    def test_without_fast_serializer(self):
+        fast = self.board(limit=2)
+        self.assertEqual(self.ids(fast[Task.TODO]), [self.high_soon.pk, self.high_late.pk])
+        response = self.client.get(
+            '/api/tasks/board/', {'column': Task.TODO, 'cursor': fast[Task.TODO]['next'], 'limit': 2}
+        )
+        self.assertEqual(self.ids(response.json()), [self.high_undated.pk, self.medium.pk])
+
+    def test_members_see_their_own_tasks(self):
+        columns = self.board(client=self.client_for(self.member))
+        self.assertEqual(self.ids(columns[Task.IN_PROGRESS]), [self.started.pk])
+        self.assertEqual(columns[Task.TODO]['count'], 0)
+
+    def test_rank_ordering(self):
+        columns = self.board(ordering='rank', limit=2)
+        # Ranks follow creation until tasks are moved
+        self.assertEqual(self.ids(columns[Task.TODO]), [self.low.pk, self.high_late.pk])
+        response = self.client.get(
+            '/api/tasks/board/', {'column': Task.TODO, 'cursor': columns[Task.TODO]['next'], 'ordering': 'rank'}
+        )
+        self.assertEqual(self.ids(response.json()), [self.high_soon.pk, self.high_undated.pk, self.medium.pk])
+
+    def test_bad_parameters(self):
+        for params in (
+            {'column': 'later'}, {'column': Task.TODO, 'cursor': 'nope'}, {'limit': 'many'}, {'ordering': 'title'},
+        ):
+            self.assertEqual(self.client.get('/api/tasks/board/', params).status_code, 400, params)
+
+    def test_cursor_round_trip(self):
+        deadline = timezone.now().replace(microsecond=0)
+        self.assertEqual(decode_cursor(encode_cursor((Task.HIGH, deadline, 7))), (Task.HIGH, deadline, 7))
+        self.assertEqual(decode_cursor(encode_cursor((Task.LOW, None, 3))), (Task.LOW, None, 3))
+        self.assertEqual(decode_cursor(encode_cursor(('i', 3), 'rank'), 'rank'), ('i', 3))
+        for cursor in ('e30', encode_cursor(('i', 3), 'rank'), encode_cursor((2, None, 3))):
+            with self.assertRaises(ValueError):
+                decode_cursor(cursor)
@@ -0,0 +1,128 @@
+import uuid
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from config.fast_serializer import FastSerializer, fast_serializer_for
+from config.fragment_cache import task_fragments, user_fragments
+from users.models import User
+from .models import Task, Notification, ActivityLog
+from .serializers import TaskSerializer, NotificationSerializer, ActivityLogSerializer, ProjectSerializer
+
+
+def make_user(**extra):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'fast_{suffix}', email=f'fast_{suffix}@example.com', password='testpass123', **extra
+    )
+
+
+class FastSerializerTest(TestCase):
+    """The values_list() path must render exactly what the DRF serializers do"""
+
+    def setUp(self):
+        task_fragments.clear()
+        user_fragments.clear()
+        self.manager = make_user(role=User.Role.MANAGER, first_name='Mia', profile_image='profiles/mia.png')
+        self.member = make_user(role=User.Role.MEMBER, middle_name='Q', phone_number='+15550100')
+        for i in range(6):
+            task = Task.objects.create(
+                title=f'Task {i}',
+                description='' if i % 2 else f'Details {i}',
+                status=[Task.TODO, Task.IN_PROGRESS, Task.DONE][i % 3],
+                deadline=timezone.now() + timedelta(days=i) if i % 3 else None,
+                assignee=self.member if i % 2 == 0 else None,
+                created_by=self.manager,
+            )
+            Notification.objects.create(
+                user=self.member, task=task, type=Notification.TASK_ASSIGNED, message=f'N{i}'
+            )
+            ActivityLog.objects.create(
+                user=self.manager if i % 2 else None, action='update', model='Task',
+                object_id=str(task.id), detail={'step': i, 'tags': ['a', None]},
+            )
+        self.request = APIRequestFactory().get('/api/tasks/', HTTP_HOST='testserver')
+
+    def assertSameJSON(self, serializer_class, queryset):
+        context = {'request': self.request}
+        expected = JSONRenderer().render(serializer_class(queryset, many=True, context=context).data)
+        fast = fast_serializer_for(serializer_class)
+        self.assertIsNotNone(fast)
+        actual = JSONRenderer().render(fast.serialize(fast.rows(queryset), context))
+        self.assertEqual(actual, expected)
+
+    def test_tasks_match_byte_for_byte(self):
+        self.assertSameJSON(TaskSerializer, Task.objects.select_related('assignee', 'created_by'))
+
+    def test_notifications_match_byte_for_byte(self):
+        self.assertSameJSON(NotificationSerializer, Notification.objects.select_related('task'))
+
+    def test_dotted_source_through_null_relation(self):
+        # DRF omits user_email when the log has no user and keeps user_role as null
+        serializer_class = type('DottedLogSerializer', (ActivityLogSerializer,), {
+            'user_email': serializers.CharField(source='user.email', read_only=True),
+            'user_role': serializers.CharField(source='user.get_role_display', read_only=True, allow_null=True),
+            'Meta': type('Meta', (ActivityLogSerializer.Meta,), {
+                'fields': ActivityLogSerializer.Meta.fields + ['user_email', 'user_role'],
+            }),
+        })
+        self.assertSameJSON(serializer_class, ActivityLog.objects.all())
+
+    def test_activity_logs_match_byte_for_byte(self):
+        self.assertSameJSON(ActivityLogSerializer, ActivityLog.objects.all())
+
+    def test_rows_are_a_single_query(self):
+        fast = FastSerializer(TaskSerializer)
+        with CaptureQueriesContext(connection) as captured:
+            fast.serialize(fast.rows(Task.objects.all()))
+        self.assertEqual(len(captured), 1)
+
+    def test_unsupported_serializer_falls_back(self):
+        # Project.members is many-to-many
+        self.assertIsNone(fast_serializer_for(ProjectSerializer))
+
+    @override_settings(FAST_SERIALIZERS_ENABLED=False)
+    def test_can_be_disabled(self):
+        self.assertIsNone(fast_serializer_for(TaskSerializer))
+
+
+class FastListEndpointTest(TestCase):
+    """List endpoints serve the same bytes with and without the fast path"""
+
+    def setUp(self):
+        self.manager = make_user(role=User.Role.MANAGER)
+        self.member = make_user(role=User.Role.MEMBER)
+        for i in range(25):
+            task = Task.objects.create(
+                title=f'Task {i}', assignee=self.member if i % 3 else None, created_by=self.manager
+            )
+            Notification.objects.create(user=self.member, task=task, type=Notification.TASK_DONE, message=f'N{i}')
+            ActivityLog.objects.create(user=self.member, action='create', detail={'i': i})
+
+    def get(self, user, url):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client.get(url)
+
+    def test_endpoints_match_serializer_path(self):
+        cases = [
+            (self.manager, '/api/tasks/'),
+            (self.manager, '/api/tasks/?page=2&ordering=deadline'),
+            (self.member, '/api/tasks/my_tasks/'),
+            (self.member, '/api/notifications/'),
+            (self.member, '/api/activity/'),
+        ]
+        for user, url in cases:
+            with self.subTest(url=url):
+                fast = self.get(user, url)
+                with override_settings(FAST_SERIALIZERS_ENABLED=False):
+                    slow = self.get(user, url)
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
@@ -0,0 +1,76 @@
+import uuid
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import User
+from .archive import archive_tasks
+from .models import ArchivedTask, Task
+
+
+class ChoiceIntegerFieldTest(TestCase):
+    """Task.status and Task.priority are stored as small integer codes"""
+
+    def setUp(self):
+        suffix = uuid.uuid4().hex[:8]
+        self.manager = User.objects.create_user(
+            username=f'codes_{suffix}', email=f'codes_{suffix}@example.com', password='testpass123',
+            role=User.Role.MANAGER,
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.manager).access_token}')
+
+    def make(self, title, priority, status=Task.TODO, deadline=None):
+        return Task.objects.create(
+            title=title, priority=priority, status=status, deadline=deadline, created_by=self.manager
+        )
+
+    def stored(self, table, pk):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT status, priority FROM {table} WHERE id = %s', [pk])
+            return cursor.fetchone()
+
+    def test_round_trip(self):
+        task = self.make('Ship it', Task.HIGH, Task.IN_PROGRESS)
+        self.assertEqual(self.stored('tasks', task.pk), (2, 3))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.priority), (Task.IN_PROGRESS, Task.HIGH))
+        self.assertEqual(task.get_priority_display(), 'High')
+        self.assertEqual(Task.objects.filter(status__in=[Task.IN_PROGRESS]).get(), task)
+        self.assertEqual(list(Task.objects.values_list('priority', flat=True)), [Task.HIGH])
+
+    def test_archive_keeps_codes(self):
+        task = self.make('Old', Task.LOW, Task.DONE)
+        archive_tasks([task.pk])
+        self.assertEqual(self.stored('tasks_archive', task.pk), (3, 1))
+        self.assertEqual(ArchivedTask.objects.get().priority, Task.LOW)
+
+    def test_order_by_priority(self):
+        low = self.make('Low', Task.LOW)
+        high = self.make('High', Task.HIGH)
+        medium = self.make('Medium', Task.MEDIUM)
+        response = self.client.get('/api/tasks/', {'ordering': '-priority,deadline'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([task['id'] for task in response.json()['results']], [high.pk, medium.pk, low.pk])
+        self.assertEqual(response.json()['results'][0]['priority'], 'high')
+
+    def test_api_accepts_strings(self):
+        response = self.client.post(
+            '/api/tasks/', {'title': 'New task', 'priority': Task.HIGH, 'status': Task.IN_PROGRESS}, format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(Task.objects.get().priority, Task.HIGH)
+        response = self.client.post('/api/tasks/', {'title': 'Bad task', 'priority': 3}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unknown_status_filter_matches_nothing(self):
+        self.make('Task', Task.LOW)
+        response = self.client.get('/api/tasks/', {'status': 'later'})
+        self.assertEqual((response.status_code, response.json()['count']), (200, 0))
+
+    @skipUnless(connection.vendor == 'sqlite', 'PostgreSQL prefers a sequential scan on tiny tables')
+    def test_priority_order_uses_index(self):
+        self.assertIn('tasks_priority_deadline_idx', Task.objects.order_by('-priority', 'deadline').explain())
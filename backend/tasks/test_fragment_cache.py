@@ -0,0 +1,88 @@
+import uuid
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+
+from config.cache_utils import LRUCache
+from config.fragment_cache import task_fragments, user_fragments
+from users.models import User
+from users.serializers import UserSerializer
+from .models import Task
+from .serializers import TaskSerializer
+
+
+class UncachedTaskSerializer(TaskSerializer):
+    fragment_cache = None
+    assignee_detail = type('UncachedUserSerializer', (UserSerializer,), {'fragment_cache': None})(
+        source='assignee', read_only=True
+    )
+
+
+def make_user(**extra):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'frag_{suffix}', email=f'frag_{suffix}@example.com', password='testpass123', **extra
+    )
+
+
+class FragmentCacheTest(TestCase):
+    """Test cases for the per-object serialized fragment cache"""
+
+    def setUp(self):
+        task_fragments.clear()
+        user_fragments.clear()
+        self.manager = make_user(role=User.Role.MANAGER, first_name='Mia')
+        self.member = make_user(role=User.Role.MEMBER, first_name='Sam')
+        self.tasks = [
+            Task.objects.create(title=f'Task {i}', assignee=self.member, created_by=self.manager)
+            for i in range(5)
+        ]
+
+    def serialize(self, serializer_class=TaskSerializer, context=None):
+        queryset = Task.objects.select_related('assignee', 'created_by').order_by('id')
+        return serializer_class(queryset, many=True, context=context or {}).data
+
+    def test_matches_uncached_output(self):
+        expected = self.serialize(UncachedTaskSerializer)
+        self.assertEqual(self.serialize(), expected)
+        # Second pass is assembled from fragments and must still be identical
+        self.assertEqual(self.serialize(), expected)
+        self.assertEqual(list(self.serialize()[0]), list(expected[0]))
+
+    def test_second_pass_hits(self):
+        self.serialize()
+        misses = task_fragments.misses
+        self.serialize()
+        self.assertEqual(task_fragments.misses, misses)
+        self.assertGreaterEqual(task_fragments.hits, len(self.tasks))
+        self.assertGreater(user_fragments.hits, 0)
+
+    def test_saved_task_is_reserialized(self):
+        self.serialize()
+        task = self.tasks[0]
+        task.title = 'Renamed'
+        task.save()
+        data = {row['id']: row for row in self.serialize()}
+        self.assertEqual(data[task.id]['title'], 'Renamed')
+
+    def test_nested_user_change_reaches_cached_tasks(self):
+        self.serialize()
+        self.member.first_name = 'Samantha'
+        self.member.save()
+        for row in self.serialize():
+            self.assertEqual(row['assignee_detail']['first_name'], 'Samantha')
+
+    @override_settings(ALLOWED_HOSTS=['a.example.com', 'b.example.com'])
+    def test_request_origin_is_part_of_the_key(self):
+        request = APIRequestFactory().get('/api/tasks/', HTTP_HOST='a.example.com')
+        other = APIRequestFactory().get('/api/tasks/', HTTP_HOST='b.example.com')
+        serializer = TaskSerializer(context={'request': request})
+        other_serializer = TaskSerializer(context={'request': other})
+        self.assertNotEqual(serializer.fragment_key(self.tasks[0]), other_serializer.fragment_key(self.tasks[0]))
+
+    def test_memory_is_bounded(self):
+        small = LRUCache(maxsize=2, name='test')
+        serializer_class = type('SmallCacheTaskSerializer', (TaskSerializer,), {'fragment_cache': small})
+        self.serialize(serializer_class)
+        self.assertEqual(len(small), 2)
+        self.assertEqual(small.stats()['evictions'], len(self.tasks) - 2)
@@ -0,0 +1,214 @@
+import random
+import uuid
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from jobs.models import Job
+from users.models import User
+from .board import RebalanceNeeded, move_task, rebalance_column
+from .jobs import run_rank_rebalances
+from .models import Notification, Task
+from .ranking import RankError, rank_between, spaced_ranks
+
+
+def make_user(role):
+    suffix = uuid.uuid4().hex[:8]
+    return User.objects.create_user(
+        username=f'rank_{suffix}', email=f'rank_{suffix}@example.com', password='testpass123', role=role
+    )
+
+
+class RankKeyTest(TestCase):
+    """Test cases for fractional rank keys"""
+
+    def test_between_neighbours(self):
+        self.assertEqual(rank_between(), 'i')
+        for before, after in (('', 'i'), ('i', None), ('a', 'b'), ('az', 'b'), ('a', 'a01'), ('zzz', None)):
+            rank = rank_between(before, after)
+            self.assertGreater(rank, before)
+            if after is not None:
+                self.assertLess(rank, after)
+            self.assertNotEqual(rank[-1], '0')
+
+    def test_invalid(self):
+        for before, after in (('b', 'a'), ('a', 'a'), ('a0', None), ('A', None)):
+            with self.assertRaises(RankError):
+                rank_between(before, after)
+
+    def test_random_inserts_stay_ordered(self):
+        rng = random.Random(49)
+        keys = [rank_between()]
+        for _ in range(500):
+            position = rng.randint(0, len(keys))
+            before = keys[position - 1] if position else None
+            after = keys[position] if position < len(keys) else None
+            keys.insert(position, rank_between(before, after))
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(len(set(keys)), len(keys))
+
+    def test_appends_stay_short(self):
+        key = None
+        for _ in range(1000):
+            key = rank_between(key)
+        self.assertLessEqual(len(key), 4)
+
+    def test_spaced_ranks(self):
+        for count in (0, 1, 35, 36, 1000):
+            ranks = spaced_ranks(count)
+            self.assertEqual(len(ranks), count)
+            self.assertEqual(ranks, sorted(set(ranks)))
+            if ranks:
+                self.assertLess(rank_between(ranks[-1]), 'z')
+                self.assertGreater(rank_between(None, ranks[0]), '1')
+
+
+class MoveTest(TestCase):
+    """Test cases for drag-and-drop moves on the board"""
+
+    def setUp(self):
+        self.manager = make_user(User.Role.MANAGER)
+        self.member = make_user(User.Role.MEMBER)
+        self.todo = [self.make(f'Todo {i}', Task.TODO) for i in range(4)]
+        self.started = self.make('Started', Task.IN_PROGRESS, assignee=self.member)
+        self.client = self.client_for(self.manager)
+
+    def make(self, title, status, assignee=None):
+        return Task.objects.create(title=title, status=status, assignee=assignee, created_by=self.manager)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def column(self, status):
+        return list(Task.objects.filter(status=status).order_by('rank', 'id').values_list('pk', flat=True))
+
+    def move(self, task, client=None, **data):
+        return (client or self.client).post(f'/api/tasks/{task.pk}/move/', data, format='json')
+
+    def test_new_tasks_go_last(self):
+        self.assertEqual(self.column(Task.TODO), [task.pk for task in self.todo])
+        self.assertTrue(all(task.rank for task in self.todo))
+
+    def test_move_writes_one_row(self):
+        first, second, third, fourth = self.todo
+        before = dict(Task.objects.values_list('pk', 'rank'))
+        with self.assertNumQueries(2):
+            # Neighbour lookup, then the task's own UPDATE
+            move_task(fourth, after=first)
+        self.assertEqual(self.column(Task.TODO), [first.pk, fourth.pk, second.pk, third.pk])
+        after = dict(Task.objects.values_list('pk', 'rank'))
+        self.assertEqual({pk for pk in before if before[pk] != after[pk]}, {fourth.pk})
+
+    def test_move_api(self):
+        first, second, third, fourth = self.todo
+        response = self.move(first, before_id=fourth.pk)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column(Task.TODO), [second.pk, third.pk, first.pk, fourth.pk])
+        self.assertEqual(response.json()['rank'], Task.objects.get(pk=first.pk).rank)
+
+        self.move(fourth, after_id=second.pk, before_id=third.pk)
+        self.assertEqual(self.column(Task.TODO), [second.pk, fourth.pk, third.pk, first.pk])
+        self.move(third)
+        self.assertEqual(self.column(Task.TODO), [second.pk, fourth.pk, first.pk, third.pk])
+
+    def test_move_between_columns_notifies(self):
+        response = self.move(self.todo[0], status=Task.IN_PROGRESS, before_id=self.started.pk)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column(Task.IN_PROGRESS), [self.todo[0].pk, self.started.pk])
+        self.assertTrue(
+            Notification.objects.filter(task=self.todo[0], type=Notification.TASK_STARTED).exists()
+        )
+
+    def test_bad_moves(self):
+        first, second = self.todo[:2]
+        for data in (
+            {'status': 'later'},
+            {'after_id': self.started.pk},
+            {'after_id': first.pk},
+            {'before_id': 'x'},
+            {'after_id': second.pk, 'before_id': self.todo[2].pk, 'status': Task.DONE},
+        ):
+            self.assertEqual(self.move(first, **data).status_code, 400, data)
+        # Neighbours given the wrong way round
+        self.assertEqual(self.move(self.todo[3], after_id=second.pk, before_id=first.pk).status_code, 400)
+
+    def test_members_move_only_their_tasks(self):
+        member = self.client_for(self.member)
+        self.assertEqual(self.move(self.started, client=member, status=Task.DONE).status_code, 200)
+        self.assertEqual(self.move(self.todo[0], client=member).status_code, 404)
+
+    def test_status_change_goes_last_in_new_column(self):
+        response = self.client.patch(f'/api/tasks/{self.started.pk}/', {'status': Task.TODO}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self.column(Task.TODO)[-1], self.started.pk)
+
+    def test_tied_ranks_queue_rebalance(self):
+        first, second, third, fourth = self.todo
+        Task.objects.filter(pk__in=[first.pk, second.pk]).update(rank='i')
+        before = dict(Task.objects.values_list('pk', 'rank'))
+        response = self.move(fourth, after_id=first.pk, before_id=second.pk)
+        self.assertEqual(response.status_code, 409)
+        # Nothing moved or rebalanced in the request
+        self.assertEqual(dict(Task.objects.values_list('pk', 'rank')), before)
+        self.assertEqual(Job.objects.get(name='tasks.rebalance_ranks').payload, {'status': Task.TODO})
+
+        rebalance_column(Task.TODO)
+        self.assertEqual(self.move(fourth, after_id=first.pk, before_id=second.pk).status_code, 200)
+        self.assertEqual(self.column(Task.TODO), [first.pk, fourth.pk, second.pk, third.pk])
+
+    @override_settings(TASK_RANK_REBALANCE_LENGTH=1)
+    def test_move_writes_only_its_row(self):
+        first, second, third, fourth = self.todo
+        before = dict(Task.objects.values_list('pk', 'rank'))
+        self.assertEqual(self.move(fourth, after_id=first.pk, before_id=second.pk).status_code, 200)
+        after = dict(Task.objects.values_list('pk', 'rank'))
+        self.assertEqual([pk for pk in before if before[pk] != after[pk]], [fourth.pk])
+        # The rebalance the long key asked for waits for a worker or the scheduler
+        self.assertTrue(Job.objects.filter(name='tasks.rebalance_ranks', status=Job.Status.QUEUED).exists())
+        self.assertEqual(run_rank_rebalances(), 1)
+        self.assertEqual(self.column(Task.TODO), [first.pk, fourth.pk, second.pk, third.pk])
+        self.assertFalse(Job.objects.filter(name='tasks.rebalance_ranks', status=Job.Status.QUEUED).exists())
+
+    def test_unranked_neighbour(self):
+        Task.objects.update(rank='')
+        first, second = Task.objects.filter(status=Task.TODO).order_by('pk')[:2]
+        with self.assertRaises(RebalanceNeeded):
+            move_task(self.todo[3], before=second)
+        rebalance_column(Task.TODO)
+        second.refresh_from_db()
+        move_task(self.todo[3], before=second)
+        self.assertEqual(self.column(Task.TODO), [first.pk, self.todo[3].pk, second.pk, self.todo[2].pk])
+
+    @override_settings(TASK_RANK_REBALANCE_LENGTH=3)
+    def test_long_keys_queue_rebalance(self):
+        first, second = self.todo[:2]
+        for _ in range(3):
+            self.move(self.todo[3], after_id=first.pk, before_id=second.pk)
+            self.move(self.todo[2], after_id=first.pk, before_id=self.todo[3].pk)
+        queued = Job.objects.filter(name='tasks.rebalance_ranks')
+        self.assertTrue(queued.exists())
+        self.assertEqual(queued.first().payload, {'status': Task.TODO})
+
+        order = self.column(Task.TODO)
+        self.assertEqual(rebalance_column(Task.TODO), 4)
+        self.assertEqual(self.column(Task.TODO), order)
+        self.assertTrue(all(len(rank) <= 2 for rank in Task.objects.values_list('rank', flat=True)))
+
+    def test_rebalance_refreshes_cached_tasks(self):
+        Task.objects.filter(pk__in=[task.pk for task in self.todo]).update(rank='i')
+        task = self.todo[0]
+        # Caches the serialized task
+        self.assertEqual(self.client.get(f'/api/tasks/{task.pk}/').json()['rank'], 'i')
+        rebalance_column(Task.TODO)
+        rank = Task.objects.get(pk=task.pk).rank
+        self.assertNotEqual(rank, 'i')
+        self.assertEqual(self.client.get(f'/api/tasks/{task.pk}/').json()['rank'], rank)
+
+    def test_list_orders_by_rank(self):
+        move_task(self.todo[3], before=self.todo[0])
+        response = self.client.get('/api/tasks/', {'status': Task.TODO, 'ordering': 'rank'})
+        ids = [task['id'] for task in response.json()['results']]
+        self.assertEqual(ids, [self.todo[3].pk] + [task.pk for task in self.todo[:3]])
@@ -0,0 +1,113 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import skipUnless
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from users.models import User
+from .models import DeadlineReminder, Notification, Task
+from .reminders import OVERDUE, due_tasks, parse_window, reminder_windows, send_deadline_reminders
+
+
+class ReminderWindowTest(TestCase):
+    """Test cases for reminder window parsing"""
+
+    def test_windows_are_nested_and_disjoint(self):
+        now = timezone.now()
+        windows = reminder_windows(now, ['24h', '1h'], timedelta(hours=24))
+        self.assertEqual(windows, [
+            ('1h', now, now + timedelta(hours=1)),
+            ('24h', now + timedelta(hours=1), now + timedelta(hours=24)),
+            (OVERDUE, now - timedelta(hours=24), now),
+        ])
+
+    def test_overdue_can_be_disabled(self):
+        windows = reminder_windows(timezone.now(), ['30m'], timedelta(0))
+        self.assertEqual([window for window, _start, _end in windows], ['30m'])
+
+    def test_invalid_windows(self):
+        self.assertEqual(parse_window('2d'), timedelta(days=2))
+        for label in ('', '1w', 'h', '0h'):
+            with self.subTest(label=label), self.assertRaises(ValueError):
+                parse_window(label)
+
+
+class DeadlineReminderTest(TestCase):
+    """Test cases for sending deadline reminders"""
+
+    def setUp(self):
+        suffix = uuid.uuid4().hex[:8]
+        self.member = User.objects.create_user(
+            username=f'remind_{suffix}', email=f'remind_{suffix}@example.com', password='testpass123'
+        )
+        self.now = timezone.now()
+
+    def task(self, due_in, **extra):
+        extra.setdefault('assignee', self.member)
+        return Task.objects.create(title=f'Due {due_in}', deadline=self.now + due_in, **extra)
+
+    def send(self, **kwargs):
+        kwargs.setdefault('labels', ['24h', '1h'])
+        kwargs.setdefault('overdue_lookback', timedelta(hours=24))
+        return send_deadline_reminders(now=self.now, **kwargs)
+
+    def test_reminds_each_window_once(self):
+        soon = self.task(timedelta(minutes=30))
+        later = self.task(timedelta(hours=5))
+        late = self.task(-timedelta(hours=2))
+        self.task(timedelta(days=3))
+        self.task(-timedelta(days=3))
+        self.task(timedelta(minutes=30), status=Task.DONE)
+        self.task(timedelta(minutes=30), assignee=None)
+
+        self.assertEqual(self.send(), {'1h': 1, '24h': 1, OVERDUE: 1})
+        messages = dict(Notification.objects.filter(type=Notification.TASK_REMINDER).values_list('task', 'message'))
+        self.assertEqual(messages, {
+            soon.pk: f"Task '{soon.title}' is due within 1 hour.",
+            later.pk: f"Task '{later.title}' is due within 24 hours.",
+            late.pk: f"Task '{late.title}' is overdue.",
+        })
+        # Already sent
+        self.assertEqual(self.send(), {'1h': 0, '24h': 0, OVERDUE: 0})
+
+    def test_task_moves_through_windows(self):
+        task = self.task(timedelta(hours=2))
+        self.assertEqual(self.send()['24h'], 1)
+        self.now += timedelta(hours=1, minutes=30)
+        self.assertEqual(self.send(), {'1h': 1, '24h': 0, OVERDUE: 0})
+        self.now += timedelta(hours=1)
+        self.assertEqual(self.send(), {'1h': 0, '24h': 0, OVERDUE: 1})
+        self.assertEqual(task.deadline_reminders.count(), 3)
+
+    def test_moving_the_deadline_rearms_reminders(self):
+        task = self.task(timedelta(hours=5))
+        self.send()
+        task.deadline = self.now + timedelta(hours=6)
+        task.save()
+        self.assertEqual(self.send()['24h'], 1)
+
+    def test_sends_in_batches(self):
+        for minutes in range(7):
+            self.task(timedelta(minutes=10 + minutes))
+        # 1h window: 3 batches of select, savepoint, 2 bulk inserts, release;
+        # one empty select each for 24h and overdue
+        with self.assertNumQueries(3 * 5 + 2):
+            sent = self.send(batch_size=3)
+        self.assertEqual(sent['1h'], 7)
+        self.assertEqual(DeadlineReminder.objects.count(), 7)
+
+    @skipUnless(connection.vendor == 'sqlite', 'query plan format is SQLite specific')
+    def test_scans_the_deadline_index(self):
+        window, start, end = reminder_windows(self.now, ['24h'], timedelta(0))[0]
+        plan = due_tasks(window, start, end).explain()
+        self.assertIn('USING INDEX tasks_deadlin', plan)
+
+    def test_command(self):
+        self.task(timedelta(minutes=30))
+        out = StringIO()
+        call_command('send_deadline_reminders', stdout=out)
+        self.assertIn('Sent 1 reminders', out.getvalue())
@@ -0,0 +1,36 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+from django.utils import timezone
+
+from .models import ActivityLog, Project, Task
+
+
+class SeedSyntheticDataTest(TestCase):
+    """Test cases for the synthetic dataset generator"""
+
+    def seed(self):
+        call_command(
+            'seed_demo_data', users=20, projects=3, tasks=40, activity_logs=30,
+            seed=27, batch_size=15, skip_demo=True, stdout=StringIO(),
+        )
+
+    def test_rows_keep_their_backdated_timestamps(self):
+        self.seed()
+        recent = timezone.now() - timedelta(minutes=1)
+        # Spread over the past year, not stamped with the time of the run
+        self.assertEqual(Task.objects.filter(created_at__lt=recent).count(), 40)
+        self.assertFalse(Task.objects.filter(updated_at__lt=F('created_at')).exists())
+        self.assertEqual(Project.objects.filter(created_at__lt=recent).count(), 3)
+        # The model fields are left as they were
+        self.assertTrue(Task._meta.get_field('updated_at').auto_now)
+
+    def test_activity_logs_point_at_seeded_rows(self):
+        self.seed()
+        task_ids = {str(pk) for pk in Task.objects.values_list('pk', flat=True)}
+        project_ids = {str(pk) for pk in Project.objects.values_list('pk', flat=True)}
+        for model, object_id in ActivityLog.objects.values_list('model', 'object_id'):
+            self.assertIn(object_id, task_ids if model == 'Task' else project_ids)
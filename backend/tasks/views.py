@@ -1,8 +1,13 @@
+from django.conf import settings
+from django.http import Http404
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import Task, Notification, Comment, Project, ActivityLog
+from django.db import router, transaction
 from django.db.models import Q
 from .serializers import (
     TaskSerializer,
@@ -13,17 +18,50 @@ from .serializers import (
     ProjectSerializer,
     ActivityLogSerializer,
 )
+from .archive import restore_task
+from .board import (
+    COLUMNS,
+    DEFAULT_ORDERING,
+    ORDERINGS,
+    RebalanceNeeded,
+    board_rows,
+    board_tasks,
+    column_tasks,
+    cursor_fields,
+    decode_cursor,
+    encode_cursor,
+    move_task,
+)
+from .ranking import RankError
+from .queries import (
+    get_role_kind,
+    visible_tasks,
+    archived_tasks,
+    include_archived,
+    with_archived,
+    task_statistics,
+    user_notifications,
+    unread_notifications,
+)
+from config.db_router import ReplicaReadMixin
+from config.fast_serializer import FastListMixin
+from .jobs import notify, rebalance_ranks
 from users.permissions import CanManageTasks, CanEditTask, CanDeleteTask, CanAssignTasks
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ReplicaReadMixin, FastListMixin, viewsets.ModelViewSet):
     """ViewSet for Task management"""
     queryset = Task.objects.select_related('assignee', 'created_by').all()
     permission_classes = [IsAuthenticated]
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description']
-    ordering_fields = ['created_at', 'updated_at', 'deadline']
+    ordering_fields = ['created_at', 'updated_at', 'deadline', 'priority', 'rank']
     ordering = ['-created_at']
+    fast_list_actions = ('list', 'my_tasks', 'board')
+    # Actions that also read the archive with ?include_archived=true
+    archive_read_actions = ('list', 'my_tasks', 'statistics', 'retrieve')
+    # Actions that move an archived task back before running
+    restore_actions = ('update', 'partial_update', 'restore', 'move')
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -36,7 +74,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         """Assign permissions based on action"""
         if self.action in ['create']:
             permission_classes = [IsAuthenticated, CanManageTasks]
-        elif self.action in ['update', 'partial_update']:
+        elif self.action in ['update', 'partial_update', 'move']:
             permission_classes = [IsAuthenticated, CanEditTask]
         elif self.action == 'destroy':
             permission_classes = [IsAuthenticated, CanDeleteTask]
@@ -47,65 +85,51 @@ class TaskViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         """Filter tasks based on user role and query parameters"""
         user = self.request.user
-        role_kind = self._get_role_kind(user)
-
-        # Base queryset based on role_kind
-        if role_kind == 'admin' or role_kind == 'manager':
-            queryset = Task.objects.select_related('assignee', 'created_by').all()
-        elif role_kind == 'member':
-            queryset = Task.objects.select_related('assignee', 'created_by').filter(
-                assignee=user
-            )
-        else:
-            return Task.objects.none()
-        
-        # Filter by status if provided
-        status_filter = self.request.query_params.get('status', None)
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        # Filter by assignee if provided
-        assignee_filter = self.request.query_params.get('assignee', None)
-        if assignee_filter:
-            queryset = queryset.filter(assignee_id=assignee_filter)
-        
-        return queryset
+        return visible_tasks(user, self.request.query_params, self._get_role_kind(user))
 
     def _get_role_kind(self, u):
-        """Return a simple role kind: 'admin' | 'manager' | 'member' | None
+        """Return a simple role kind: 'admin' | 'manager' | 'member' | None"""
+        return get_role_kind(u)
 
-        This centralizes heuristic mapping so views don't rely on
-        optional convenience properties that may not be present.
-        """
+    def get_archived_queryset(self):
+        """Archived tasks the user may see, with the same query param filters"""
+        user = self.request.user
+        return archived_tasks(user, self.request.query_params, self._get_role_kind(user))
+
+    def reads_archive(self):
+        return self.action in self.archive_read_actions and include_archived(self.request.query_params)
+
+    def get_object(self):
+        """Hot task, else an archived one: read-only on ?include_archived, restored on write"""
         try:
-            if getattr(u, 'is_admin', False):
-                return 'admin'
-            if getattr(u, 'is_manager', False):
-                return 'manager'
-            if getattr(u, 'is_member', False):
-                return 'member'
-        except Exception:
-            # if these properties exist but error, ignore and fallback
-            pass
-
-        role = getattr(u, 'role', None)
-        if not role:
-            if getattr(u, 'is_superuser', False) or getattr(u, 'is_staff', False):
-                return 'admin'
-            return None
+            return super().get_object()
+        except Http404:
+            if not (self.reads_archive() or self.action in self.restore_actions):
+                raise
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        archived = get_object_or_404(self.get_archived_queryset(), pk=self.kwargs[lookup_url_kwarg])
+        task = archived.as_task()
+        self.check_object_permissions(self.request, task)
+        if self.action in self.restore_actions:
+            return restore_task(task.pk)
+        return task
 
-        r = str(role).upper()
-        if 'ADMIN' in r or 'SYSTEM' in r or 'DIRECTOR' in r:
-            return 'admin'
-        if 'MANAGER' in r or 'OFFICER' in r:
-            return 'manager'
-        return 'member'
+    def update(self, request, *args, **kwargs):
+        # get_object may restore an archived task: a failed validation rolls that back
+        with transaction.atomic(using=router.db_for_write(Task)):
+            return super().update(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        tasks = self.filter_queryset(self.get_queryset())
+        if self.reads_archive():
+            tasks = with_archived(tasks, self.filter_queryset(self.get_archived_queryset()))
+        return self.list_response(tasks)
     
     def perform_create(self, serializer):
         """Set created_by when creating a task"""
         task = serializer.save(created_by=self.request.user)
         if task.assignee:
-            Notification.objects.create(
+            notify(
                 user=task.assignee,
                 task=task,
                 type=Notification.TASK_ASSIGNED,
@@ -129,7 +153,7 @@ class TaskViewSet(viewsets.ModelViewSet):
             assignee = User.objects.get(id=assignee_id)
             task.assignee = assignee
             task.save()
-            Notification.objects.create(
+            notify(
                 user=assignee,
                 task=task,
                 type=Notification.TASK_ASSIGNED,
@@ -149,65 +173,157 @@ class TaskViewSet(viewsets.ModelViewSet):
     def my_tasks(self, request):
         """Get tasks assigned to current user"""
         tasks = self.get_queryset().filter(assignee=request.user)
-        page = self.paginate_queryset(tasks)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(tasks, many=True)
-        return Response(serializer.data)
+        if self.reads_archive():
+            tasks = with_archived(tasks, self.get_archived_queryset().filter(assignee=request.user))
+        return self.list_response(tasks)
     
     @action(detail=False, methods=['get'])
     def statistics(self, request):
         """Get task statistics"""
         user = request.user
         queryset = self.get_queryset()
-        
-        stats = {
-            'total': queryset.count(),
-            'todo': queryset.filter(status=Task.TODO).count(),
-            'in_progress': queryset.filter(status=Task.IN_PROGRESS).count(),
-            'done': queryset.filter(status=Task.DONE).count(),
-        }
-        
-        # Add user-specific stats for members and managers (who also work on tasks)
-        role_kind = self._get_role_kind(user)
-        if role_kind in ('member', 'manager'):
-            user_tasks = queryset.filter(assignee=user)
-            stats['my_total'] = user_tasks.count()
-            stats['my_todo'] = user_tasks.filter(status=Task.TODO).count()
-            stats['my_in_progress'] = user_tasks.filter(status=Task.IN_PROGRESS).count()
-            stats['my_done'] = user_tasks.filter(status=Task.DONE).count()
-        
+        archived = self.get_archived_queryset() if self.reads_archive() else None
+        stats = task_statistics(queryset, user, self._get_role_kind(user), archived)
         return Response(stats)
 
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Kanban columns: the first `limit` tasks per status, each column's count
+        and a cursor to load more. ``?ordering=rank`` sorts by the manual
+        drag-and-drop order instead of priority and deadline.
+
+        ``?column=<status>&cursor=<next>`` returns the next page of one column.
+        """
+        limit = self._board_limit()
+        ordering = request.query_params.get('ordering', DEFAULT_ORDERING)
+        if ordering not in ORDERINGS:
+            raise ValidationError({'ordering': f"Must be one of: {', '.join(ORDERINGS)}"})
+        keys = cursor_fields(ordering)
+        queryset = self.get_queryset()
+        labels = dict(COLUMNS)
+        column = request.query_params.get('column')
+        if column is None:
+            items, rows = self._board_page(board_tasks(queryset, limit, ordering), ('status', 'column_total') + keys)
+            columns = {column_status: {'status': column_status, 'label': label, 'count': 0, 'next': None, 'results': []}
+                       for column_status, label in COLUMNS}
+            for item, (column_status, total, *cursor) in zip(items, rows):
+                entry = columns[column_status]
+                entry['results'].append(item)
+                entry['count'] = total
+                # Rows come in column order, so the last one sets the cursor
+                entry['next'] = encode_cursor(cursor, ordering) if total > len(entry['results']) else None
+            return Response({'limit': limit, 'ordering': ordering, 'columns': list(columns.values())})
+
+        if column not in labels:
+            raise ValidationError({'column': f"Must be one of: {', '.join(labels)}"})
+        cursor = request.query_params.get('cursor')
+        try:
+            cursor = decode_cursor(cursor, ordering) if cursor else None
+        except ValueError:
+            raise ValidationError({'cursor': 'Invalid cursor'})
+        items, rows = self._board_page(column_tasks(queryset, column, cursor, limit, ordering), keys)
+        next_cursor = encode_cursor(rows[limit - 1], ordering) if len(items) > limit else None
+        return Response({
+            'status': column, 'label': labels[column], 'next': next_cursor, 'results': items[:limit],
+        })
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, CanEditTask])
+    def move(self, request, pk=None):
+        """
+        Drag and drop: put the task in column `status` (default: its own)
+        right after `after_id` or right before `before_id`, or last. Only the
+        task's own row is written; when the neighbours leave no usable rank,
+        a column rebalance is queued and the move answers 409 to be retried.
+        """
+        # Like update: an archived task is only restored if the move is valid
+        try:
+            with transaction.atomic(using=router.db_for_write(Task)):
+                return self._move(request)
+        except RebalanceNeeded as exc:
+            # Queued outside the rolled-back transaction so the job survives
+            rebalance_ranks.enqueue(status=exc.status)
+            return Response(
+                {'error': 'The column is being reordered, retry the move shortly'},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+    def _move(self, request):
+        task = self.get_object()
+        old_status = task.status
+        column = request.data.get('status') or old_status
+        if column not in dict(COLUMNS):
+            raise ValidationError({'status': f"Must be one of: {', '.join(dict(COLUMNS))}"})
+        neighbours = [self._move_neighbour(task, column, key) for key in ('after_id', 'before_id')]
+        try:
+            move_task(task, column, *neighbours)
+        except RebalanceNeeded:
+            raise
+        except RankError:
+            raise ValidationError({'before_id': 'Must come after after_id'})
+        if len(task.rank) > settings.TASK_RANK_REBALANCE_LENGTH:
+            rebalance_ranks.enqueue(status=column)
+        self._notify_status_change(task, old_status)
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
+
+    def _move_neighbour(self, task, column, key):
+        value = self.request.data.get(key)
+        if value in (None, ''):
+            return None
+        try:
+            neighbour = self.get_queryset().filter(pk=int(value), status=column).exclude(pk=task.pk).first()
+        except (TypeError, ValueError):
+            neighbour = None
+        if neighbour is None:
+            raise ValidationError({key: 'Must be another task in the target column'})
+        return neighbour
+
+    def _board_limit(self):
+        limit = self.request.query_params.get('limit', settings.TASK_BOARD_COLUMN_LIMIT)
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            raise ValidationError({'limit': 'Must be an integer'})
+        return max(1, min(limit, settings.TASK_BOARD_MAX_COLUMN_LIMIT))
+
+    def _board_page(self, queryset, keys):
+        """Serialized tasks of `queryset` and, per task, the values of the `keys` columns"""
+        fast = self.get_fast_serializer()
+        if fast is None:
+            tasks = list(queryset)
+            return (
+                self.get_serializer(tasks, many=True).data,
+                [tuple(getattr(task, key) for key in keys) for task in tasks],
+            )
+        columns = fast.columns + tuple(key for key in keys if key not in fast.columns)
+        rows = board_rows(queryset, columns)
+        positions = [columns.index(key) for key in keys]
+        return (
+            fast.serialize(rows, self.get_serializer_context()),
+            [tuple(row[position] for position in positions) for row in rows],
+        )
+
+    @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated, CanEditTask])
+    def restore(self, request, pk=None):
+        """Move an archived task back to the active tasks (no-op for active ones)"""
+        task = self.get_object()
+        return Response(TaskSerializer(task, context=self.get_serializer_context()).data)
+
     def perform_update(self, serializer):
         instance = serializer.instance
         old_status = instance.status
         old_assignee = instance.assignee
         old_deadline = instance.deadline
         
-        task = serializer.save()
-        
-        # Notify managers/creators on key status changes
-        if old_status != task.status:
-            if task.status == Task.IN_PROGRESS and task.created_by:
-                Notification.objects.create(
-                    user=task.created_by,
-                    task=task,
-                    type=Notification.TASK_STARTED,
-                    message=f"Task '{task.title}' was started.",
-                )
-            if task.status == Task.DONE and task.created_by:
-                Notification.objects.create(
-                    user=task.created_by,
-                    task=task,
-                    type=Notification.TASK_DONE,
-                    message=f"Task '{task.title}' was completed.",
-                )
+        new_status = serializer.validated_data.get('status', old_status)
+        # A task changing columns goes to the bottom of its new one
+        extra = {'rank': Task.end_rank(new_status)} if new_status != old_status else {}
+        task = serializer.save(**extra)
+        self._notify_status_change(task, old_status)
 
         # Notify new assignee if assignment changed
         if task.assignee and task.assignee != old_assignee:
-             Notification.objects.create(
+             notify(
                 user=task.assignee,
                 task=task,
                 type=Notification.TASK_ASSIGNED,
@@ -216,13 +332,32 @@ class TaskViewSet(viewsets.ModelViewSet):
 
         # Notify assignee if deadline changed (and they are not the one changing it)
         if task.deadline != old_deadline and task.assignee and self.request.user != task.assignee:
-             Notification.objects.create(
+             notify(
                 user=task.assignee,
                 task=task,
                 type=Notification.TASK_REMINDER,
                 message=f"Deadline for task '{task.title}' updated to {task.deadline}."
              )
 
+    def _notify_status_change(self, task, old_status):
+        """Notify managers/creators on key status changes"""
+        if old_status == task.status:
+            return
+        if task.status == Task.IN_PROGRESS and task.created_by:
+            notify(
+                user=task.created_by,
+                task=task,
+                type=Notification.TASK_STARTED,
+                message=f"Task '{task.title}' was started.",
+            )
+        if task.status == Task.DONE and task.created_by:
+            notify(
+                user=task.created_by,
+                task=task,
+                type=Notification.TASK_DONE,
+                message=f"Task '{task.title}' was completed.",
+            )
+
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated, CanAssignTasks])
     def unassign(self, request, pk=None):
         """Unassign a task (Admin/Manager only)"""
@@ -254,7 +389,7 @@ class TaskViewSet(viewsets.ModelViewSet):
         if task.created_by and task.created_by != request.user:
             recipients.add(task.created_by)
         for u in recipients:
-            Notification.objects.create(
+            notify(
                 user=u,
                 task=task,
                 type=Notification.TASK_COMMENTED,
@@ -263,14 +398,19 @@ class TaskViewSet(viewsets.ModelViewSet):
         return Response(CommentSerializer(comment).data, status=status.HTTP_201_CREATED)
 
 
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+class NotificationViewSet(ReplicaReadMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     """Notifications for the current user"""
 
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Notification.objects.filter(user=self.request.user)
+        return user_notifications(self.request.user)
+
+    @action(detail=False, methods=["get"])
+    def unread_count(self, request):
+        """Number of unread notifications for the current user"""
+        return Response({"unread": unread_notifications(request.user).count()})
 
     @action(detail=False, methods=["post"], permission_classes=[IsAuthenticated])
     def mark_read(self, request):
@@ -311,7 +451,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
         return Project.objects.filter(members=user)
 
 
-class ActivityLogViewSet(viewsets.ReadOnlyModelViewSet):
+class ActivityLogViewSet(ReplicaReadMixin, FastListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = ActivityLog.objects.all()
     serializer_class = ActivityLogSerializer
     permission_classes = [IsAuthenticated]
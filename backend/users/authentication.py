@@ -0,0 +1,63 @@
+import copy
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from auth_app.revocation import revocation_store
+from config.cache_utils import LRUCache
+
+user_cache = LRUCache(
+    maxsize=getattr(settings, 'JWT_USER_CACHE_SIZE', 1024),
+    ttl=getattr(settings, 'JWT_USER_CACHE_TTL', 60),
+    name='jwt_users',
+)
+
+
+def invalidate_cached_user(user_id):
+    """Drop a user from this process's authentication cache"""
+    user_cache.delete(str(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that serves `request.user` from a bounded per-process
+    LRU instead of querying `users` on every request.
+
+    Entries are invalidated on User save/delete in this process (see
+    `users.signals`) and expire after JWT_USER_CACHE_TTL seconds, which
+    bounds how long other workers can serve a stale role or active flag.
+
+    Access tokens revoked through `auth_app.revocation` (e.g. on logout)
+    are rejected.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if revocation_store.is_revoked(validated_token.get(api_settings.JTI_CLAIM)):
+            raise InvalidToken(_('Token has been revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+
+        key = str(user_id)
+        cached = user_cache.get(key)
+        if cached is None:
+            user = super().get_user(validated_token)
+            user_cache.set(key, copy.copy(user))
+            return user
+
+        # Hand out a copy so request-level mutations never leak into the cache
+        user = copy.copy(cached)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+        return user
@@ -1,7 +1,30 @@
+from functools import lru_cache
 from typing import Iterable
 from django.db import models
 
 
+@lru_cache(maxsize=256)
+def categorize_role(role_value: str) -> str | None:
+    """Map a raw role value to 'admin', 'manager', 'member', or None if empty."""
+    if not role_value:
+        return None
+
+    rv = str(role_value).upper()
+
+    # admin-like roles
+    for kw in ("ADMIN", "SYSTEM", "DIRECTOR", "SECRETARY"):
+        if kw in rv:
+            return "admin"
+
+    # manager-like roles
+    for kw in ("MANAGER", "OFFICER", "DEPARTMENT", "CHIEF"):
+        if kw in rv:
+            return "manager"
+
+    # fallback to member
+    return "member"
+
+
 class RoleFlagsMixin(models.Model):
     """
     Convenience helpers that expose simple role categories (admin/manager/member)
@@ -13,25 +36,19 @@ class RoleFlagsMixin(models.Model):
     """
 
     def _role_category(self) -> str | None:
-        """Return one of: 'admin', 'manager', 'member', or None if no role."""
-        role_val = getattr(self, "role", None)
-        if not role_val:
-            return None
-
-        rv = str(role_val).upper()
+        """Return one of: 'admin', 'manager', 'member', or None if no role.
 
-        # admin-like roles
-        for kw in ("ADMIN", "SYSTEM", "DIRECTOR", "SECRETARY"):
-            if kw in rv:
-                return "admin"
-
-        # manager-like roles
-        for kw in ("MANAGER", "OFFICER", "DEPARTMENT", "CHIEF"):
-            if kw in rv:
-                return "manager"
+        The result is memoized on the instance together with the role value it
+        was computed from, so assigning a new role invalidates it.
+        """
+        role_val = getattr(self, "role", None)
+        cached = self.__dict__.get("_role_category_cache")
+        if cached is not None and cached[0] == role_val:
+            return cached[1]
 
-        # fallback to member
-        return "member"
+        category = categorize_role(str(role_val)) if role_val else None
+        self.__dict__["_role_category_cache"] = (role_val, category)
+        return category
 
     @property
     def is_admin(self) -> bool:
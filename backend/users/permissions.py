@@ -1,8 +1,53 @@
+from functools import wraps
+
 from rest_framework import permissions
 
+
+def _decision_cache(request):
+    """Per-request dict shared by every permission class evaluated for `request`"""
+    # Store on the underlying HttpRequest so nested/rewrapped DRF requests share it
+    http_request = getattr(request, '_request', request)
+    cache = getattr(http_request, '_permission_decisions', None)
+    if cache is None:
+        cache = {}
+        http_request._permission_decisions = cache
+    return cache
+
+
+def _object_key(obj):
+    pk = getattr(obj, 'pk', None)
+    if pk is None:
+        return ('id', id(obj))
+    return (obj._meta.label_lower, pk) if hasattr(obj, '_meta') else (type(obj).__name__, pk)
+
+
+def memoize_decision(method):
+    """Cache a permission method's result for the lifetime of the request.
+
+    Decisions are keyed by permission class, method, user and (for object
+    permissions) the target object, so repeated checks within one request -
+    e.g. several `get_object()` calls or re-instantiated permission classes -
+    are answered without re-evaluating role logic.
+    """
+    @wraps(method)
+    def wrapper(self, request, view, *args):
+        user = getattr(request, 'user', None)
+        key = (
+            type(self).__qualname__,
+            method.__name__,
+            getattr(user, 'pk', None),
+            getattr(user, 'role', None),
+        ) + tuple(_object_key(obj) for obj in args)
+        cache = _decision_cache(request)
+        if key not in cache:
+            cache[key] = method(self, request, view, *args)
+        return cache[key]
+    return wrapper
+
 class IsAdmin(permissions.BasePermission):
     """Permission check for Admin role"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -14,6 +59,7 @@ class IsAdmin(permissions.BasePermission):
 class IsManager(permissions.BasePermission):
     """Permission check for Manager role"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -25,6 +71,7 @@ class IsManager(permissions.BasePermission):
 class IsAdminOrManager(permissions.BasePermission):
     """Permission check for Admin or Manager roles"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -36,6 +83,7 @@ class IsAdminOrManager(permissions.BasePermission):
 class CanManageUsers(permissions.BasePermission):
     """Permission check for user management (Admin only)"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -47,6 +95,7 @@ class CanManageUsers(permissions.BasePermission):
 class CanManageTasks(permissions.BasePermission):
     """Permission check for task management (Admin or Manager)"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -58,6 +107,7 @@ class CanManageTasks(permissions.BasePermission):
 class CanAssignTasks(permissions.BasePermission):
     """Permission check for task assignment (Admin or Manager)"""
     
+    @memoize_decision
     def has_permission(self, request, view):
         return (
             request.user and
@@ -69,6 +119,7 @@ class CanAssignTasks(permissions.BasePermission):
 class CanEditTask(permissions.BasePermission):
     """Permission check for editing specific task"""
     
+    @memoize_decision
     def has_object_permission(self, request, view, obj):
         # Admin can edit any task
         if request.user.is_admin:
@@ -85,6 +136,7 @@ class CanEditTask(permissions.BasePermission):
 class CanDeleteTask(permissions.BasePermission):
     """Permission check for deleting specific task"""
     
+    @memoize_decision
     def has_object_permission(self, request, view, obj):
         # Only Admin and Manager can delete tasks
         return request.user.is_admin or request.user.is_manager
@@ -93,6 +145,7 @@ class CanDeleteTask(permissions.BasePermission):
 class IsProjectManagerOrAdmin(permissions.BasePermission):
     """Allow access to project managers or admins"""
 
+    @memoize_decision
     def has_object_permission(self, request, view, obj):
         # obj is expected to be a Project
         if request.user.is_admin:
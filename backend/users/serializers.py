@@ -1,10 +1,12 @@
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
 from .models import User
+from config.fragment_cache import FragmentCacheMixin, user_fragments
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for User model"""
+    fragment_cache = user_fragments
 
     role_display = serializers.CharField(source="get_role_display", read_only=True)
     role = serializers.ChoiceField(choices=User.Role.choices, required=False)
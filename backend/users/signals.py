@@ -0,0 +1,26 @@
+import sys
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import User
+
+
+def invalidate_cached_user(user_id):
+    # The JWT user cache only exists once users.authentication is imported;
+    # looking it up here keeps django.setup() (every manage.py command) off
+    # the DRF/JWT import path
+    authentication = sys.modules.get('users.authentication')
+    if authentication is not None:
+        authentication.invalidate_cached_user(user_id)
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache_on_save(sender, instance, **kwargs):
+    """Role changes, (de)activation and password resets must take effect promptly"""
+    invalidate_cached_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def invalidate_user_cache_on_delete(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
@@ -0,0 +1,53 @@
+import uuid
+
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .authentication import user_cache
+from .models import User
+
+
+class CachedJWTAuthenticationTest(TestCase):
+    """Test cases for the per-process JWT user cache"""
+
+    def setUp(self):
+        user_cache.clear()
+        self.user = User.objects.create_user(
+            username=f'jwt_{uuid.uuid4().hex[:8]}',
+            email=f'jwt_{uuid.uuid4().hex[:8]}@example.com',
+            password='testpass123',
+            role=User.Role.MEMBER
+        )
+        self.client = APIClient()
+        token = RefreshToken.for_user(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def profile(self):
+        return self.client.get('/api/users/profile/')
+
+    def test_second_request_skips_user_query(self):
+        self.assertEqual(self.profile().status_code, 200)
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.profile().status_code, 200)
+        self.assertFalse(any('FROM "users"' in q['sql'] for q in captured.captured_queries))
+
+    def test_role_change_takes_effect_immediately(self):
+        self.profile()
+        self.user.role = User.Role.MANAGER
+        self.user.save()
+        self.assertEqual(self.profile().data['role'], User.Role.MANAGER)
+
+    def test_deactivation_rejects_cached_user(self):
+        self.profile()
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.profile().status_code, 401)
+
+    def test_cached_instance_is_not_shared(self):
+        self.profile()
+        cached = user_cache.get(str(self.user.pk))
+        self.client.patch('/api/users/update_profile/', {'first_name': 'Changed'}, format='json')
+        self.assertNotEqual(cached.first_name, 'Changed')
@@ -343,3 +343,47 @@ class UserProfileIntegrationTest(TestCase):
         
         self.assertNotEqual(admin_profile.updated_at, original_updated)
         self.assertGreater(admin_profile.updated_at, original_updated)
+
+
+class RoleCategoryCacheTest(TestCase):
+    """Test cases for memoized role categorization"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username=f'roles_{uuid.uuid4().hex[:8]}',
+            email=f'roles_{uuid.uuid4().hex[:8]}@example.com',
+            password='testpass123',
+            role=User.Role.MEMBER
+        )
+
+    def test_category_is_memoized_per_role_value(self):
+        from .mixins import categorize_role
+
+        categorize_role.cache_clear()
+        for _ in range(5):
+            self.assertTrue(self.user.is_member)
+            self.assertFalse(self.user.is_admin)
+        self.assertEqual(categorize_role.cache_info().misses, 1)
+
+    def test_role_change_invalidates_category(self):
+        self.assertTrue(self.user.is_member)
+        self.user.role = User.Role.MANAGER
+        self.assertTrue(self.user.is_manager)
+        self.assertFalse(self.user.is_member)
+        self.user.role = User.Role.ADMIN
+        self.assertTrue(self.user.is_admin)
+        self.user.role = ''
+        self.assertIsNone(self.user._role_category())
+
+    def test_permission_decisions_are_shared_within_a_request(self):
+        from unittest import mock
+        from rest_framework.test import APIRequestFactory
+        from rest_framework.request import Request
+        from .permissions import CanManageTasks
+
+        request = Request(APIRequestFactory().get('/'))
+        request.user = self.user
+        with mock.patch.object(User, 'can_manage_tasks', return_value=False) as check:
+            for _ in range(3):
+                self.assertFalse(CanManageTasks().has_permission(request, None))
+        self.assertEqual(check.call_count, 1)
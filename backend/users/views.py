@@ -9,7 +9,7 @@ from .permissions import CanManageUsers
 from .serializers import UserProfileSerializer, UserSerializer
 
 
-def log_user_action(admin_user, action, description, target_user, request):
+def log_user_action(admin_user, action, description, target_user, request, link_target=True):
     """Helper to log user-related admin actions"""
     from auth_app.models import AdminActivityLog
     from auth_app.views import log_admin_action
@@ -18,7 +18,7 @@ def log_user_action(admin_user, action, description, target_user, request):
         admin_user=admin_user,
         action=action,
         description=description,
-        target_user=target_user,
+        target_user=target_user if link_target else None,
         metadata={
             'target_user_email': target_user.email,
             'target_user_role': target_user.role
@@ -95,7 +95,9 @@ class UserViewSet(viewsets.ModelViewSet):
             action=AdminActivityLog.Action.DELETE_USER,
             description=f"Deleted user: {email}",
             target_user=instance,
-            request=self.request
+            request=self.request,
+            # The entry is written after the delete, so it cannot reference the user
+            link_target=False,
         )
         instance.delete()
 
@@ -37,6 +37,27 @@ export const tasksAPI = {
     return response.data;
   },
 
+  getBoard: async (params = {}) => {
+    const response = await api.get(API_ENDPOINTS.TASK_BOARD, { params });
+    return response.data;
+  },
+
+  loadBoardColumn: async (status, cursor, params = {}) => {
+    const response = await api.get(API_ENDPOINTS.TASK_BOARD, {
+      params: { ...params, column: status, cursor },
+    });
+    return response.data;
+  },
+
+  move: async (taskId, { status, afterId, beforeId } = {}) => {
+    const response = await api.post(`${API_ENDPOINTS.TASKS}${taskId}/move/`, {
+      status,
+      after_id: afterId,
+      before_id: beforeId,
+    });
+    return response.data;
+  },
+
   assign: async (taskId, assigneeId) => {
     const response = await api.post(`${API_ENDPOINTS.TASKS}${taskId}/assign/`, {
       assignee_id: assigneeId,
@@ -18,6 +18,7 @@ export const API_ENDPOINTS = {
   TASKS: '/tasks/',
   MY_TASKS: '/tasks/my_tasks/',
   TASK_STATISTICS: '/tasks/statistics/',
+  TASK_BOARD: '/tasks/board/',
   NOTIFICATIONS: '/notifications/',
   PROJECTS: '/projects/',
 